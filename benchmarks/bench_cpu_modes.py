@@ -0,0 +1,147 @@
+"""
+Compare XTTS CPU inference modes: real-time factor and output similarity.
+
+Each mode runs in its own process (thread pools and quantization are
+process-wide), synthesizes the same sentences with a fixed seed and saves
+the audio. Similarity to the default mode is the cosine similarity of the
+long-term log-magnitude spectra, which is insensitive to the small timing
+differences sampling introduces; duration_ratio shows pacing drift.
+
+Requires the real model (coqui-tts and torch).
+
+Usage:
+    python benchmarks/bench_cpu_modes.py [--threads N] [--sentences N] [--modes default,perf,int8]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from harness import REPO_ROOT, save_results
+
+import numpy as np
+
+SENTENCES = [
+    "Welcome back to the show, today we talk about the history of coffee.",
+    "Legend has it that a goat herder noticed his goats dancing after eating the berries.",
+    "Not really, the first written records come from Yemen in the fifteenth century.",
+    "From there it spread to Cairo, Istanbul and eventually to the coffee houses of Europe.",
+]
+
+# Environment for each mode on top of XTTS_DEVICE=cpu
+MODES: dict[str, dict[str, str]] = {
+    "default": {"CPU_PERF_MODE": "false"},
+    "perf": {"CPU_PERF_MODE": "true"},
+    "int8": {"CPU_PERF_MODE": "true", "CPU_QUANTIZE": "int8"},
+    "int8_compile": {"CPU_PERF_MODE": "true", "CPU_QUANTIZE": "int8", "CPU_COMPILE": "compile"},
+}
+
+
+def run_mode(out_dir: str, sentences: int) -> None:
+    """Child process: load the model with the inherited settings and synthesize."""
+    import torch
+    from podcast_mcp.tts.tts_manager import TTSManager
+    from podcast_mcp.audio.wav_io import write_wav
+
+    manager = TTSManager()
+    started = time.perf_counter()
+    manager.load_model()
+    load_seconds = time.perf_counter() - started
+
+    # Warm-up, so one-time costs (and compilation) are not part of the measurement
+    manager._infer("Warm-up.", manager._resolve_speaker("1"), "en")
+
+    synth_seconds = 0.0
+    audio_seconds = 0.0
+    for i, text in enumerate(SENTENCES[:sentences]):
+        torch.manual_seed(i)
+        started = time.perf_counter()
+        waveform = manager._infer(text, manager._resolve_speaker("1"), "en")
+        synth_seconds += time.perf_counter() - started
+        audio_seconds += len(waveform) / manager.sample_rate
+        write_wav(os.path.join(out_dir, f"{i}.wav"), waveform, manager.sample_rate)
+
+    with open(os.path.join(out_dir, "timing.json"), "w") as f:
+        json.dump({"load_seconds": load_seconds, "synth_seconds": synth_seconds, "audio_seconds": audio_seconds}, f)
+
+
+def log_spectrum(waveform: np.ndarray, frame: int = 1024) -> np.ndarray:
+    frames = len(waveform) // frame
+    if frames == 0:
+        return np.zeros(frame // 2 + 1)
+    blocks = waveform[: frames * frame].reshape(frames, frame) * np.hanning(frame)
+    return np.log1p(np.abs(np.fft.rfft(blocks, axis=1)).mean(axis=0))
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    sa, sb = log_spectrum(a), log_spectrum(b)
+    denominator = np.linalg.norm(sa) * np.linalg.norm(sb)
+    return float(sa @ sb / denominator) if denominator else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=0, help="TORCH_INTRA_OP_THREADS for the tuned modes")
+    parser.add_argument("--sentences", type=int, default=len(SENTENCES))
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes, the first is the reference")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/cpu_modes.json)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(args.child, args.sentences)
+        return 0
+
+    from podcast_mcp.audio.wav_io import read_wav
+
+    modes = args.modes.split(",")
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for mode in modes:
+            out_dir = os.path.join(work_dir, mode)
+            os.makedirs(out_dir)
+            env = dict(os.environ, XTTS_DEVICE="cpu", SEGMENT_CACHE_ENABLED="false", **MODES[mode])
+            env["PYTHONPATH"] = os.path.join(REPO_ROOT, "src")
+            if args.threads and mode != "default":
+                env["TORCH_INTRA_OP_THREADS"] = str(args.threads)
+            print(f"Running mode {mode}...", file=sys.stderr)
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", out_dir, "--sentences", str(args.sentences)],
+                env=env, check=True,
+            )
+            with open(os.path.join(out_dir, "timing.json")) as f:
+                timing = json.load(f)
+            results[mode] = {
+                "load_seconds": round(timing["load_seconds"], 2),
+                "synth_seconds": round(timing["synth_seconds"], 3),
+                "real_time_factor": round(timing["synth_seconds"] / timing["audio_seconds"], 4),
+            }
+
+        reference = modes[0]
+        for mode in modes:
+            scores, ratios = [], []
+            for i in range(args.sentences):
+                ref, _ = read_wav(os.path.join(work_dir, reference, f"{i}.wav"))
+                out, _ = read_wav(os.path.join(work_dir, mode, f"{i}.wav"))
+                scores.append(similarity(ref, out))
+                ratios.append(len(out) / len(ref))
+            results[mode]["similarity"] = round(float(np.mean(scores)), 4)
+            results[mode]["duration_ratio"] = round(float(np.mean(ratios)), 3)
+            results[mode]["speedup"] = round(results[reference]["synth_seconds"] / results[mode]["synth_seconds"], 2)
+
+    for mode, metrics in results.items():
+        print(f"{mode}: " + ", ".join(f"{k}={v}" for k, v in metrics.items()))
+
+    path = save_results(
+        {f"cpu_mode/{mode}": metrics for mode, metrics in results.items()},
+        args.output or os.path.join(REPO_ROOT, "benchmarks", "results", "cpu_modes.json"),
+    )
+    print(f"\nSaved results to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Measurement helpers shared by the benchmark scripts."""
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+import threading
+from typing import Any, Callable, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+# Make the package importable without installing it
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from podcast_mcp.tts.model_memory import process_rss_bytes  # noqa: E402
+
+
+class RSSSampler:
+    """Samples RSS in a background thread and records the peak while active."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, process_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RSSSampler":
+        self.peak_bytes = process_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, process_rss_bytes())
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> tuple[dict[str, float], Any]:
+    """
+    Run fn repeat times and report wall time and peak RSS.
+
+    Returns:
+        tuple: (metrics dict, return value of the last run)
+    """
+    timings = []
+    result = None
+    baseline_rss = process_rss_bytes()
+    with RSSSampler() as sampler:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - started)
+    return {
+        "wall_seconds": round(min(timings), 5),
+        "wall_seconds_median": round(statistics.median(timings), 5),
+        "peak_rss_mb": round(sampler.peak_bytes / 2**20, 1),
+        "rss_growth_mb": round(max(0, sampler.peak_bytes - baseline_rss) / 2**20, 1),
+    }, result
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: dict[str, dict[str, float]], path: Optional[str] = None) -> str:
+    """Write results with environment metadata; defaults to benchmarks/results/<revision>.json."""
+    revision = git_revision()
+    path = path or os.path.join(RESULTS_DIR, f"{revision}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def compare(results: dict[str, dict[str, float]], baseline_path: str, threshold: float,
+            metric: str = "wall_seconds") -> list[str]:
+    """
+    Print a comparison against a saved run.
+
+    Returns:
+        list[str]: Names of benchmarks slower than baseline by more than threshold
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, metrics in results.items():
+        old = baseline.get(name, {}).get(metric)
+        new = metrics.get(metric)
+        if old is None or new is None or old <= 0:
+            continue
+        change = (new - old) / old
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<40} {old:>10.4f} {new:>10.4f} {change:>+7.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
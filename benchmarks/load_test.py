@@ -0,0 +1,279 @@
+"""
+Load test for podcast-mcp: concurrent MCP clients against the real server over stdio.
+
+Launches the podcast-mcp entry point with the synthetic TTS backend (offline,
+no model or GPU), connects --clients clients and has each send --requests
+generate_podcast calls, drawn from a mix of script sizes and languages.
+Every script has its own lines, so nothing is served from the segment cache.
+Reports tool latency percentiles, queueing delay (latency minus the
+server's own processing time), throughput, error rate, the servers' peak
+RSS and files left behind in TEMP_DIR.
+
+Topologies:
+    shared      One server process; the clients send requests over its
+                stdio session concurrently, each with its own client id,
+                so per-client fairness applies as for agents sharing a server
+    per-client  One server process per client, as when every agent starts
+                its own podcast-mcp; they share OUTPUT_DIR, TEMP_DIR and the
+                segment cache
+
+Server settings to try are passed with --env, e.g. --env MAX_CONCURRENT_RENDERS=4.
+
+Usage:
+    python benchmarks/load_test.py [--clients 4] [--requests 5] [--topology shared|per-client]
+        [--mix small=3,medium=2,large=1] [--languages en,de] [--latency-ms 50] [--rtf 0.05]
+        [--env KEY=VALUE ...] [--compare results/<rev>-load.json]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+from datetime import timedelta
+from typing import Any, Optional
+
+from harness import REPO_ROOT, RESULTS_DIR, compare, git_revision, save_results
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+# Segments per script of each size
+SIZES = {"small": 4, "medium": 16, "large": 64}
+
+LINES = [
+    "Welcome back to the show, today we talk about the history of coffee.",
+    "Thanks for having me, I have been looking forward to this conversation.",
+    "Let us start at the very beginning, in the highlands of Ethiopia.",
+    "Legend has it that a goat herder noticed his goats dancing after eating the berries.",
+    "That is a wonderful story, but is there any evidence for it?",
+    "Not really, the first written records come from Yemen in the fifteenth century.",
+]
+
+
+def parse_fields(text: str) -> dict[str, str]:
+    """Parse the server's 'key: value' lines."""
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(": ")
+        if sep:
+            fields[key.strip()] = value.strip()
+    return fields
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..1), None without values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+def make_script(request_id: int, size: str, language: str) -> str:
+    lines = [f"language: {language}", f"filename: load_{request_id}.wav", ""]
+    for i in range(SIZES[size]):
+        lines.append(f"<voice{i % 2 + 1}>{LINES[i % len(LINES)]} Request {request_id}, line {i}.")
+    return "\n".join(lines)
+
+
+def make_plan(args: argparse.Namespace) -> list[list[tuple[int, str, str]]]:
+    """(request id, size, language) of every request, per client, drawn from the mix with a fixed seed."""
+    mix = {}
+    for part in args.mix.split(","):
+        size, _, weight = part.partition("=")
+        if size not in SIZES:
+            raise SystemExit(f"Unknown script size '{size}' (choose from {', '.join(SIZES)})")
+        mix[size] = float(weight or 1)
+    languages = args.languages.split(",")
+    rng = random.Random(args.seed)
+    request_ids = iter(range(args.clients * args.requests))
+    return [
+        [(next(request_ids), rng.choices(list(mix), weights=list(mix.values()))[0], rng.choice(languages))
+         for _ in range(args.requests)]
+        for _ in range(args.clients)
+    ]
+
+
+def server_parameters(args: argparse.Namespace, work_dir: str) -> StdioServerParameters:
+    """The podcast-mcp entry point with the synthetic backend and a scratch output, temp and cache dir."""
+    env = dict(os.environ)
+    env.update({
+        "TTS_BACKEND": "synthetic",
+        "SYNTHETIC_TTS_LATENCY_MS": str(args.latency_ms),
+        "SYNTHETIC_TTS_RTF": str(args.rtf),
+        "MCP_TRANSPORT": "stdio",
+        "MCP_LOG_LEVEL": "WARNING",
+        "OUTPUT_DIR": os.path.join(work_dir, "output"),
+        "TEMP_DIR": os.path.join(work_dir, "temp"),
+        "CACHE_DIR": os.path.join(work_dir, "cache"),
+        "PYTHONPATH": os.pathsep.join(filter(None, [os.path.join(REPO_ROOT, "src"), os.environ.get("PYTHONPATH")])),
+    })
+    for setting in args.env or []:
+        key, sep, value = setting.partition("=")
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got '{setting}'")
+        env[key] = value
+
+    command = args.command.split() if args.command else None
+    if command is None:
+        entry_point = shutil.which("podcast-mcp")
+        # Without an installed entry point, run the same main() from the source tree
+        command = [entry_point] if entry_point else [sys.executable, "-c", "from podcast_mcp.server import main; main()"]
+    return StdioServerParameters(command=command[0], args=command[1:], env=env, cwd=REPO_ROOT)
+
+
+async def run_client(session: ClientSession, client: int, requests: list[tuple[int, str, str]],
+                     records: list[dict[str, Any]], timeout: float) -> None:
+    for request_id, size, language in requests:
+        record = {"client": client, "size": size, "language": language, "segments": SIZES[size]}
+        started = time.perf_counter()
+        try:
+            result = await session.call_tool(
+                "generate_podcast",
+                {"script": make_script(request_id, size, language)},
+                read_timeout_seconds=timedelta(seconds=timeout),
+                meta={"client_id": f"load-client-{client}"},
+            )
+            fields = parse_fields("".join(getattr(c, "text", "") for c in result.content))
+            record["ok"] = not result.isError and fields.get("success") == "true"
+            if record["ok"]:
+                record["processing_seconds"] = float(fields.get("processing_time_seconds", 0))
+            else:
+                record["error"] = fields.get("error") or "tool error"
+        except Exception as e:
+            record["ok"] = False
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["latency_seconds"] = time.perf_counter() - started
+        records.append(record)
+
+
+async def run_server(params: StdioServerParameters, clients: dict[int, list[tuple[int, str, str]]],
+                     records: list[dict[str, Any]], timeout: float, errlog) -> dict[str, Any]:
+    """Start one server, run its clients concurrently and return its status afterwards."""
+    started = time.perf_counter()
+    async with stdio_client(params, errlog=errlog) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            startup_seconds = time.perf_counter() - started
+            await asyncio.gather(*(
+                run_client(session, client, requests, records, timeout) for client, requests in clients.items()
+            ))
+            status = await session.call_tool("get_server_status")
+    fields = parse_fields("".join(getattr(c, "text", "") for c in status.content))
+    fields["startup_seconds"] = startup_seconds
+    return fields
+
+
+async def run_load(args: argparse.Namespace, work_dir: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]], float]:
+    params = server_parameters(args, work_dir)
+    plan = make_plan(args)
+    if args.topology == "shared":
+        groups = [dict(enumerate(plan))]
+    else:
+        groups = [{client: requests} for client, requests in enumerate(plan)]
+
+    records: list[dict[str, Any]] = []
+    with open(os.path.join(work_dir, "server.log"), "w") as errlog:
+        started = time.perf_counter()
+        servers = await asyncio.gather(*(run_server(params, group, records, args.timeout, errlog) for group in groups))
+        wall_seconds = time.perf_counter() - started
+    return records, list(servers), wall_seconds
+
+
+def summarize(records: list[dict[str, Any]], wall_seconds: Optional[float] = None) -> dict[str, Any]:
+    ok = [r for r in records if r["ok"]]
+    latencies = [r["latency_seconds"] for r in records]
+    queueing = [max(0.0, r["latency_seconds"] - r["processing_seconds"]) for r in ok]
+    summary: dict[str, Any] = {"requests": len(records)}
+    if wall_seconds is not None:
+        summary["wall_seconds"] = round(wall_seconds, 3)
+    for q in (0.5, 0.9, 0.99):
+        value = percentile(latencies, q)
+        summary[f"latency_p{int(q * 100)}_s"] = round(value, 3) if value is not None else None
+    summary["latency_max_s"] = round(max(latencies), 3) if latencies else None
+    value = percentile(queueing, 0.5)
+    summary["queueing_p50_s"] = round(value, 3) if value is not None else None
+    value = percentile(queueing, 0.99)
+    summary["queueing_p99_s"] = round(value, 3) if value is not None else None
+    summary["error_rate"] = round(1 - len(ok) / len(records), 4) if records else 0.0
+    if wall_seconds:
+        summary["requests_per_minute"] = round(60 * len(ok) / wall_seconds, 2)
+        summary["segments_per_second"] = round(sum(r["segments"] for r in ok) / wall_seconds, 2)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent MCP clients")
+    parser.add_argument("--requests", type=int, default=5, help="generate_podcast calls per client, one at a time")
+    parser.add_argument("--topology", choices=["shared", "per-client"], default="shared")
+    parser.add_argument("--mix", default="small=3,medium=2,large=1", help="Script sizes and their weights")
+    parser.add_argument("--languages", default="en,de", help="Languages drawn for the scripts")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Emulated per-call inference latency")
+    parser.add_argument("--rtf", type=float, default=0.05, help="Emulated inference seconds per audio second")
+    parser.add_argument("--env", action="append", metavar="KEY=VALUE", help="Server setting (repeatable)")
+    parser.add_argument("--command", help="Server command (default: podcast-mcp, else main() from src)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds before a call counts as failed")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request mix")
+    parser.add_argument("--keep", action="store_true", help="Keep the work directory (outputs, server.log)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<revision>-load.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare p99 latency against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="Error rate above which the run fails")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="podcast-mcp-load-")
+    print(
+        f"Load test: {args.clients} clients x {args.requests} requests ({args.topology}), "
+        f"mix {args.mix}, languages {args.languages}",
+        file=sys.stderr,
+    )
+    try:
+        records, servers, wall_seconds = asyncio.run(run_load(args, work_dir))
+        temp_dir = os.path.join(work_dir, "temp")
+        temp_left = sum(len(files) for _, _, files in os.walk(temp_dir)) if os.path.isdir(temp_dir) else 0
+    finally:
+        if args.keep:
+            print(f"Work directory kept at {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    name = f"load/{args.topology}/{args.clients}x{args.requests}"
+    overall = summarize(records, wall_seconds)
+    overall["servers"] = len(servers)
+    overall["startup_max_s"] = round(max(s["startup_seconds"] for s in servers), 3)
+    overall["peak_rss_mb"] = max(float(s.get("peak_rss_mb", 0)) for s in servers)
+    overall["peak_rss_total_mb"] = round(sum(float(s.get("peak_rss_mb", 0)) for s in servers), 1)
+    overall["inference_mean_batch"] = max(float(s.get("inference_mean_batch", 0)) for s in servers)
+    overall["temp_files_left"] = temp_left
+    results = {name: overall}
+    for size in SIZES:
+        subset = [r for r in records if r["size"] == size]
+        if subset:
+            results[f"{name}/{size}"] = summarize(subset)
+
+    for key, metrics in results.items():
+        print(f"{key}: " + ", ".join(f"{k}={v}" for k, v in metrics.items()))
+    errors = sorted({r["error"] for r in records if not r["ok"]})
+    for error in errors[:5]:
+        print(f"  error: {error}")
+
+    path = save_results(results, args.output or os.path.join(RESULTS_DIR, f"{git_revision()}-load.json"))
+    print(f"\nSaved results to {path}")
+
+    status = 0
+    if overall["error_rate"] > args.max_error_rate:
+        print(f"\nError rate {overall['error_rate']:.1%} over {args.max_error_rate:.1%}")
+        status = 1
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, metric="latency_p99_s")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
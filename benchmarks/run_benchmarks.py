@@ -0,0 +1,231 @@
+"""
+Benchmark suite for podcast-mcp, runnable offline without a model or GPU.
+
+Synthesis goes through the deterministic synthetic backend (TTS_BACKEND=synthetic),
+so numbers reflect parsing, audio assembly and pipeline overhead plus the
+emulated inference cost set with --latency-ms / --rtf.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--only NAME] [--compare results/<rev>.json]
+"""
+import os
+import sys
+import asyncio
+import argparse
+import tempfile
+from unittest.mock import patch
+
+from harness import compare, measure, save_results
+
+from podcast_mcp.config import Config
+from podcast_mcp.parser.script_parser import parse_script
+from podcast_mcp.audio.audio_combiner import combine_segments, combine_waveforms
+from podcast_mcp.audio.post_process import PostProcessor
+from podcast_mcp.audio.wav_io import write_wav
+from podcast_mcp.tts import synthetic_backend
+
+LINES = [
+    "Welcome back to the show, today we talk about the history of coffee.",
+    "Thanks for having me, I have been looking forward to this conversation.",
+    "Let us start at the very beginning, in the highlands of Ethiopia.",
+    "Legend has it that a goat herder noticed his goats dancing after eating the berries.",
+    "That is a wonderful story, but is there any evidence for it?",
+    "Not really, the first written records come from Yemen in the fifteenth century.",
+]
+
+
+def make_script(segments: int, language: str = "en") -> str:
+    lines = [f"language: {language}", "filename: benchmark.wav", ""]
+    for i in range(segments):
+        lines.append(f"<voice{i % 2 + 1}>{LINES[i % len(LINES)]} Segment {i}.")
+    return "\n".join(lines)
+
+
+class NullContext:
+    async def report_progress(self, progress, total=None, message=None):
+        pass
+
+
+def bench_parser(results: dict, quick: bool) -> None:
+    for segments in ([10, 100] if quick else [10, 100, 1000]):
+        script = make_script(segments)
+        metrics, _ = measure(lambda: parse_script(script), repeat=5)
+        metrics["chars"] = len(script)
+        metrics["chars_per_second"] = round(len(script) / metrics["wall_seconds"])
+        results[f"parse_script/{segments}"] = metrics
+
+
+def bench_combiner(results: dict, quick: bool, work_dir: str) -> None:
+    for count in ([10, 100] if quick else [10, 100, 1000]):
+        waveforms = [
+            synthetic_backend.render(LINES[i % len(LINES)], f"speaker{i % 2}") for i in range(count)
+        ]
+        paths = [
+            write_wav(os.path.join(work_dir, f"seg_{count}_{i}.wav"), w, synthetic_backend.SAMPLE_RATE)
+            for i, w in enumerate(waveforms)
+        ]
+        audio_seconds = sum(len(w) for w in waveforms) / synthetic_backend.SAMPLE_RATE
+        output = os.path.join(work_dir, "combined.wav")
+
+        metrics, _ = measure(lambda: combine_segments(paths, Config.DEFAULT_PAUSE_MS, output), repeat=3)
+        metrics["audio_seconds"] = round(audio_seconds, 1)
+        results[f"combine_segments/{count}"] = metrics
+
+        metrics, _ = measure(
+            lambda: combine_waveforms(waveforms, synthetic_backend.SAMPLE_RATE, Config.DEFAULT_PAUSE_MS, output),
+            repeat=3,
+        )
+        metrics["audio_seconds"] = round(audio_seconds, 1)
+        results[f"combine_waveforms/{count}"] = metrics
+
+        speakers = [f"speaker{i % 2}" for i in range(count)]
+        metrics, _ = measure(
+            lambda: combine_waveforms(
+                waveforms, synthetic_backend.SAMPLE_RATE, Config.DEFAULT_PAUSE_MS, output, post=PostProcessor(speakers)
+            ),
+            repeat=3,
+        )
+        metrics["audio_seconds"] = round(audio_seconds, 1)
+        results[f"combine_waveforms+post_process/{count}"] = metrics
+
+        for path in paths:
+            os.remove(path)
+
+
+def bench_pipeline(results: dict, quick: bool, work_dir: str) -> None:
+    from podcast_mcp.audio.wav_io import probe_pcm_wav
+    from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+
+    tool = GeneratePodcastTool()
+    segments = 20 if quick else 100
+    script = make_script(segments)
+
+    for mode in ("file", "memory"):
+        with patch.object(Config, "AUDIO_PIPELINE", mode):
+            metrics, result = measure(lambda: asyncio.run(tool.run_async(script, NullContext())), repeat=1)
+        if not result["success"]:
+            raise RuntimeError(f"Pipeline benchmark failed: {result.get('error')}")
+
+        info = probe_pcm_wav(result["output_file"])
+        audio_seconds = info["data_size"] / (info["sample_rate"] * info["sample_width"] * info["channels"])
+        metrics["audio_seconds"] = round(audio_seconds, 1)
+        metrics["real_time_factor"] = round(metrics["wall_seconds"] / audio_seconds, 4)
+        metrics["segments"] = segments
+        results[f"run_async/{mode}/{segments}"] = metrics
+
+
+def make_series(count: int, segments: int) -> list[str]:
+    """Scripts of a daily series: shared intro and outro around episode-specific lines."""
+    scripts = []
+    for day in range(count):
+        lines = [f"filename: episode_{day}.wav", "", f"<voice1>{LINES[0]}"]
+        for i in range(1, segments - 1):
+            lines.append(f"<voice{i % 2 + 1}>{LINES[i % len(LINES)]} Day {day}, part {i}.")
+        lines.append(f"<voice2>{LINES[1]}")
+        scripts.append("\n".join(lines))
+    return scripts
+
+
+def bench_batch(results: dict, quick: bool, work_dir: str) -> None:
+    from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+
+    tool = GeneratePodcastTool()
+    count = 10 if quick else 50
+    scripts = make_series(count, 12)
+
+    def serial() -> list[dict]:
+        return [asyncio.run(tool.run_async(script, NullContext())) for script in scripts]
+
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"):
+        serial_metrics, serial_results = measure(serial, repeat=1)
+    batch_metrics, batch_result = measure(lambda: asyncio.run(tool.run_batch_async(scripts, NullContext())), repeat=1)
+    if not all(r["success"] for r in serial_results) or not batch_result["success"]:
+        raise RuntimeError("Batch benchmark failed")
+
+    serial_metrics["scripts"] = batch_metrics["scripts"] = count
+    batch_metrics["unique_units"] = batch_result["unique_units"]
+    batch_metrics["speedup"] = round(serial_metrics["wall_seconds"] / batch_metrics["wall_seconds"], 2)
+    results[f"serial/{count}"] = serial_metrics
+    results[f"run_batch_async/{count}"] = batch_metrics
+
+
+def bench_concurrent(results: dict, quick: bool, work_dir: str) -> None:
+    from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+
+    tool = GeneratePodcastTool()
+    count = 4 if quick else 8
+    # Different lines per render, so nothing is shared through the segment cache
+    scripts = [
+        make_script(12).replace("benchmark.wav", f"concurrent_{i}.wav").replace("Segment", f"Render {i}, segment")
+        for i in range(count)
+    ]
+
+    async def concurrent() -> list[dict]:
+        return await asyncio.gather(*(tool.run_async(script, NullContext()) for script in scripts))
+
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"):
+        serial_metrics, serial_results = measure(
+            lambda: [asyncio.run(tool.run_async(script, NullContext())) for script in scripts], repeat=1
+        )
+        scheduler = tool.tts.scheduler
+        batches, requests = scheduler.batches, scheduler.requests
+        concurrent_metrics, concurrent_results = measure(lambda: asyncio.run(concurrent()), repeat=1)
+    if not all(r["success"] for r in serial_results + concurrent_results):
+        raise RuntimeError("Concurrent benchmark failed")
+
+    serial_metrics["renders"] = concurrent_metrics["renders"] = count
+    concurrent_metrics["mean_batch"] = round((scheduler.requests - requests) / max(1, scheduler.batches - batches), 2)
+    concurrent_metrics["speedup"] = round(serial_metrics["wall_seconds"] / concurrent_metrics["wall_seconds"], 2)
+    results[f"serial_renders/{count}"] = serial_metrics
+    results[f"concurrent_renders/{count}"] = concurrent_metrics
+
+
+BENCHMARKS = {
+    "parser": bench_parser, "combiner": bench_combiner, "pipeline": bench_pipeline, "batch": bench_batch,
+    "concurrent": bench_concurrent,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append", help="Run only these groups")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Emulated per-call inference latency")
+    parser.add_argument("--rtf", type=float, default=0.0, help="Emulated inference seconds per audio second")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<revision>.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as work_dir, \
+            patch.object(Config, "TTS_BACKEND", "synthetic"), \
+            patch.object(Config, "SYNTHETIC_TTS_LATENCY_MS", args.latency_ms), \
+            patch.object(Config, "SYNTHETIC_TTS_RTF", args.rtf), \
+            patch.object(Config, "SEGMENT_CACHE_ENABLED", False), \
+            patch.object(Config, "OUTPUT_DIR", work_dir), \
+            patch.object(Config, "TEMP_DIR", os.path.join(work_dir, "temp")):
+        for name in args.only or list(BENCHMARKS):
+            print(f"Running {name} benchmarks...", file=sys.stderr)
+            if name == "parser":
+                BENCHMARKS[name](results, args.quick)
+            else:
+                BENCHMARKS[name](results, args.quick, work_dir)
+
+    for name, metrics in results.items():
+        summary = ", ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"{name}: {summary}")
+
+    path = save_results(results, args.output)
+    print(f"\nSaved results to {path}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
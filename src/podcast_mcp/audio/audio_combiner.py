@@ -1,41 +1,261 @@
-from pydub import AudioSegment
 import os
-from typing import List
+import itertools
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+import numpy as np
+from .wav_io import SAMPLE_WIDTH, from_pcm16, probe_pcm_wav, read_wav
+from .post_process import PostProcessor, resample
+from .streaming_writer import StreamingWavWriter
+from .streaming_encoder import StreamingEncoder, open_writer
+from ..metrics import stage
+from ..cancellation import check_cancelled
 
-def combine_segments(segment_paths: List[str], pause_ms: int, output_path: str, format: str = "wav") -> str:
+def combine_segments(
+    segment_paths: List[str], pause_ms: int, output_path: str, format: str = "wav",
+    post: Optional[PostProcessor] = None,
+) -> str:
     """
     Combines multiple audio files into one with a pause between them.
-    
+
+    The output is assembled in a single streaming pass: PCM WAV segments that
+    match the output format are byte-copied into place, everything else is
+    decoded one segment at a time. Memory use does not grow with episode length.
+    With a post-processor every segment is read twice instead, once to
+    measure it and once to write its processed audio (mono).
+
     Args:
         segment_paths: List of paths to audio segments
         pause_ms: Duration of pause between segments in milliseconds
         output_path: Path where the combined audio will be saved
         format: Audio format (default: "wav")
-        
+        post: Post-processor for these segments (optional)
+
     Returns:
         str: Path to the output file
-        
+
     Raises:
         ValueError: If segment_paths is empty
     """
     if not segment_paths:
         raise ValueError("No segments to combine")
 
-    combined = AudioSegment.empty()
-    pause = AudioSegment.silent(duration=pause_ms)
+    # pydub is only needed for non-PCM input, keep it out of import time
+    from pydub import AudioSegment
+
+    probes = [probe_pcm_wav(path) for path in segment_paths]
+    reference = next((info for info in probes if info is not None), None)
+    if reference is not None:
+        sample_rate, channels, sample_width = reference["sample_rate"], reference["channels"], reference["sample_width"]
+    else:
+        first = AudioSegment.from_file(segment_paths[0])
+        sample_rate, channels, sample_width = first.frame_rate, first.channels, first.sample_width
+
+    if post is not None:
+        with stage("post_process"):
+            for path, info in zip(segment_paths, probes):
+                post.add(_load_waveform(path, info, sample_rate), sample_rate)
+
+        def write_processed(writer: Union[StreamingWavWriter, StreamingEncoder]) -> None:
+            loaded = (_load_waveform(path, info, sample_rate) for path, info in zip(segment_paths, probes))
+            _write_processed(writer, post, loaded, sample_rate, pause_ms)
+
+        output_rate = post.output_rate or sample_rate
+        return _assemble(write_processed, output_path, format, output_rate, 1, SAMPLE_WIDTH)
+
+    def write(writer: Union[StreamingWavWriter, StreamingEncoder]) -> None:
+        for i, (path, info) in enumerate(zip(segment_paths, probes)):
+            check_cancelled()
+            if (
+                info is not None
+                and info["sample_rate"] == sample_rate
+                and info["channels"] == channels
+                and info["sample_width"] == sample_width
+            ):
+                writer.copy_pcm(path, info["data_offset"], info["data_size"])
+            else:
+                segment = (
+                    AudioSegment.from_file(path)
+                    .set_frame_rate(sample_rate)
+                    .set_channels(channels)
+                    .set_sample_width(sample_width)
+                )
+                writer.write_frames(segment.raw_data)
+
+            # Add pause if not the last segment
+            if i < len(segment_paths) - 1:
+                writer.write_silence(pause_ms)
+
+    return _assemble(write, output_path, format, sample_rate, channels, sample_width)
+
+
+def combine_waveforms(
+    waveforms: List[np.ndarray], sample_rate: int, pause_ms: int, output_path: str, format: str = "wav",
+    post: Optional[PostProcessor] = None,
+) -> str:
+    """
+    Combines in-memory waveforms into one file with a pause between them.
+
+    Unlike combine_segments, nothing is decoded from disk: each waveform is
+    converted to PCM and streamed into the output file.
+
+    Args:
+        waveforms: List of mono float waveforms
+        sample_rate: Sample rate of all waveforms in Hz
+        pause_ms: Duration of pause between segments in milliseconds
+        output_path: Path where the combined audio will be saved
+        format: Audio format (default: "wav")
+        post: Post-processor for these segments (optional); each processed
+            segment is produced just before it is written
+
+    Returns:
+        str: Path to the output file
+
+    Raises:
+        ValueError: If waveforms is empty
+    """
+    if not waveforms:
+        raise ValueError("No segments to combine")
+
+    if post is not None:
+        with stage("post_process"):
+            for waveform in waveforms:
+                post.add(waveform, sample_rate)
+        return _assemble(
+            lambda writer: _write_processed(writer, post, waveforms, sample_rate, pause_ms),
+            output_path, format, post.output_rate or sample_rate, 1, SAMPLE_WIDTH,
+        )
 
-    for i, path in enumerate(segment_paths):
-        segment = AudioSegment.from_file(path)
-        combined += segment
-        
-        # Add pause if not the last segment
-        if i < len(segment_paths) - 1:
-            combined += pause
+    def write(writer: Union[StreamingWavWriter, StreamingEncoder]) -> None:
+        for i, waveform in enumerate(waveforms):
+            check_cancelled()
+            writer.write_waveform(waveform)
+            if i < len(waveforms) - 1:
+                writer.write_silence(pause_ms)
 
+    return _assemble(write, output_path, format, sample_rate, 1, SAMPLE_WIDTH)
+
+
+def combine_stream(
+    segments: Iterable[Union[np.ndarray, str]], sample_rate: Optional[int], pause_ms: int, output_path: str,
+    format: str = "wav", post: Optional[PostProcessor] = None,
+) -> str:
+    """
+    Combines segments into one file while they are still being produced.
+
+    segments is consumed lazily, so each segment can be handed over as soon
+    as it is synthesized and the episode is assembled alongside synthesis.
+    Items are mono float waveforms at sample_rate or paths of segment files
+    (PCM WAV files at the output format are byte-copied when there is no
+    post-processor). Only the segment being written is held in memory.
+
+    With a post-processor, a speaker's loudness is matched to their level
+    so far rather than over the whole episode, as later segments do not
+    exist yet.
+
+    Args:
+        segments: Waveforms or segment file paths, in order
+        sample_rate: Sample rate of the waveforms (and of the output) in Hz;
+            None takes it from the first segment, which must then be a WAV file
+        pause_ms: Duration of pause between segments in milliseconds
+        output_path: Path where the combined audio will be saved
+        format: Audio format (default: "wav")
+        post: Post-processor for these segments (optional)
+
+    Returns:
+        str: Path to the output file
+
+    Raises:
+        ValueError: If segments is empty
+    """
+    items = iter(segments)
+    first = next(items, None)
+    if first is None:
+        raise ValueError("No segments to combine")
+    if sample_rate is None:
+        info = probe_pcm_wav(first) if isinstance(first, str) else None
+        if info is None:
+            raise ValueError("sample_rate is required unless the first segment is a PCM WAV file")
+        sample_rate = info["sample_rate"]
+    ordered = itertools.chain([first], items)
+
+    def write(writer: Union[StreamingWavWriter, StreamingEncoder]) -> None:
+        if post is not None:
+            def measured() -> Iterator[np.ndarray]:
+                for item in ordered:
+                    waveform = _load_waveform(item, probe_pcm_wav(item), sample_rate) if isinstance(item, str) else item
+                    post.add(waveform, sample_rate)
+                    yield waveform
+
+            _write_processed(writer, post, measured(), sample_rate, pause_ms)
+        else:
+            for count, item in enumerate(ordered):
+                check_cancelled()
+                if count and pause_ms > 0:
+                    writer.write_silence(pause_ms)
+                if isinstance(item, str):
+                    info = probe_pcm_wav(item)
+                    if info is not None and (info["sample_rate"], info["channels"], info["sample_width"]) == (
+                        sample_rate, 1, SAMPLE_WIDTH
+                    ):
+                        writer.copy_pcm(item, info["data_offset"], info["data_size"])
+                    else:
+                        writer.write_waveform(_load_waveform(item, info, sample_rate))
+                else:
+                    writer.write_waveform(item)
+
+    output_rate = post.output_rate if post is not None and post.output_rate else sample_rate
+    return _assemble(write, output_path, format, output_rate, 1, SAMPLE_WIDTH)
+
+
+def _load_waveform(path: str, info: Optional[dict[str, int]], sample_rate: int) -> np.ndarray:
+    """Decode a segment file to a mono float waveform at sample_rate."""
+    if info is not None and info["sample_width"] == SAMPLE_WIDTH:
+        waveform, rate = read_wav(path)
+        return waveform if rate == sample_rate else resample(waveform, rate, sample_rate)
+    # pydub is only needed for non-PCM input, keep it out of import time
+    from pydub import AudioSegment
+    segment = AudioSegment.from_file(path).set_frame_rate(sample_rate).set_channels(1).set_sample_width(SAMPLE_WIDTH)
+    return from_pcm16(segment.raw_data)
+
+
+def _write_processed(
+    writer: Union[StreamingWavWriter, StreamingEncoder],
+    post: PostProcessor,
+    waveforms: Iterable[np.ndarray],
+    sample_rate: int,
+    pause_ms: int,
+) -> None:
+    """Write post-processed segments with a pause between them."""
+    for i, piece in enumerate(post.render(waveforms, sample_rate, pause_ms)):
+        check_cancelled()
+        if i and pause_ms > 0:
+            writer.write_silence(pause_ms)
+        writer.write_waveform(piece)
+
+
+def _assemble(
+    write: Callable[[Union[StreamingWavWriter, StreamingEncoder]], None],
+    output_path: str,
+    format: str,
+    sample_rate: int,
+    channels: int,
+    sample_width: int,
+) -> str:
+    """Stream audio into output_path; compressed formats are encoded while the audio is written."""
     # Ensure output directory exists (if path has a directory component)
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-    
-    combined.export(output_path, format=format)
+
+    writer = open_writer(output_path, format, sample_rate, channels, sample_width)
+    try:
+        write(writer)
+        check_cancelled()  # A cancelled render leaves no output behind
+    except BaseException:
+        writer.abort()
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    # For compressed formats this waits for the encoder to drain its last frames
+    with stage("export"):
+        writer.close()
     return output_path
@@ -0,0 +1,194 @@
+from typing import Iterable, Iterator, NamedTuple, Optional
+import numpy as np
+from ..config import Config
+
+PEAK_CEILING = 0.98  # Headroom left after gain so 16-bit conversion never clips
+MAX_GAIN = 10.0  # +20 dB, near-silent takes are not blown up to the target
+
+
+class SegmentAnalysis(NamedTuple):
+    start: int  # First sample kept after trimming
+    end: int  # One past the last sample kept
+    energy: float  # Sum of squares of the kept samples
+    peak: float  # Largest absolute sample of the kept samples
+
+
+def analyze(waveform: np.ndarray, sample_rate: int, threshold_db: Optional[float], pad_ms: int = 0) -> SegmentAnalysis:
+    """
+    Find the audible part of a segment and measure it, without copying the audio.
+
+    Leading and trailing samples quieter than threshold_db (relative to full
+    scale) are cut, keeping pad_ms on each side so word onsets and decays
+    are not clipped. A segment that is silent throughout is trimmed away;
+    threshold_db None keeps the whole segment.
+    """
+    waveform = np.asarray(waveform, dtype=np.float32)
+    if not len(waveform):
+        return SegmentAnalysis(0, 0, 0.0, 0.0)
+    magnitude = np.abs(waveform)
+    if threshold_db is None:
+        return SegmentAnalysis(0, len(waveform), float(np.dot(waveform, waveform)), float(magnitude.max()))
+    audible = magnitude > 10 ** (threshold_db / 20)
+    first = int(np.argmax(audible))
+    if not audible[first]:
+        return SegmentAnalysis(0, 0, 0.0, 0.0)
+    last = len(waveform) - int(np.argmax(audible[::-1]))
+    pad = int(sample_rate * pad_ms / 1000)
+    start, end = max(0, first - pad), min(len(waveform), last + pad)
+    kept = waveform[start:end]
+    return SegmentAnalysis(start, end, float(np.dot(kept, kept)), float(magnitude[start:end].max()))
+
+
+def resample(waveform: np.ndarray, from_rate: int, to_rate: int, gain: float = 1.0) -> np.ndarray:
+    """
+    Resample a waveform by truncating or zero-padding its spectrum.
+
+    gain is folded into the spectral scale factor, so resampling and level
+    change cost a single pass.
+    """
+    n_in = len(waveform)
+    n_out = int(round(n_in * to_rate / from_rate))
+    if n_in == 0 or n_out == 0:
+        return np.zeros(n_out, dtype=np.float32)
+    spectrum = np.fft.rfft(waveform)
+    bins = n_out // 2 + 1
+    if len(spectrum) >= bins:
+        spectrum = spectrum[:bins]
+    else:
+        spectrum = np.concatenate([spectrum, np.zeros(bins - len(spectrum), dtype=spectrum.dtype)])
+    return (np.fft.irfft(spectrum, n_out) * (gain * n_out / n_in)).astype(np.float32)
+
+
+class PostProcessor:
+    """
+    Clean up synthesized segments between the model and the combiner.
+
+    One processor handles one episode; speakers names the speaker of each
+    segment in order. Segments go through two steps. add() measures one segment (audible range,
+    energy, peak) and accumulates its speaker's loudness; it reads the audio
+    once and copies nothing. process() then produces the final segment in a
+    single vectorized write: the trimmed range times the segment's gain
+    (resampled in the same step if needed), with short fades at both edges.
+
+    Each speaker gets one gain that brings their average RMS level to
+    LOUDNESS_TARGET_DBFS, so quiet and loud voices end up matched while the
+    dynamics within a speaker are kept; a segment whose peak would exceed
+    the ceiling gets less. render() chains process() over all segments and,
+    when there is no pause between them, overlaps neighbours into a
+    crossfade instead of butting them together.
+    """
+
+    def __init__(
+        self,
+        speakers: list[str],
+        trim_db: Optional[float] = None,
+        trim_pad_ms: Optional[int] = None,
+        loudness_dbfs: Optional[float] = None,
+        crossfade_ms: Optional[int] = None,
+        output_rate: Optional[int] = None,
+    ):
+        self.trim_db = Config.TRIM_SILENCE_DB if trim_db is None else trim_db
+        self.trim_pad_ms = Config.TRIM_PAD_MS if trim_pad_ms is None else trim_pad_ms
+        self.loudness_dbfs = Config.LOUDNESS_TARGET_DBFS if loudness_dbfs is None else loudness_dbfs
+        self.crossfade_ms = Config.CROSSFADE_MS if crossfade_ms is None else crossfade_ms
+        self.output_rate = output_rate
+        self.speakers = speakers
+        self._segments: list[tuple[str, SegmentAnalysis]] = []
+        self._speaker_energy: dict[str, float] = {}
+        self._speaker_samples: dict[str, int] = {}
+        self._ramps: dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_config(cls, speakers: list[str]) -> Optional["PostProcessor"]:
+        """
+        A processor for segments of these speakers, or None if POST_PROCESS is
+        off or every step is disabled (the combiner then copies PCM bytes as is).
+        """
+        if not Config.POST_PROCESS:
+            return None
+        output_rate = Config.DEFAULT_SAMPLE_RATE if Config.RESAMPLE_OUTPUT and Config.DEFAULT_SAMPLE_RATE > 0 else None
+        processor = cls(speakers, output_rate=output_rate)
+        return None if processor.is_noop else processor
+
+    @property
+    def is_noop(self) -> bool:
+        """True if process() would return every segment unchanged."""
+        return self.trim_db >= 0 and not self.loudness_dbfs and self.crossfade_ms <= 0 and self.output_rate is None
+
+    def add(self, waveform: np.ndarray, sample_rate: int) -> None:
+        """Measure the next segment (in combine order) and add it to its speaker's loudness."""
+        speaker = self.speakers[len(self._segments)]
+        threshold = self.trim_db if self.trim_db < 0 else None  # 0 = no trimming
+        analysis = analyze(waveform, sample_rate, threshold, self.trim_pad_ms)
+        self._segments.append((speaker, analysis))
+        self._speaker_energy[speaker] = self._speaker_energy.get(speaker, 0.0) + analysis.energy
+        self._speaker_samples[speaker] = self._speaker_samples.get(speaker, 0) + analysis.end - analysis.start
+
+    def speaker_gain(self, speaker: str) -> float:
+        """Gain that brings the speaker's average level to the loudness target (1.0 if disabled)."""
+        samples = self._speaker_samples.get(speaker, 0)
+        if not self.loudness_dbfs or not samples or not self._speaker_energy[speaker]:
+            return 1.0
+        rms = np.sqrt(self._speaker_energy[speaker] / samples)
+        return float(min(MAX_GAIN, 10 ** (self.loudness_dbfs / 20) / rms))
+
+    def _ramp(self, length: int) -> np.ndarray:
+        # Raised-cosine fade-in; with its mirror image it sums to 1, so overlapped fades keep the level
+        if length not in self._ramps:
+            self._ramps[length] = (np.sin(np.linspace(0, np.pi / 2, length, dtype=np.float32)) ** 2).astype(np.float32)
+        return self._ramps[length]
+
+    def _fade_length(self, length: int, rate: int) -> int:
+        # Fades never take more than half a segment, so head and tail fades do not meet
+        return max(0, min(int(rate * self.crossfade_ms / 1000), length // 2))
+
+    def process(self, index: int, waveform: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Produce the final audio of segment `index` (as passed to add()).
+
+        Returns:
+            np.ndarray: A new float32 array at output_rate (or sample_rate)
+        """
+        speaker, analysis = self._segments[index]
+        kept = np.asarray(waveform, dtype=np.float32)[analysis.start:analysis.end]
+        gain = self.speaker_gain(speaker)
+        if analysis.peak * gain > PEAK_CEILING:
+            gain = PEAK_CEILING / analysis.peak
+
+        rate = self.output_rate or sample_rate
+        if rate != sample_rate:
+            result = resample(kept, sample_rate, rate, gain)
+        else:
+            result = np.multiply(kept, np.float32(gain), dtype=np.float32)
+
+        fade = self._fade_length(len(result), rate)
+        if fade > 0:
+            ramp = self._ramp(fade)
+            result[:fade] *= ramp
+            result[-fade:] *= ramp[::-1]
+        return result
+
+    def render(self, waveforms: Iterable[np.ndarray], sample_rate: int, pause_ms: int) -> Iterator[np.ndarray]:
+        """
+        Yield the processed segments in order, one at a time.
+
+        With pause_ms 0 the faded tail of each segment is mixed into the
+        faded head of the next, so only one segment is held back.
+        """
+        pending: Optional[np.ndarray] = None
+        for i, waveform in enumerate(waveforms):
+            current = self.process(i, waveform, sample_rate)
+            if pending is not None:
+                overlap = 0
+                if pause_ms <= 0:
+                    # Only the faded edges overlap, so the overlap never exceeds the crossfade or
+                    # either segment; short or empty segments shrink it with their fades
+                    rate = self.output_rate or sample_rate
+                    overlap = min(self._fade_length(len(pending), rate), self._fade_length(len(current), rate))
+                if overlap > 0:
+                    current[:overlap] += pending[len(pending) - overlap:]
+                    pending = pending[:len(pending) - overlap]
+                yield pending
+            pending = current
+        if pending is not None:
+            yield pending
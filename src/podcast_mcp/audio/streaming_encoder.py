@@ -0,0 +1,223 @@
+import shutil
+import logging
+import tempfile
+import subprocess
+from typing import Optional, Union
+import numpy as np
+from .wav_io import SAMPLE_WIDTH, to_pcm16
+from .streaming_writer import StreamingWavWriter
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Compressed output formats: ffmpeg codec, container and whether a bitrate applies
+ENCODED_FORMATS: dict[str, dict] = {
+    "mp3": {"codec": "libmp3lame", "container": "mp3", "bitrate": True},
+    "opus": {"codec": "libopus", "container": "ogg", "bitrate": True, "sample_rates": (8000, 12000, 16000, 24000, 48000)},
+    "ogg": {"codec": "libvorbis", "container": "ogg", "bitrate": True},
+    "flac": {"codec": "flac", "container": "flac", "bitrate": False},
+}
+SUPPORTED_FORMATS: tuple[str, ...] = ("wav",) + tuple(ENCODED_FORMATS)
+
+# ffmpeg raw input format per PCM sample width in bytes (as stored in WAV files)
+_PCM_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+_COPY_CHUNK = 1024 * 1024
+_SILENCE_BLOCK_FRAMES = 24000
+
+
+def normalize_format(format: str) -> str:
+    """
+    Validate an output format name (case-insensitive, leading dot allowed).
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    name = format.strip().lower().lstrip(".")
+    if name not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported output format '{format}'. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+    return name
+
+
+class StreamingEncoder:
+    """
+    Encodes PCM audio to a compressed format while it is being produced.
+
+    Frames are piped into an ffmpeg process that encodes and writes the output
+    file concurrently, so encoding overlaps with synthesis and memory use does
+    not grow with episode length. Has the same writing interface as
+    StreamingWavWriter.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int,
+        format: str,
+        channels: int = 1,
+        sample_width: int = SAMPLE_WIDTH,
+        bitrate: Optional[str] = None,
+        output_sample_rate: Optional[int] = None,
+        output_channels: Optional[int] = None,
+    ):
+        self.path = path
+        self.format = normalize_format(format)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.data_bytes = 0
+        self._silence_block = b"\0" * (_SILENCE_BLOCK_FRAMES * self.frame_size)
+        self._closed = False
+
+        command = build_command(
+            path, self.format, sample_rate, channels, bitrate, output_sample_rate, output_channels, sample_width
+        )
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._process = subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+            )
+        except OSError as e:
+            self._stderr.close()
+            raise RuntimeError(f"Could not start ffmpeg to encode {self.format}: {e}")
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def duration_seconds(self) -> float:
+        """Duration of the audio written so far."""
+        return self.data_bytes / (self.frame_size * self.sample_rate)
+
+    def _error(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", "replace").strip()[-500:]
+
+    def write_frames(self, data: bytes) -> None:
+        """Append raw PCM frames matching this encoder's input format."""
+        try:
+            self._process.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            self._process.wait()
+            raise RuntimeError(f"ffmpeg stopped while encoding {self.path}: {self._error()}")
+        self.data_bytes += len(data)
+
+    def write_waveform(self, waveform: np.ndarray) -> None:
+        """Append a mono float waveform (converted to 16-bit PCM, so the encoder must be 16-bit mono)."""
+        self.write_frames(to_pcm16(waveform))
+
+    def write_silence(self, duration_ms: int) -> None:
+        remaining = int(self.sample_rate * duration_ms / 1000) * self.frame_size
+        while remaining > 0:
+            chunk = min(remaining, len(self._silence_block))
+            self.write_frames(self._silence_block[:chunk])
+            remaining -= chunk
+
+    def copy_pcm(self, src_path: str, data_offset: int, data_size: int) -> None:
+        """Append the data chunk of a PCM file with the same format."""
+        data_size -= data_size % self.frame_size
+        with open(src_path, "rb") as src:
+            src.seek(data_offset)
+            while data_size > 0:
+                chunk = src.read(min(_COPY_CHUNK, data_size))
+                if not chunk:
+                    break
+                self.write_frames(chunk)
+                data_size -= len(chunk)
+
+    def flush_header(self) -> None:
+        """Push buffered frames to the encoder (compressed streams need no header patching)."""
+        try:
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    def close(self) -> None:
+        """
+        Finish encoding and wait for the output file to be complete.
+
+        Raises:
+            RuntimeError: If ffmpeg reported an error
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._process.wait()
+        try:
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg failed to encode {self.path} (exit {returncode}): {self._error()}")
+        finally:
+            self._stderr.close()
+
+    def abort(self) -> None:
+        """Stop encoding without finishing the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._process.kill()
+        self._process.wait()
+        self._stderr.close()
+
+    def __enter__(self) -> "StreamingEncoder":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def build_command(
+    path: str,
+    format: str,
+    sample_rate: int,
+    channels: int = 1,
+    bitrate: Optional[str] = None,
+    output_sample_rate: Optional[int] = None,
+    output_channels: Optional[int] = None,
+    sample_width: int = SAMPLE_WIDTH,
+) -> list[str]:
+    """
+    ffmpeg command line that reads raw PCM on stdin and encodes it to path.
+
+    Output options default to OUTPUT_BITRATE, OUTPUT_CHANNELS and
+    DEFAULT_SAMPLE_RATE (0 keeps the input value). Opus only supports a few
+    sample rates; other rates are raised to the next supported one.
+    """
+    spec = ENCODED_FORMATS[normalize_format(format)]
+    ffmpeg = shutil.which(Config.FFMPEG_BINARY) or Config.FFMPEG_BINARY
+
+    out_rate = output_sample_rate if output_sample_rate is not None else Config.DEFAULT_SAMPLE_RATE
+    out_rate = out_rate or sample_rate
+    supported = spec.get("sample_rates")
+    if supported and out_rate not in supported:
+        out_rate = next((rate for rate in supported if rate >= out_rate), supported[-1])
+    out_channels = output_channels if output_channels is not None else Config.OUTPUT_CHANNELS
+    out_channels = out_channels or channels
+
+    command = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", _PCM_FORMATS[sample_width], "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+        "-ar", str(out_rate), "-ac", str(out_channels),
+        "-c:a", spec["codec"],
+    ]
+    bitrate = bitrate or Config.OUTPUT_BITRATE
+    if spec["bitrate"] and bitrate:
+        command += ["-b:a", bitrate]
+    command += ["-f", spec["container"], path]
+    return command
+
+
+def open_writer(
+    path: str, format: str, sample_rate: int, channels: int = 1, sample_width: int = SAMPLE_WIDTH
+) -> Union[StreamingWavWriter, StreamingEncoder]:
+    """Streaming writer for an output format: a WAV writer for wav, an ffmpeg encoder otherwise."""
+    if normalize_format(format) == "wav":
+        return StreamingWavWriter(path, sample_rate, channels, sample_width)
+    return StreamingEncoder(path, sample_rate, format, channels, sample_width)
@@ -0,0 +1,145 @@
+import os
+import mmap
+import struct
+import logging
+import numpy as np
+from .wav_io import SAMPLE_WIDTH, WAVE_FORMAT_PCM, to_pcm16
+
+logger = logging.getLogger(__name__)
+
+_SILENCE_BLOCK_FRAMES = 24000
+_COPY_CHUNK = 8 * 1024 * 1024
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    """
+    Append count bytes starting at offset in src_fd to the current position of dst_fd.
+
+    Uses copy_file_range (in-kernel copy, reflink on supporting filesystems)
+    and falls back to an mmap'ed slice when the syscall is unavailable.
+    """
+    if count <= 0:
+        return
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            while count > 0:
+                n = copy_file_range(src_fd, dst_fd, min(_COPY_CHUNK, count), offset)
+                if n == 0:
+                    break
+                offset += n
+                count -= n
+        except OSError as e:
+            # EXDEV/ENOSYS/EINVAL on some kernels and filesystems
+            logger.debug(f"copy_file_range unavailable ({e}), falling back to mmap")
+        if count <= 0:
+            return
+
+    page = mmap.ALLOCATIONGRANULARITY
+    aligned = offset - offset % page
+    with mmap.mmap(src_fd, count + (offset - aligned), access=mmap.ACCESS_READ, offset=aligned) as mapped:
+        with memoryview(mapped) as view:
+            position = offset - aligned
+            while position < len(view):
+                with view[position:] as remaining:
+                    position += os.write(dst_fd, remaining)
+
+
+class StreamingWavWriter:
+    """
+    Incrementally writes a PCM WAV file with constant memory use.
+
+    The header is written up front with placeholder sizes, audio frames are
+    appended as they arrive, and the RIFF/data sizes are patched on close()
+    (or earlier via flush_header()).
+    """
+
+    def __init__(self, path: str, sample_rate: int, channels: int = 1, sample_width: int = SAMPLE_WIDTH):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.data_bytes = 0
+        self._pad_bytes = 0  # Trailing pad byte of an odd-sized data chunk, counted in the RIFF size only
+        self._silence_block = b"\0" * (_SILENCE_BLOCK_FRAMES * channels * sample_width)
+        # Unbuffered, so os-level copies and regular writes share one file position
+        self._file = open(path, "w+b", buffering=0)
+        self._closed = False
+        self._write_header()
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def duration_seconds(self) -> float:
+        """Duration of the audio written so far."""
+        return self.data_bytes / (self.frame_size * self.sample_rate)
+
+    def _header(self) -> bytes:
+        byte_rate = self.sample_rate * self.frame_size
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + self.data_bytes + self._pad_bytes, b"WAVE",
+            b"fmt ", 16, WAVE_FORMAT_PCM, self.channels, self.sample_rate,
+            byte_rate, self.frame_size, self.sample_width * 8,
+            b"data", self.data_bytes,
+        )
+
+    def _write_header(self) -> None:
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.seek(0, os.SEEK_END)
+
+    def write_frames(self, data: bytes) -> None:
+        """Append raw PCM frames matching this writer's format."""
+        view = memoryview(data)
+        while view:
+            written = self._file.write(view)
+            view = view[written:]
+        self.data_bytes += len(data)
+
+    def write_waveform(self, waveform: np.ndarray) -> None:
+        """Append a mono float waveform (converted to 16-bit PCM)."""
+        self.write_frames(to_pcm16(waveform))
+
+    def write_silence(self, duration_ms: int) -> None:
+        """Append silence from a preallocated zero block."""
+        remaining = int(self.sample_rate * duration_ms / 1000) * self.frame_size
+        while remaining > 0:
+            chunk = min(remaining, len(self._silence_block))
+            self.write_frames(self._silence_block[:chunk])
+            remaining -= chunk
+
+    def copy_pcm(self, src_path: str, data_offset: int, data_size: int) -> None:
+        """Append the data chunk of another PCM file with the same format, without decoding it."""
+        data_size -= data_size % self.frame_size
+        with open(src_path, "rb") as src:
+            _copy_range(src.fileno(), self._file.fileno(), data_offset, data_size)
+        self.data_bytes += data_size
+
+    def flush_header(self) -> None:
+        """Patch the header with the current sizes so the file is playable as-is."""
+        self._write_header()
+        os.fsync(self._file.fileno())
+
+    def abort(self) -> None:
+        """Stop writing; the caller removes the incomplete file."""
+        self.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self.data_bytes % 2:
+            self._file.write(b"\0")  # RIFF chunks are word aligned
+            self._pad_bytes = 1
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self) -> "StreamingWavWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
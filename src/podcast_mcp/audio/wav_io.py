@@ -0,0 +1,119 @@
+import os
+import wave
+import struct
+from typing import Optional
+import numpy as np
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+WAVE_FORMAT_PCM = 1
+
+
+def to_pcm16(waveform: np.ndarray) -> bytes:
+    """
+    Convert a float waveform in [-1, 1] to little-endian 16-bit PCM bytes.
+
+    Args:
+        waveform: Mono float waveform
+
+    Returns:
+        bytes: Raw PCM frames
+    """
+    clipped = np.clip(np.asarray(waveform, dtype=np.float32), -1.0, 1.0)
+    return (clipped * 32767.0).astype("<i2").tobytes()
+
+
+def from_pcm16(data: bytes) -> np.ndarray:
+    """Convert little-endian 16-bit PCM bytes to a float32 waveform."""
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32767.0
+
+
+def write_wav(path: str, waveform: np.ndarray, sample_rate: int) -> str:
+    """
+    Write a mono float waveform as a 16-bit PCM WAV file.
+
+    Args:
+        path: Output file path
+        waveform: Mono float waveform in [-1, 1]
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        str: Path to the written file
+    """
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(to_pcm16(waveform))
+    return path
+
+
+def read_wav(path: str) -> tuple[np.ndarray, int]:
+    """
+    Read a 16-bit PCM WAV file into a mono float32 waveform.
+
+    Multi-channel files are downmixed by averaging the channels.
+
+    Returns:
+        tuple: (waveform, sample_rate)
+
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != SAMPLE_WIDTH:
+            raise ValueError(f"Unsupported sample width {wav.getsampwidth()} in {path}")
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        waveform = from_pcm16(wav.readframes(wav.getnframes()))
+
+    if channels > 1:
+        waveform = waveform.reshape(-1, channels).mean(axis=1)
+    return waveform, sample_rate
+
+
+def probe_pcm_wav(path: str) -> Optional[dict[str, int]]:
+    """
+    Read the format and data chunk location of a PCM WAV file without decoding it.
+
+    Returns:
+        dict with 'channels', 'sample_rate', 'sample_width', 'data_offset' and
+        'data_size', or None if the file is not a plain PCM WAV
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                return None
+
+            fmt: Optional[tuple[int, ...]] = None
+            while True:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    return None
+                chunk_id = chunk_header[:4]
+                chunk_size = struct.unpack("<I", chunk_header[4:])[0]
+
+                if chunk_id == b"fmt ":
+                    fmt = struct.unpack("<HHIIHH", f.read(16))
+                    f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+                elif chunk_id == b"data":
+                    if fmt is None or fmt[0] != WAVE_FORMAT_PCM:
+                        return None
+                    data_offset = f.tell()
+                    available = os.fstat(f.fileno()).st_size - data_offset
+                    # A still-growing streamed file has a placeholder size; trust the file length
+                    if chunk_size in (0, 0xFFFFFFFF):
+                        data_size = available
+                    else:
+                        data_size = min(chunk_size, available)
+                    return {
+                        "channels": fmt[1],
+                        "sample_rate": fmt[2],
+                        "sample_width": fmt[5] // 8,
+                        "data_offset": data_offset,
+                        "data_size": data_size,
+                    }
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
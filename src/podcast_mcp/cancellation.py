@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+import anyio
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLIENT_CANCELLED = "Request was cancelled by the client"
+
+
+class RenderCancelled(Exception):
+    """Raised at the next sentence or segment boundary of a render that was cancelled."""
+
+
+class CancelToken:
+    """
+    Cancellation flag of one render, shared by its task and its worker threads.
+
+    Threads cannot be interrupted, so they poll the token with
+    check_cancelled() at sentence and segment boundaries.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = "Render was cancelled"
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: Optional[str] = None) -> None:
+        if not self._event.is_set():
+            if reason:
+                self.reason = reason
+            self._event.set()
+
+    def check(self) -> None:
+        """Raise RenderCancelled if the token was cancelled."""
+        if self._event.is_set():
+            raise RenderCancelled(self.reason)
+
+
+# Token of the render running in this context; run_in_thread copies it into worker threads
+_current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "cancel_token", default=None
+)
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken] = None) -> Iterator[CancelToken]:
+    """Make token (or a new one) the cancellation token of this context."""
+    token = token or CancelToken()
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    """
+    Raise RenderCancelled if the current render was cancelled.
+
+    Called by synthesis and combining code between sentences and segments;
+    does nothing outside a render.
+    """
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+
+async def wait_shielded(future: "asyncio.Future[Any]") -> None:
+    """
+    Wait for a future to finish, even while the calling task is being cancelled.
+
+    MCP cancels a request through anyio, which re-delivers the cancellation
+    on every await of the cancelled task unless it is shielded. The outcome
+    of the future is retrieved but not raised.
+    """
+    with anyio.CancelScope(shield=True):
+        await asyncio.wait([future])
+    if not future.cancelled():
+        future.exception()  # Retrieved, so asyncio does not log it as unhandled
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any) -> T:
+    """
+    Like asyncio.to_thread, but a cancelled caller also stops the thread.
+
+    When the awaiting task is cancelled (an MCP client cancelled the request
+    or went away), the current render's token is cancelled and the thread
+    is waited for: it stops at its next sentence or segment boundary, and
+    the caller's cleanup does not race it.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(None, functools.partial(context.run, func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        token = _current_token.get()
+        if token is not None:
+            token.cancel(CLIENT_CANCELLED)
+        await wait_shielded(future)
+        raise
@@ -22,25 +22,157 @@ load_dotenv()
 class Config:
     XTTS_MODEL: str = os.getenv("XTTS_MODEL", "tts_models/multilingual/multi-dataset/xtts_v2")
     XTTS_DEVICE: str = os.getenv("XTTS_DEVICE", "cpu")
+    
+    # CPU performance mode (XTTS_DEVICE=cpu only): inference_mode execution plus the options below
+    CPU_PERF_MODE: bool = os.getenv("CPU_PERF_MODE", "false").lower() in ("1", "true", "yes")
+    CPU_QUANTIZE: str = os.getenv("CPU_QUANTIZE", "none").lower()  # "none" or "int8" (dynamic, GPT linear layers)
+    CPU_COMPILE: str = os.getenv("CPU_COMPILE", "none").lower()  # "none" or "compile" (torch.compile)
+    TORCH_INTRA_OP_THREADS: int = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))  # 0 = torch default
+    TORCH_INTER_OP_THREADS: int = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
     TTS_SPEED: float = float(os.getenv("TTS_SPEED", "1.2"))
     
+    # "coqui" (real model) or "synthetic" (deterministic tones, for benchmarks and load tests)
+    TTS_BACKEND: str = os.getenv("TTS_BACKEND", "coqui").lower()
+    SYNTHETIC_TTS_LATENCY_MS: float = float(os.getenv("SYNTHETIC_TTS_LATENCY_MS", "0"))
+    SYNTHETIC_TTS_RTF: float = float(os.getenv("SYNTHETIC_TTS_RTF", "0"))  # Emulated compute seconds per audio second
+    
+    # Load the model in the background right after startup (plus a short warm-up inference)
+    PRELOAD_MODEL: bool = os.getenv("PRELOAD_MODEL", "false").lower() in ("1", "true", "yes")
+    PRELOAD_WARMUP: bool = os.getenv("PRELOAD_WARMUP", "true").lower() in ("1", "true", "yes")
+    
+    # Idle eviction: free the model's memory after this many seconds without requests (0 = keep it loaded).
+    # Lower values save memory between sessions but the next request pays the reload; with
+    # MODEL_MMAP_RELOAD the weights are mapped back from a cache file instead of rebuilding the model.
+    MODEL_IDLE_TIMEOUT_S: float = float(os.getenv("MODEL_IDLE_TIMEOUT_S", "0"))
+    MODEL_MMAP_RELOAD: bool = os.getenv("MODEL_MMAP_RELOAD", "true").lower() in ("1", "true", "yes")
+    
+    # Parallel synthesis: number of worker processes (each loads its own model, 0 = in-process)
+    TTS_WORKERS: int = int(os.getenv("TTS_WORKERS", "0"))
+    TTS_WORKER_THREADS: int = int(os.getenv("TTS_WORKER_THREADS", "0"))  # torch threads per worker, 0 = cores / workers
+    
+    # Split segments into sentence-sized units and synthesize them in batches
+    SENTENCE_CHUNKING: bool = os.getenv("SENTENCE_CHUNKING", "false").lower() in ("1", "true", "yes")
+    CHUNK_MAX_CHARS: int = int(os.getenv("CHUNK_MAX_CHARS", "0"))  # 0 = model's per-language limit
+    INFERENCE_BATCH_SIZE: int = int(os.getenv("INFERENCE_BATCH_SIZE", "8"))
+    SENTENCE_PAUSE_MS: int = int(os.getenv("SENTENCE_PAUSE_MS", "0"))
+    
+    # One thread runs the model for all renders of the process. Texts of concurrent renders queued
+    # together share a batch (at most INFERENCE_BATCH_SIZE, same language and quality, lengths within
+    # INFERENCE_BATCH_LENGTH_RATIO of each other); after a batch, the next one waits at most
+    # INFERENCE_BATCH_WINDOW_MS for its renders to come back (a lone render never waits). Backends
+    # without batched inference (XTTS) run the batch back to back, so they are serialized, not batched
+    INFERENCE_BATCH_WINDOW_MS: float = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "5"))
+    INFERENCE_BATCH_LENGTH_RATIO: float = float(os.getenv("INFERENCE_BATCH_LENGTH_RATIO", "2.0"))
+    
+    # Streaming output: append audio to the output file as it is synthesized (compressed formats via ffmpeg)
+    STREAMING_OUTPUT: bool = os.getenv("STREAMING_OUTPUT", "false").lower() in ("1", "true", "yes")
+    STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "20"))  # XTTS GPT tokens per streamed chunk
+    STREAM_HEADER_INTERVAL_S: float = float(os.getenv("STREAM_HEADER_INTERVAL_S", "2.0"))
+    
     # Voice configuration (best defaults: warm female + deep male)
     VOICE_1: str = os.getenv("VOICE_1", "Annmarie Nele")    # Female (warm, clear)
     VOICE_2: str = os.getenv("VOICE_2", "Damien Black")     # Male (deep, professional)
     VOICE_3: str = os.getenv("VOICE_3", "Sofia Hellen")     # Female (professional, news)
     VOICE_4: str = os.getenv("VOICE_4", "Craig Gutsy")      # Male (energetic)
     
+    # Draft renders (script header "quality: draft", or DEFAULT_QUALITY=draft) use a small fast model for
+    # previews of pacing and structure; its voices approximate VOICE_1-4. The default VCTK VITS model is
+    # English only and runs many times faster than real time on CPU
+    DEFAULT_QUALITY: str = os.getenv("DEFAULT_QUALITY", "final").lower()  # "final" or "draft"
+    DRAFT_MODEL: str = os.getenv("DRAFT_MODEL", "tts_models/en/vctk/vits")
+    DRAFT_VOICE_1: str = os.getenv("DRAFT_VOICE_1", "p225")  # Female
+    DRAFT_VOICE_2: str = os.getenv("DRAFT_VOICE_2", "p226")  # Male
+    DRAFT_VOICE_3: str = os.getenv("DRAFT_VOICE_3", "p228")  # Female
+    DRAFT_VOICE_4: str = os.getenv("DRAFT_VOICE_4", "p227")  # Male
+    
     # Use Downloads for output and hidden temp directory
     _HOME_DIR: str = os.path.expanduser("~")
     OUTPUT_DIR: str = os.getenv("OUTPUT_DIR", os.path.join(_HOME_DIR, "Downloads"))
     TEMP_DIR: str = os.getenv("TEMP_DIR", os.path.join(_HOME_DIR, ".podcast-mcp-temp"))
+    CACHE_DIR: str = os.getenv("CACHE_DIR", os.path.join(_HOME_DIR, ".podcast-mcp-cache"))
     
     DEFAULT_SAMPLE_RATE: int = int(os.getenv("DEFAULT_SAMPLE_RATE", "24000"))
     DEFAULT_PAUSE_MS: int = int(os.getenv("DEFAULT_PAUSE_MS", "800"))
-    DEFAULT_FORMAT: str = os.getenv("DEFAULT_FORMAT", "wav")
+    DEFAULT_FORMAT: str = os.getenv("DEFAULT_FORMAT", "wav")  # wav, mp3, opus, ogg or flac
+    
+    # Compressed output (encoded by ffmpeg while the episode is assembled);
+    # DEFAULT_SAMPLE_RATE is the encoded sample rate (0 = model rate)
+    OUTPUT_BITRATE: str = os.getenv("OUTPUT_BITRATE", "128k")
+    OUTPUT_CHANNELS: int = int(os.getenv("OUTPUT_CHANNELS", "1"))
+    FFMPEG_BINARY: str = os.getenv("FFMPEG_BINARY", "ffmpeg")
+    
+    # "file": segments are written to TEMP_DIR and decoded again when combining
+    # "memory": waveforms stay in memory, only the final output touches disk
+    AUDIO_PIPELINE: str = os.getenv("AUDIO_PIPELINE", "file").lower()
+    
+    # Post-processing of synthesized segments before they are combined (off by default: it decodes
+    # every segment and changes levels, while plain WAV segments are otherwise copied byte for byte):
+    # trim edge silence quieter than TRIM_SILENCE_DB (0 = keep it), bring every speaker to
+    # LOUDNESS_TARGET_DBFS average level (0 = keep levels), fade segment edges over CROSSFADE_MS
+    # (overlapped when the pause is 0) and, with RESAMPLE_OUTPUT, resample to DEFAULT_SAMPLE_RATE
+    POST_PROCESS: bool = os.getenv("POST_PROCESS", "false").lower() in ("1", "true", "yes")
+    TRIM_SILENCE_DB: float = float(os.getenv("TRIM_SILENCE_DB", "-50"))
+    TRIM_PAD_MS: int = int(os.getenv("TRIM_PAD_MS", "40"))
+    LOUDNESS_TARGET_DBFS: float = float(os.getenv("LOUDNESS_TARGET_DBFS", "-20"))
+    CROSSFADE_MS: int = int(os.getenv("CROSSFADE_MS", "10"))
+    RESAMPLE_OUTPUT: bool = os.getenv("RESAMPLE_OUTPUT", "false").lower() in ("1", "true", "yes")
+    
+    # Segments queued between synthesis and the thread that post-processes and writes them, so both
+    # run at once (0 = combine only after everything is synthesized). Not used with TTS_WORKERS,
+    # SENTENCE_CHUNKING or streaming output; post-processing then matches loudness progressively.
+    PIPELINE_DEPTH: int = int(os.getenv("PIPELINE_DEPTH", "2"))
+    
+    # Segment cache (re-renders only synthesize changed lines)
+    SEGMENT_CACHE_ENABLED: bool = os.getenv("SEGMENT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    SEGMENT_CACHE_DIR: str = os.getenv("SEGMENT_CACHE_DIR", os.path.join(CACHE_DIR, "segments"))
+    SEGMENT_CACHE_MAX_MB: int = int(os.getenv("SEGMENT_CACHE_MAX_MB", "1024"))
+    
+    # Precomputed speaker conditioning latents, keyed by model and voice
+    SPEAKER_LATENT_DIR: str = os.getenv("SPEAKER_LATENT_DIR", os.path.join(CACHE_DIR, "latents"))
+    
+    # Model weights saved on idle eviction, memory-mapped on reload and then deleted
+    MODEL_WEIGHTS_CACHE_DIR: str = os.getenv("MODEL_WEIGHTS_CACHE_DIR", os.path.join(CACHE_DIR, "weights"))
+    
+    # Cost model: synthesis speed learned per model, device, language and voice and kept across restarts;
+    # it drives progress ETAs and admission. COST_MODEL_DEFAULT_CPS is assumed until something was measured
+    COST_MODEL_PATH: str = os.getenv("COST_MODEL_PATH", os.path.join(CACHE_DIR, "cost_model.json"))
+    COST_MODEL_DEFAULT_CPS: float = float(os.getenv("COST_MODEL_DEFAULT_CPS", "15"))
+    COST_MODEL_SAVE_INTERVAL_S: float = float(os.getenv("COST_MODEL_SAVE_INTERVAL_S", "30"))
+    # Admission (0 = no limit): generate_podcast refuses scripts predicted to take longer than
+    # RENDER_TIME_BUDGET_S (they can be queued with submit_podcast instead), and submit_podcast refuses
+    # jobs once the predicted work of queued and running jobs would exceed MAX_QUEUED_WORK_S
+    RENDER_TIME_BUDGET_S: float = float(os.getenv("RENDER_TIME_BUDGET_S", "0"))
+    MAX_QUEUED_WORK_S: float = float(os.getenv("MAX_QUEUED_WORK_S", "0"))
+    
+    # Checkpointed renders: finished segments survive failures and restarts and can be resumed
+    # (file pipeline only; AUDIO_PIPELINE=memory, SENTENCE_CHUNKING and STREAMING_OUTPUT renders cannot)
+    RENDER_CHECKPOINTS: bool = os.getenv("RENDER_CHECKPOINTS", "true").lower() in ("1", "true", "yes")
+    RENDER_CHECKPOINT_DIR: str = os.getenv("RENDER_CHECKPOINT_DIR", "")  # Empty = TEMP_DIR/renders
+    RENDER_CHECKPOINT_MAX_AGE_HOURS: float = float(os.getenv("RENDER_CHECKPOINT_MAX_AGE_HOURS", "72"))
+    SEGMENT_RETRIES: int = int(os.getenv("SEGMENT_RETRIES", "1"))  # Extra attempts for a failing segment
+    
+    # Renders running at once (tool calls and queued jobs), and finished jobs kept for status queries
+    MAX_CONCURRENT_RENDERS: int = int(os.getenv("MAX_CONCURRENT_RENDERS", "1"))
+    JOB_HISTORY_LIMIT: int = int(os.getenv("JOB_HISTORY_LIMIT", "100"))
+    
+    # Metrics: number of recent observations behind the rolling p50/p90/p99
+    METRICS_WINDOW: int = int(os.getenv("METRICS_WINDOW", "1000"))
     
     MCP_SERVER_NAME: str = os.getenv("MCP_SERVER_NAME", "podcast-mcp")
     MCP_LOG_LEVEL: str = os.getenv("MCP_LOG_LEVEL", "INFO")
+    
+    # Transport: "stdio" (one client per server process) or "streamable-http" / "sse" (one long-running
+    # server shared by many clients; paths in scripts and results refer to the server host)
+    MCP_TRANSPORT: str = os.getenv("MCP_TRANSPORT", "stdio").lower()
+    # Directory script_file paths must resolve into (symlinks followed; relative paths are taken from it).
+    # Unset, script_file may name any readable file over stdio and is refused over the HTTP transports
+    SCRIPTS_DIR: str = os.getenv("SCRIPTS_DIR", "")
+    MCP_HOST: str = os.getenv("MCP_HOST", "127.0.0.1")
+    MCP_PORT: int = int(os.getenv("MCP_PORT", "8000"))
+    # Renders one client may run at once (0 = only MAX_CONCURRENT_RENDERS applies); clients take turns
+    MAX_RENDERS_PER_CLIENT: int = int(os.getenv("MAX_RENDERS_PER_CLIENT", "0"))
+    # On shutdown, new renders are refused and accepted ones get this long to finish
+    SHUTDOWN_DRAIN_TIMEOUT_S: float = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_S", "300"))
 
     @classmethod
     def ensure_dirs(cls) -> None:
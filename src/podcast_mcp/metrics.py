@@ -0,0 +1,301 @@
+import time
+import bisect
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; wide enough for both sub-millisecond parsing and minute-long renders
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+RTF_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99)
+
+# Render currently being measured; asyncio.to_thread copies it into worker threads
+_current_render: contextvars.ContextVar[Optional["RenderMetrics"]] = contextvars.ContextVar(
+    "current_render", default=None
+)
+
+# Seconds spent in nested stages of the innermost active stage. Per context, so stages
+# running concurrently in different tasks or threads do not subtract each other's time
+_stage_children: contextvars.ContextVar[Optional[list[float]]] = contextvars.ContextVar(
+    "stage_children", default=None
+)
+
+
+class Histogram:
+    """
+    Prometheus-style histogram with a rolling quantile window.
+
+    Bucket counts, sum and count are cumulative since startup (as Prometheus
+    expects); quantiles are computed over the last `window` observations so
+    they follow the current load.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, window: Optional[int] = None):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent: deque[float] = deque(maxlen=window or Config.METRICS_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRegistry:
+    """Process-wide histograms and counters, keyed by metric name and label set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._help: dict[str, str] = {}
+
+    def observe(self, name: str, value: float, labels: Optional[dict[str, str]] = None,
+                buckets: tuple[float, ...] = DEFAULT_BUCKETS, help: str = "") -> None:
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+                self._help.setdefault(name, help)
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, labels: Optional[dict[str, str]] = None, help: str = "") -> None:
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._help.setdefault(name, help)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def summary(self) -> dict[str, Any]:
+        """Rolling p50/p90/p99 and totals per histogram, as flat 'name{labels}_pXX' fields."""
+        fields: dict[str, Any] = {}
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                label_text = "".join(f"_{v}" for _, v in labels)
+                fields[f"{name}{label_text}_count"] = histogram.count
+                for q in QUANTILES:
+                    value = histogram.quantile(q)
+                    if value is not None:
+                        fields[f"{name}{label_text}_p{int(q * 100)}"] = round(value, 4)
+            for (name, labels), value in sorted(self._counters.items()):
+                label_text = "".join(f"_{v}" for _, v in labels)
+                fields[f"{name}{label_text}"] = value
+        return fields
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            typed: set[str] = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# HELP {name} {self._help.get(name, '')}".rstrip())
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# HELP {name} {self._help.get(name, '')}".rstrip())
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+            # Rolling quantiles as a separate gauge family (histograms cannot carry them)
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                for q in QUANTILES:
+                    value = histogram.quantile(q)
+                    if value is None:
+                        continue
+                    if f"{name}_recent" not in typed:
+                        typed.add(f"{name}_recent")
+                        lines.append(f"# HELP {name}_recent Quantiles of {name} over the recent observation window")
+                        lines.append(f"# TYPE {name}_recent gauge")
+                    lines.append(f"{name}_recent{_labels(labels, quantile=str(q))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple[tuple[str, str], ...], **extra: str) -> str:
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+METRICS = MetricsRegistry()
+
+
+class RenderMetrics:
+    """
+    Timings of a single render: one duration per stage plus one record per segment.
+
+    chars is the script's total character count; audio_seconds is set by the
+    caller once the output length is known.
+
+    Stages may be entered several times (e.g. one synthesis call per segment);
+    their durations add up. finish() pushes everything into the process-wide
+    registry so it shows up in the rolling histograms.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.segments: list[dict[str, float]] = []
+        self.chars = 0
+        self.audio_seconds = 0.0
+        self.total_seconds: Optional[float] = None
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_segment(self, chars: int, seconds: float, audio_seconds: Optional[float] = None) -> None:
+        record: dict[str, float] = {"chars": chars, "seconds": seconds}
+        if audio_seconds is not None:
+            record["audio_seconds"] = audio_seconds
+        self.segments.append(record)
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Processing seconds per second of produced audio (below 1 is faster than real time)."""
+        if not self.audio_seconds or self.total_seconds is None:
+            return None
+        return self.total_seconds / self.audio_seconds
+
+    @property
+    def chars_per_second(self) -> Optional[float]:
+        synthesis = self.stages.get("synthesize")
+        if not synthesis or not self.chars:
+            return None
+        return self.chars / synthesis
+
+    def finish(self, success: bool, cancelled: bool = False) -> None:
+        self.total_seconds = time.perf_counter() - self.started
+        outcome = "cancelled" if cancelled else "success" if success else "error"
+        METRICS.inc("podcast_renders_total", labels={"outcome": outcome}, help="Finished renders by outcome")
+        METRICS.observe("podcast_render_seconds", self.total_seconds, help="Wall time of a whole render")
+        for stage, seconds in self.stages.items():
+            METRICS.observe("podcast_stage_seconds", seconds, {"stage": stage}, help="Time spent per render stage")
+        for segment in self.segments:
+            METRICS.observe("podcast_segment_seconds", segment["seconds"], help="Synthesis time per segment")
+            if segment.get("audio_seconds"):
+                METRICS.observe(
+                    "podcast_segment_rtf", segment["seconds"] / segment["audio_seconds"],
+                    buckets=RTF_BUCKETS, help="Real-time factor per segment",
+                )
+        if success:
+            METRICS.inc("podcast_characters_total", self.chars, help="Characters synthesized")
+            METRICS.inc("podcast_audio_seconds_total", round(self.audio_seconds, 3), help="Seconds of audio produced")
+            if self.real_time_factor is not None:
+                METRICS.observe("podcast_render_rtf", self.real_time_factor, buckets=RTF_BUCKETS,
+                                help="Real-time factor of whole renders")
+
+    def summary(self) -> dict[str, Any]:
+        """Compact per-render fields for the tool result."""
+        fields: dict[str, Any] = {f"{stage}_seconds": round(s, 3) for stage, s in self.stages.items()}
+        if self.audio_seconds:
+            fields["audio_seconds"] = round(self.audio_seconds, 2)
+        if self.chars_per_second is not None:
+            fields["chars_per_second"] = round(self.chars_per_second, 1)
+        if self.real_time_factor is not None:
+            fields["real_time_factor"] = round(self.real_time_factor, 4)
+        if self.segments:
+            fields["segment_seconds_max"] = round(max(s["seconds"] for s in self.segments), 3)
+        return fields
+
+
+@contextmanager
+def track_render() -> Iterator[RenderMetrics]:
+    """Make a new RenderMetrics the current render for stage() calls in this context."""
+    render = RenderMetrics()
+    token = _current_render.set(render)
+    try:
+        yield render
+    finally:
+        _current_render.reset(token)
+
+
+class StageTimer:
+    """Result of a stage() block; seconds excludes time spent in nested stages."""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTimer]:
+    """
+    Time a block as a stage of the current render.
+
+    Stages nest: the time of an inner stage (e.g. a model load triggered by
+    the first synthesis call) is not counted again in the outer one. Outside
+    a render (e.g. a background model preload) the duration goes straight
+    to the registry.
+    """
+    timer = StageTimer()
+    render = _current_render.get()
+    parent = _stage_children.get()
+    children = [0.0]
+    token = _stage_children.set(children)
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        elapsed = time.perf_counter() - started
+        _stage_children.reset(token)
+        if parent is not None:
+            parent[0] += elapsed
+        if render is not None:
+            timer.seconds = max(0.0, elapsed - children[0])
+            render.add_stage(name, timer.seconds)
+        else:
+            timer.seconds = elapsed
+            METRICS.observe("podcast_stage_seconds", elapsed, {"stage": name}, help="Time spent per render stage")
+
+
+@contextmanager
+def idle() -> Iterator[None]:
+    """Leave a block (e.g. waiting for input) out of the enclosing stage's time."""
+    parent = _stage_children.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if parent is not None:
+            parent[0] += time.perf_counter() - started
+
+
+def current_render() -> Optional[RenderMetrics]:
+    return _current_render.get()
@@ -1,85 +1,263 @@
 import re
+import io
 import logging
 import os
-from typing import Any
+from typing import Any, Iterator, Optional, TextIO
+from ..audio.streaming_encoder import SUPPORTED_FORMATS, normalize_format
+from ..config import Config
 
 logger = logging.getLogger(__name__)
 
-MAX_SCRIPT_LENGTH = 100000  # 100k chars limit
+MAX_SCRIPT_LENGTH = 100000  # 100k chars limit for scripts passed inline (files are read in chunks)
 
-def parse_script(script: str) -> dict[str, Any]:
+READ_CHUNK_CHARS = 64 * 1024
+# Text before the first voice tag is only kept up to this size to look for header lines
+MAX_HEADER_CHARS = 64 * 1024
+
+HEADER_KEYS = ("language", "filename", "format", "quality")
+
+# "final" renders with the main model, "draft" with the small fast preview model
+QUALITIES = ("final", "draft")
+
+_TAG = re.compile(r'<(/?)voice(\d+)>')
+_HEADER_LINE = re.compile(r'^\s*([A-Za-z_]+)\s*:\s*(.*?)\s*$')
+# Longest possible partial tag at a chunk boundary, e.g. "</voice123"
+_MAX_PARTIAL_TAG = 16
+
+
+def _output_filename(raw_filename: str, format: str) -> str:
+    # Sanitize filename to prevent path traversal
+    filename = os.path.basename(raw_filename.strip())
+    # Ensure the extension matches the output format
+    stem, extension = os.path.splitext(filename)
+    if extension.lower().lstrip(".") in SUPPORTED_FORMATS:
+        filename = stem
+    return f"{filename}.{format}"
+
+
+class ScriptReader:
+    """
+    Single-pass tokenizer for dialogue scripts.
+
+    The source is read in fixed-size chunks and every character is scanned
+    once, so parsing is linear in the script size and the reader itself holds
+    no more than the longest single segment. The header (the 'key: value'
+    lines before the first voice tag) is parsed on construction; iterating
+    yields dialogue segments one at a time as each one is complete.
+
+    The render tools collect all segments (parse_script) before synthesis
+    starts, since the cost estimate, checkpoints and progress totals need the
+    whole list; a script file is never held in memory as one string, but its
+    segments are.
+
+    Format:
+        language: en
+        filename: my_podcast.mp3
+        format: mp3
+        quality: draft
+
+        <voice1>Text for voice 1
+        <voice2>Text for voice 2</voice2>
+    """
+
+    def __init__(self, source: str | TextIO, chunk_size: int = READ_CHUNK_CHARS):
+        self._stream: TextIO = io.StringIO(source) if isinstance(source, str) else source
+        self._chunk_size = chunk_size
+        self._tokens = self._scan()
+        self._first_tag: Optional[tuple[bool, str]] = None
+        self.header: dict[str, str] = {}
+        self._read_header()
+        self._segments = self._iter_segments()
+
+    @classmethod
+    def from_file(cls, path: str, chunk_size: int = READ_CHUNK_CHARS) -> "ScriptReader":
+        """Open a script file for chunked reading; close() (or the with block) closes it."""
+        return cls(open(path, "r", encoding="utf-8"), chunk_size)
+
+    @property
+    def language(self) -> str:
+        return self.header.get("language", "en")
+
+    @property
+    def format(self) -> str:
+        """
+        Output format: the format header, else the filename's extension, else DEFAULT_FORMAT.
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if "format" in self.header:
+            return normalize_format(self.header["format"])
+        extension = os.path.splitext(self.header.get("filename", ""))[1].lower().lstrip(".")
+        if extension in SUPPORTED_FORMATS:
+            return extension
+        return normalize_format(Config.DEFAULT_FORMAT)
+
+    @property
+    def quality(self) -> str:
+        """
+        Render quality: the quality header, else DEFAULT_QUALITY.
+
+        Raises:
+            ValueError: If the quality is not one of QUALITIES
+        """
+        quality = self.header.get("quality", Config.DEFAULT_QUALITY).lower()
+        if quality not in QUALITIES:
+            raise ValueError(f"Unsupported quality '{quality}'. Use one of: {', '.join(QUALITIES)}")
+        return quality
+
+    @property
+    def filename(self) -> Optional[str]:
+        raw = self.header.get("filename")
+        return _output_filename(raw, self.format) if raw else None
+
+    def _scan(self) -> Iterator[tuple[str, Any]]:
+        """
+        Yield ("text", str) and ("tag", (closing, speaker)) tokens in order.
+
+        Only the few characters that could start a tag split across two
+        chunks are carried over into the next read; everything else is
+        emitted once and dropped from the buffer.
+        """
+        buffer = ""
+        eof = False
+        while True:
+            position = 0
+            for match in _TAG.finditer(buffer):
+                if match.start() > position:
+                    yield "text", buffer[position:match.start()]
+                yield "tag", (bool(match.group(1)), match.group(2))
+                position = match.end()
+
+            if eof:
+                if position < len(buffer):
+                    yield "text", buffer[position:]
+                return
+
+            # Hold back a trailing '<...' that may be completed by the next chunk
+            carry = buffer.rfind("<", max(position, len(buffer) - _MAX_PARTIAL_TAG))
+            if carry == -1:
+                carry = len(buffer)
+            if carry > position:
+                yield "text", buffer[position:carry]
+
+            chunk = self._stream.read(self._chunk_size)
+            eof = not chunk
+            buffer = buffer[carry:] + chunk
+
+    def _read_header(self) -> None:
+        """Consume input up to the first voice tag and parse 'key: value' header lines before it."""
+        pre_text: list[str] = []
+        pre_chars = 0
+        for kind, value in self._tokens:
+            if kind == "tag" and not value[0]:
+                self._first_tag = value
+                break
+            if kind == "text" and pre_chars < MAX_HEADER_CHARS:
+                pre_text.append(value)
+                pre_chars += len(value)
+
+        ignored: list[str] = []
+        for line in "".join(pre_text)[:MAX_HEADER_CHARS].splitlines():
+            header = _HEADER_LINE.match(line)
+            if header and header.group(1).lower() in HEADER_KEYS:
+                key = header.group(1).lower()
+                words = header.group(2).split()
+                # Language, format and quality are single words; anything after them is ignored
+                value = header.group(2) if key == "filename" else (words[0] if words else "")
+                if value:
+                    self.header.setdefault(key, value)
+            elif line.strip():
+                ignored.append(line.strip())
+
+        if ignored and self._first_tag is not None:
+            # Check for text outside tags (e.g. intro without tag)
+            logger.warning(f"Found text outside voice tags: '{' '.join(ignored)[:50]}...'. This text will be ignored.")
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        """Segments not yet consumed; the reader is a one-shot iterator like a file."""
+        return self._segments
+
+    def _iter_segments(self) -> Iterator[dict[str, str]]:
+        """
+        Yield dialogue segments in script order.
+
+        Both <voice1>text and <voice1>text</voice1> are accepted; a segment
+        ends at its closing tag, the next opening tag or the end of input.
+        Text between a closing tag and the next opening tag is ignored.
+
+        Yields:
+            dict with 'speaker' ("1", "2", ...) and 'text'
+        """
+        if self._first_tag is None:
+            return
+        speaker: Optional[str] = self._first_tag[1]
+        parts: list[str] = []
+
+        for kind, value in self._tokens:
+            if kind == "text":
+                if speaker is not None:
+                    parts.append(value)
+                continue
+
+            closing, tag_speaker = value
+            if speaker is not None:
+                text = "".join(parts).strip()
+                if text:  # Only yield non-empty segments
+                    yield {"speaker": speaker, "text": text}
+            parts = []
+            speaker = None if closing else tag_speaker
+
+        if speaker is not None:
+            text = "".join(parts).strip()
+            if text:
+                yield {"speaker": speaker, "text": text}
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "ScriptReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def parse_script(script: str | TextIO) -> dict[str, Any]:
     """
     Parse a script with <voice1> and <voice2> tags into dialogue segments.
-    
+
     Format:
         language: en
         filename: my_podcast.wav
-        
+
         <voice1>Text for voice 1
         <voice2>Text for voice 2
         <voice1>More text for voice 1
-        
+
     Args:
-        script: The script text with voice tags
-        
+        script: The script text with voice tags, or an open text stream
+            (streams are not subject to MAX_SCRIPT_LENGTH)
+
     Returns:
-        dict with 'dialogue' list, 'language', and optional 'filename'
+        dict with 'dialogue' list, 'language', 'quality' and 'output' ('file' and 'format')
     """
-    if len(script) > MAX_SCRIPT_LENGTH:
+    if isinstance(script, str) and len(script) > MAX_SCRIPT_LENGTH:
         raise ValueError(f"Script too long ({len(script)} chars). Max allowed is {MAX_SCRIPT_LENGTH}.")
 
-    # Extract language if specified (optional)
-    language = "en"
-    language_match = re.search(r'language:\s*(\w+)', script, re.IGNORECASE)
-    if language_match:
-        language = language_match.group(1)
-    
-    # Extract filename if specified (optional)
-    filename: str | None = None
-    filename_match = re.search(r'filename:\s*(.+?)(?:\n|$)', script, re.IGNORECASE)
-    if filename_match:
-        raw_filename = filename_match.group(1).strip()
-        # Sanitize filename to prevent path traversal
-        filename = os.path.basename(raw_filename)
-        # Ensure .wav extension
-        if not filename.endswith('.wav'):
-            filename += '.wav'
-    
-    # Parse voice tags
-    dialogue: list[dict[str, str]] = []
-    
-    # Check for text outside tags (e.g. intro without tag)
-    first_tag_match = re.search(r'<voice\d+>', script)
-    if first_tag_match:
-        pre_text = script[:first_tag_match.start()].strip()
-        # Remove header lines (language:, filename:) from check
-        pre_text = re.sub(r'(language|filename):.*(\n|$)', '', pre_text, flags=re.IGNORECASE).strip()
-        if pre_text:
-            logger.warning(f"Found text outside voice tags: '{pre_text[:50]}...'. This text will be ignored.")
-
-    # Find all <voiceN> tags with their content
-    # Pattern handles both <voice1>text and <voice1>text</voice1> formats
-    pattern = r'<voice(\d+)>(.*?)(?:</voice\d+>|(?=<voice\d+>)|$)'
-    matches = re.findall(pattern, script, re.DOTALL)
-    
-    for voice_num, text in matches:
-        # Strip whitespace and any remaining closing tags
-        text = text.strip()
-        # Remove any closing tags that might have been captured
-        text = re.sub(r'</voice\d+>', '', text).strip()
-        if text:  # Only add non-empty segments
-            dialogue.append({
-                "speaker": voice_num,  # "1", "2", "3", etc.
-                "text": text
-            })
-    
+    reader = ScriptReader(script)
+    dialogue: list[dict[str, str]] = list(reader)
+
     if not dialogue:
         raise ValueError("No dialogue found. Use <voice1>, <voice2>, etc. tags to mark dialogue.")
-    
+
+    output_format = reader.format
     result = {
-        "language": language,
+        "language": reader.language,
+        "quality": reader.quality,
         "dialogue": dialogue,
-        "output": {"file": filename or "podcast.wav"}  # Use custom filename or default
+        # Use custom filename or default
+        "output": {"file": reader.filename or f"podcast.{output_format}", "format": output_format}
     }
-    
+
     return result
@@ -1,7 +1,22 @@
+import time
+_import_started = time.perf_counter()
+
 from mcp.server.fastmcp import FastMCP, Context
 from .tools.generate_podcast import GeneratePodcastTool
+from .tools.job_manager import JobManager, QueueFull, RUNNING, QUEUED, SUCCEEDED, FINISHED_STATES
+from .tools.render_scheduler import LOCAL_CLIENT, RenderScheduler, ServerDraining
+from .tools.render_checkpoint import list_checkpoints, prune_checkpoints
+from .tts.model_memory import purge_weights_cache
+from .metrics import METRICS
 from .config import Config
+import asyncio
 import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+# Startup phase durations in seconds (the model itself loads lazily or in the background)
+STARTUP_TIMINGS: dict[str, float] = {"imports_seconds": round(time.perf_counter() - _import_started, 3)}
+_server_started = time.time()
 
 # Setup logging to stderr (MCP best practice)
 # Claude Desktop automatically captures stderr logs to ~/Library/Logs/Claude/mcp-server-Podcast MCP.log
@@ -13,13 +28,107 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize FastMCP
-mcp = FastMCP(Config.MCP_SERVER_NAME)
+_init_started = time.perf_counter()
+mcp = FastMCP(Config.MCP_SERVER_NAME, host=Config.MCP_HOST, port=Config.MCP_PORT)
 
-# Initialize tools
+# Initialize tools; all renders share one model and take turns through the scheduler
 podcast_tool = GeneratePodcastTool()
+scheduler = RenderScheduler()
+job_manager = JobManager(podcast_tool, scheduler=scheduler)
+STARTUP_TIMINGS["init_seconds"] = round(time.perf_counter() - _init_started, 3)
+
+
+def _format_fields(fields: dict) -> str:
+    """Render a flat dict as TOON-like 'key: value' lines, skipping empty values."""
+    lines = []
+    for key, value in fields.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        lines.append(f"{key}: {value}")
+    return "\n".join(lines)
+
+
+def _client_key(ctx: Context) -> str:
+    """
+    Identify the calling client for per-client limits and fair turns.
+
+    Uses the client id from the request metadata, else the HTTP session
+    (or the peer address for stateless requests); stdio has a single client.
+    """
+    try:
+        request_context = ctx.request_context
+    except ValueError:
+        return LOCAL_CLIENT
+    client_id = getattr(request_context.meta, "client_id", None) if request_context.meta else None
+    if client_id:
+        return str(client_id)
+    request = request_context.request
+    if request is not None and hasattr(request, "headers"):
+        session_id = request.headers.get("mcp-session-id") or request.query_params.get("session_id")
+        if session_id:
+            return session_id
+        if request.client is not None:
+            return request.client.host
+    return LOCAL_CLIENT
+
+
+async def _scheduled(ctx: Context, render: Callable[[], Awaitable[dict]]) -> dict[str, Any]:
+    """Run a render once the calling client gets a slot."""
+    try:
+        scheduler.admit()
+    except ServerDraining as e:
+        return {"success": False, "error": str(e)}
+    async with scheduler.slot(_client_key(ctx)):
+        return await render()
+
+
+async def _estimate(script: str, script_file: str) -> tuple[Optional[float], Optional[dict]]:
+    """
+    Predicted synthesis seconds of a script and the parsed script, so the render
+    does not parse it again; (None, None) if it does not parse (the render reports why).
+    """
+    try:
+        prepared = await podcast_tool.prepare_async(script, script_file or None)
+        return await podcast_tool.estimate_async(script, prepared=prepared), prepared
+    except ValueError:
+        return None, None
+
+
+def _format_result(result: dict) -> str:
+    if result["success"]:
+        text = (
+            f"success: true\n"
+            f"output_file: {result['output_file']}\n"
+            f"processing_time_seconds: {result['processing_time_seconds']}\n"
+            f"total_segments: {result['total_segments']}"
+        )
+        if result.get("quality"):
+            text += f"\nquality: {result['quality']}"
+        if result.get("estimated_seconds") is not None:
+            text += f"\nestimated_seconds: {result['estimated_seconds']}"
+        if result.get("metrics"):
+            text += "\n" + _format_fields(result["metrics"])
+        return text
+    else:
+        text = (
+            f"success: false\n"
+            f"error: {result.get('error')}"
+        )
+        if result.get("cancelled"):
+            text += "\n" + _format_fields({"cancelled": True, "saved_seconds": result.get("saved_seconds")})
+        if result.get("render_id"):
+            # Finished segments were kept; resume_podcast only redoes the rest
+            text += "\n" + _format_fields({
+                "render_id": result["render_id"],
+                "failed_segments": result.get("failed_segments"),
+                "resumable": True,
+            })
+        return text
 
 @mcp.tool()
-async def generate_podcast(script: str, ctx: Context) -> str:
+async def generate_podcast(ctx: Context, script: str = "", script_file: str = "") -> str:
     """
     Generates a podcast dialogue with AI voices.
     
@@ -41,36 +150,379 @@ async def generate_podcast(script: str, ctx: Context) -> str:
         
     Optional parameters (add at the start):
         language: de
-        filename: barcelona_vs_bilbao.wav
+        filename: barcelona_vs_bilbao.mp3
+        format: mp3  (wav, mp3, opus, ogg or flac; defaults to the filename's extension)
+        quality: draft  (fast preview with a small model and approximate voices; default final)
         
         <voice1>Willkommen zu unserem Podcast!
         <voice2>Danke für die Einladung.
     
+    For very long scripts (e.g. audiobook-length transcripts), save the script
+    to a UTF-8 text file and pass its path as script_file instead; it has no
+    length limit and is parsed without loading the whole file as one string.
+    
     Args:
         script: The dialogue script with <voice1>, <voice2>, etc. tags
+        script_file: Path to a script file, used instead of script (inside the
+            server's SCRIPTS_DIR when one is configured)
         
     Returns:
-        Success message with output file path, or error message
+        Success message with output file path, or error message. Scripts
+        predicted to take longer than the server's time budget are refused;
+        queue those with submit_podcast. Failed renders report a render_id for
+        resume_podcast, except on servers set to render in memory
+        (AUDIO_PIPELINE=memory), by sentence (SENTENCE_CHUNKING) or with
+        streaming output: those keep no checkpoint and cannot be resumed.
     """
-    result = await podcast_tool.run_async(script, ctx)
+    prepared = None
+    if Config.RENDER_TIME_BUDGET_S > 0:
+        estimated, prepared = await _estimate(script, script_file)
+        if estimated is not None and estimated > Config.RENDER_TIME_BUDGET_S:
+            return _format_fields({
+                "success": False,
+                "error": f"Predicted synthesis time {estimated:.0f}s exceeds the {Config.RENDER_TIME_BUDGET_S:.0f}s "
+                         f"budget for direct renders; queue it with submit_podcast instead",
+                "estimated_seconds": round(estimated, 1),
+            })
+
+    result = await _scheduled(
+        ctx, lambda: podcast_tool.run_async(script, ctx, script_file=script_file or None, prepared=prepared)
+    )
     
     # Convert result dict to a simple string or TOON-like response
-    if result["success"]:
-        return (
-            f"success: true\n"
-            f"output_file: {result['output_file']}\n"
-            f"processing_time_seconds: {result['processing_time_seconds']}\n"
-            f"total_segments: {result['total_segments']}"
+    return _format_result(result)
+
+
+@mcp.tool()
+async def generate_podcast_batch(
+    ctx: Context, scripts: list[str] | None = None, script_files: list[str] | None = None
+) -> str:
+    """
+    Generates many podcasts in one call, e.g. a daily series in several languages.
+    
+    Each script has the same format as for generate_podcast; give each one its
+    own filename header (scripts without one are numbered podcast.wav,
+    podcast_2.wav, ...). Lines repeated across scripts, like a shared intro,
+    are synthesized only once, and all scripts share the loaded model, so a
+    batch is much faster than rendering the scripts one by one. Each script
+    is written as soon as its audio is ready and reported as a log message.
+    
+    Args:
+        scripts: Dialogue scripts with <voice1>, <voice2>, etc. tags
+        script_files: Paths to script files, rendered after the scripts (inside
+            SCRIPTS_DIR when one is configured)
+        
+    Returns:
+        Batch totals, then one block per script with its output file or error
+    """
+    total = len(scripts or []) + len(script_files or [])
+
+    async def on_result(index: int, result: dict) -> None:
+        status = result["output_file"] if result["success"] else f"failed: {result.get('error')}"
+        await ctx.info(f"script {index + 1}/{total}: {status}")
+
+    batch = await _scheduled(
+        ctx, lambda: podcast_tool.run_batch_async(scripts or [], ctx, script_files or [], on_result)
+    )
+    blocks = [_format_fields({
+        "success": batch["success"],
+        "error": batch.get("error"),
+        "scripts_succeeded": batch.get("scripts_succeeded"),
+        "scripts_failed": batch.get("scripts_failed"),
+        "unique_units": batch.get("unique_units"),
+        "total_units": batch.get("total_units"),
+        "processing_time_seconds": batch.get("processing_time_seconds"),
+        **batch.get("metrics", {}),
+    })]
+    for i, result in enumerate(batch.get("results", [])):
+        # Per-script results carry no metrics of their own; the batch totals above cover them
+        blocks.append(f"script: {i + 1}\n" + _format_result(result))
+    return "\n\n".join(blocks)
+
+
+@mcp.tool()
+async def resume_podcast(render_id: str, ctx: Context) -> str:
+    """
+    Resumes a podcast render that failed or was interrupted.
+    
+    Failed renders report a render_id. Segments that were already synthesized
+    are reused; only missing or failed segments are generated again before
+    the episode is assembled. Renders in memory, by sentence or with
+    streaming output keep no checkpoint and cannot be resumed.
+    
+    Args:
+        render_id: Id reported by the failed render (see list_resumable_renders)
+        
+    Returns:
+        Success message with output file path, or error message
+    """
+    result = await _scheduled(ctx, lambda: podcast_tool.resume_async(render_id, ctx))
+    return _format_result(result)
+
+
+@mcp.tool()
+async def list_resumable_renders() -> str:
+    """
+    Lists renders whose finished segments were kept after a failure or crash.
+    
+    Returns:
+        One line per render with id, output file and segments done
+    """
+    checkpoints = list_checkpoints()
+    if not checkpoints:
+        return "renders: 0"
+    lines = [f"renders: {len(checkpoints)}"]
+    for checkpoint in checkpoints:
+        info = checkpoint.summary()
+        lines.append(
+            f"- {info['render_id']} output={info['output_file']} "
+            f"done={info['segments_done']}/{info['segments_total']} failed={info['segments_failed']} "
+            f"updated={info['updated_at']}"
         )
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def submit_podcast(ctx: Context, script: str = "", priority: int = 0, script_file: str = "") -> str:
+    """
+    Queues a podcast render and returns a job id immediately.
+    
+    Use this instead of generate_podcast for long scripts. The script format is
+    the same as for generate_podcast. Poll get_podcast_job for progress and
+    fetch the output with get_podcast_result once the job has succeeded.
+    
+    Args:
+        script: The dialogue script with <voice1>, <voice2>, etc. tags
+        priority: Higher values start before lower ones (default 0)
+        script_file: Path to a script file, used instead of script (no length limit;
+            inside SCRIPTS_DIR when one is configured)
+        
+    Returns:
+        Job id, queue position, predicted synthesis seconds and predicted
+        seconds until the job starts
+    """
+    # The job parses the script again when it starts, so a script file edited meanwhile is picked up
+    estimated, _ = await _estimate(script, script_file)
+    try:
+        job = await job_manager.submit(script, priority, script_file or None, _client_key(ctx), estimated)
+    except (ServerDraining, QueueFull) as e:
+        return _format_fields({"success": False, "error": str(e)})
+    expected_start = job_manager.expected_start(job.id)
+    return _format_fields({
+        "job_id": job.id,
+        "status": job.status,
+        "queue_position": job_manager.queue_position(job.id),
+        "estimated_seconds": round(estimated, 1) if estimated is not None else None,
+        "estimated_start_seconds": round(expected_start, 1) if expected_start is not None else None,
+    })
+
+
+@mcp.tool()
+async def get_podcast_job(job_id: str) -> str:
+    """
+    Returns the status of a submitted podcast render.
+    
+    Args:
+        job_id: Id returned by submit_podcast
+        
+    Returns:
+        Status, stage, progress, percent, estimated seconds remaining and,
+        while queued, predicted seconds until it starts
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return _format_fields({"success": False, "error": f"Unknown job {job_id}"})
+    fields = job.to_dict()
+    fields["queue_position"] = job_manager.queue_position(job_id)
+    expected_start = job_manager.expected_start(job_id)
+    fields["estimated_start_seconds"] = round(expected_start, 1) if expected_start is not None else None
+    return _format_fields(fields)
+
+
+@mcp.tool()
+async def get_podcast_result(job_id: str) -> str:
+    """
+    Returns the result of a finished podcast render.
+    
+    Args:
+        job_id: Id returned by submit_podcast
+        
+    Returns:
+        Output file path on success, the error otherwise, or the current
+        status if the job has not finished yet
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return _format_fields({"success": False, "error": f"Unknown job {job_id}"})
+    if job.status not in FINISHED_STATES:
+        return _format_fields({"job_id": job.id, "status": job.status, "percent": job.to_dict()["percent"]})
+    if job.status == SUCCEEDED and job.result:
+        return _format_result(job.result)
+    return _format_fields({"success": False, "status": job.status, "error": job.error})
+
+
+@mcp.tool()
+async def cancel_podcast_job(job_id: str) -> str:
+    """
+    Cancels a queued or running podcast render.
+    
+    A running render stops before its next segment and its temporary files are removed.
+    
+    Args:
+        job_id: Id returned by submit_podcast
+    """
+    cancelled = job_manager.cancel(job_id)
+    return _format_fields({"job_id": job_id, "cancelled": cancelled})
+
+
+@mcp.tool()
+async def list_podcast_jobs() -> str:
+    """
+    Lists submitted podcast renders, oldest first.
+    
+    Returns:
+        One line per job with id, status, priority and percent complete
+    """
+    jobs = job_manager.list()
+    if not jobs:
+        return "jobs: 0"
+    lines = [f"jobs: {len(jobs)}"]
+    for job in jobs:
+        info = job.to_dict()
+        lines.append(f"- {job.id} status={job.status} priority={job.priority} percent={info['percent']}")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def get_server_status() -> str:
+    """
+    Returns the readiness of the podcast server.
+    
+    model_state is "cold" (loads on first request), "loading", "warming",
+    "ready", "evicted" (unloaded after MODEL_IDLE_TIMEOUT_S idle, reloads on
+    the next request) or "failed". Renders submitted before the model is
+    ready simply wait for it.
+    
+    Returns:
+        Model state, startup and model load timings, memory use (model
+        weights, current and peak process RSS), inference batching, renders
+        and clients sharing the server, jobs with their predicted remaining
+        work, and cache usage
+    """
+    tts = podcast_tool.tts
+    jobs = job_manager.list()
+    cache = tts.cache.stats()
+    fields = {
+        "model_state": tts.state,
+        "model_error": tts.load_error,
+        "uptime_seconds": round(time.time() - _server_started, 1),
+        **STARTUP_TIMINGS,
+        **{f"model_{key}": value for key, value in tts.load_timings.items()},
+        **tts.memory_stats(),
+        **tts.scheduler.stats(),
+        "transport": Config.MCP_TRANSPORT,
+        "draining": scheduler.draining,
+        **scheduler.stats(),
+        "jobs_running": sum(1 for j in jobs if j.status == RUNNING),
+        "jobs_queued": sum(1 for j in jobs if j.status == QUEUED),
+        "queued_work_seconds": round(job_manager.queued_work(), 1),
+        "cache_hits": cache["hits"],
+        "cache_misses": cache["misses"],
+    }
+    return _format_fields(fields)
+
+
+@mcp.tool()
+async def get_metrics(format: str = "summary") -> str:
+    """
+    Returns performance metrics aggregated over all renders since startup.
+    
+    Covers per-stage timings (parse, load_model, synthesize, combine, export),
+    per-segment synthesis time and real-time factor, and render outcomes.
+    
+    Args:
+        format: "summary" for rolling p50/p90/p99 per metric, or "prometheus"
+            for the Prometheus text exposition format with full histograms
+        
+    Returns:
+        Metrics as 'key: value' lines or Prometheus text
+    """
+    if format == "prometheus":
+        return METRICS.render_prometheus()
+    fields = METRICS.summary()
+    if not fields:
+        return "renders: 0"
+    return _format_fields(fields)
+
+
+def _preload() -> None:
+    started = time.perf_counter()
+    podcast_tool.warm_up()
+    logger.info(f"Background preload finished in {time.perf_counter() - started:.2f}s")
+
+
+async def _serve_http() -> None:
+    """
+    Serve MCP over HTTP with a drain phase on shutdown.
+
+    On SIGINT/SIGTERM new renders are refused while the server keeps
+    answering status calls; running and queued renders get up to
+    SHUTDOWN_DRAIN_TIMEOUT_S to finish before connections are closed. A
+    second signal skips the wait.
+    """
+    import uvicorn
+
+    class DrainingServer(uvicorn.Server):
+        async def shutdown(self, sockets=None):
+            started = time.monotonic()
+
+            async def drain() -> bool:
+                drained = await scheduler.drain()
+                remaining = max(0.0, Config.SHUTDOWN_DRAIN_TIMEOUT_S - (time.monotonic() - started))
+                return await job_manager.join(remaining) and drained
+
+            task = asyncio.ensure_future(drain())
+            while not task.done() and not self.force_exit:
+                await asyncio.wait({task}, timeout=0.2)
+            if task.done() and task.result():
+                logger.info(f"Drained in {time.monotonic() - started:.1f}s")
+            else:
+                task.cancel()
+                logger.warning("Shutting down with renders still running")
+            await super().shutdown(sockets)
+
+    if Config.MCP_TRANSPORT == "sse":
+        app = mcp.sse_app()
     else:
-        return (
-            f"success: false\n"
-            f"error: {result.get('error')}"
-        )
+        app = mcp.streamable_http_app()
+    config = uvicorn.Config(
+        app,
+        host=Config.MCP_HOST,
+        port=Config.MCP_PORT,
+        log_level=Config.MCP_LOG_LEVEL.lower(),
+        timeout_graceful_shutdown=5,  # Renders are drained already; this only closes idle streams
+    )
+    logger.info(f"Serving MCP over {Config.MCP_TRANSPORT} on {Config.MCP_HOST}:{Config.MCP_PORT}")
+    await DrainingServer(config).serve()
 
 
 def main():
-    mcp.run()
+    logger.info(
+        f"Startup: imports {STARTUP_TIMINGS['imports_seconds']}s, "
+        f"server init {STARTUP_TIMINGS['init_seconds']}s"
+    )
+    prune_checkpoints()
+    purge_weights_cache()
+    if Config.PRELOAD_MODEL:
+        # Load the model while the client completes the handshake
+        threading.Thread(target=_preload, name="model-preload", daemon=True).start()
+    if Config.MCP_TRANSPORT in ("streamable-http", "sse"):
+        try:
+            asyncio.run(_serve_http())
+        except KeyboardInterrupt:
+            pass  # uvicorn re-raises the interrupt once the drain and shutdown are done
+    else:
+        mcp.run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,70 @@
+import os
+from typing import Any
+from ..config import Config
+from ..tts.synthesis_planner import plan_units
+from ..tts.tts_manager import QUALITY_FINAL
+
+
+def plan_batch(scripts: list[list[dict[str, str]]]) -> dict[str, Any]:
+    """
+    Plan the synthesis of several scripts as one pool of work.
+
+    Every script is broken into units (sentence-sized with SENTENCE_CHUNKING,
+    whole lines otherwise). Units with the same text, speaker, language and
+    quality are synthesized once for the whole batch, e.g. the intro and outro of a
+    series, and shared by every script that uses them.
+
+    Args:
+        scripts: Segments of each script (dicts with 'text', 'speaker', 'language', 'quality')
+
+    Returns:
+        dict: 'unique' (unit dicts to synthesize, in order of first use),
+        'units' (per script, its units from plan_units), 'unit_ids' (per
+        script, the index into 'unique' of each of its units) and 'owner'
+        (per unique unit, the first script that needs it)
+    """
+    unique: list[dict[str, str]] = []
+    owner: list[int] = []
+    index: dict[tuple[str, str, str, str], int] = {}
+    units: list[list[dict[str, Any]]] = []
+    unit_ids: list[list[int]] = []
+
+    for script_index, segments in enumerate(scripts):
+        if Config.SENTENCE_CHUNKING:
+            script_units = plan_units(segments)
+        else:
+            script_units = [{"segment": i, **segment} for i, segment in enumerate(segments)]
+        ids: list[int] = []
+        for unit in script_units:
+            key = (unit["text"], unit["speaker"], unit["language"], unit.get("quality", QUALITY_FINAL))
+            if key not in index:
+                index[key] = len(unique)
+                unique.append(dict(zip(("text", "speaker", "language", "quality"), key)))
+                owner.append(script_index)
+            ids.append(index[key])
+        units.append(script_units)
+        unit_ids.append(ids)
+
+    return {"unique": unique, "units": units, "unit_ids": unit_ids, "owner": owner}
+
+
+def distinct_output_paths(paths: list[str]) -> list[str]:
+    """
+    Make output paths unique within a batch.
+
+    Scripts without a filename header all default to podcast.wav; later
+    duplicates get a numeric suffix (podcast_2.wav, ...) instead of
+    overwriting each other.
+    """
+    seen: set[str] = set()
+    result: list[str] = []
+    for path in paths:
+        candidate = path
+        stem, ext = os.path.splitext(path)
+        n = 2
+        while os.path.normcase(candidate) in seen:
+            candidate = f"{stem}_{n}{ext}"
+            n += 1
+        seen.add(os.path.normcase(candidate))
+        result.append(candidate)
+    return result
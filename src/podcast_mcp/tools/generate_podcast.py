@@ -1,96 +1,675 @@
 import os
 import time
+import uuid
 import logging
 import asyncio
-from typing import Any
+from typing import Any, Awaitable, Callable
+import numpy as np
 from ..parser.script_parser import parse_script
-from ..tts.tts_manager import TTSManager
-from ..audio.audio_combiner import combine_segments
+from ..tts.tts_manager import QUALITY_DRAFT, QUALITY_FINAL, TTSManager
+from ..tts.worker_pool import TTSWorkerPool
+from .render_checkpoint import RenderCheckpoint, SegmentsFailed
+from .batch_plan import distinct_output_paths, plan_batch
+from .render_pipeline import SegmentPipeline
+from .render_estimate import EtaContext, format_seconds
+from ..tts.synthesis_planner import group_batches, plan_units, stitch
+from ..audio.audio_combiner import combine_segments, combine_stream, combine_waveforms
+from ..audio.post_process import PostProcessor
+from ..audio.streaming_writer import StreamingWavWriter
+from ..audio.streaming_encoder import StreamingEncoder, open_writer
+from ..audio.wav_io import probe_pcm_wav
+from ..metrics import METRICS, current_render, stage, track_render
+from ..cancellation import CLIENT_CANCELLED, RenderCancelled, cancel_scope, run_in_thread
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+
+def resolve_script_file(path: str) -> str:
+    """
+    Real path of a script file a client may read.
+
+    With SCRIPTS_DIR set, the path (relative ones are taken from SCRIPTS_DIR)
+    must resolve inside it after following symlinks. Without it, script files
+    are only accepted over stdio, where the client runs as the server's user.
+
+    Raises:
+        ValueError: If the path is outside SCRIPTS_DIR, or script files are disabled
+    """
+    if not Config.SCRIPTS_DIR:
+        if Config.MCP_TRANSPORT != "stdio":
+            raise ValueError("script_file is disabled over HTTP transports unless SCRIPTS_DIR is set")
+        return os.path.realpath(path)
+    root = os.path.realpath(os.path.expanduser(Config.SCRIPTS_DIR))
+    resolved = os.path.realpath(os.path.join(root, os.path.expanduser(path)))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"script_file must be inside SCRIPTS_DIR ({root})")
+    return resolved
+
+
+class SyncContext:
+    """Minimal context for sync execution: report_progress does nothing."""
+
+    async def report_progress(self, progress: float, total: float | None = None, message: str | None = None) -> None:
+        pass # No-op for sync execution
+
+
 class GeneratePodcastTool:
     def __init__(self):
         self.tts = TTSManager()
+        self._pool: TTSWorkerPool | None = None
+
+    def _get_pool(self) -> TTSWorkerPool | None:
+        """Return the worker pool if TTS_WORKERS is set (created on first use)."""
+        if Config.TTS_WORKERS <= 0:
+            return None
+        if self._pool is None:
+            self._pool = TTSWorkerPool()
+        return self._pool
+
+    def warm_up(self) -> None:
+        """Load the model (or start the worker pool) and run a warm-up inference. Blocking."""
+        pool = self._get_pool()
+        if pool is not None:
+            pool.warm_up()
+        else:
+            self.tts.preload(warmup=Config.PRELOAD_WARMUP)
+
+    async def _synthesize_chunked(self, segments: list[dict[str, str]], ctx) -> tuple[list[np.ndarray], int]:
+        """
+        Synthesize segments as sentence-sized units and stitch them back together.
+
+        Units of the same speaker and language are sent to the model in batches
+        (or spread over the worker pool), which bounds the cost of every call.
+
+        Returns:
+            tuple: (one waveform per segment, sample rate)
+        """
+        units = plan_units(segments)
+        total_units = len(units)
+        logger.info(f"Planned {total_units} synthesis units for {len(segments)} segments")
+        await ctx.report_progress(progress=0, total=total_units)
+
+        pool = self._get_pool()
+        if pool is not None:
+            async def on_complete(completed: int, total: int) -> None:
+                logger.info(f"✓ Unit {completed}/{total} complete")
+                await ctx.report_progress(progress=completed, total=total)
+
+            with stage("synthesize"):
+                unit_waveforms = await pool.run(units, None, on_complete)
+            sample_rate = pool.sample_rate or self.tts.sample_rate
+        else:
+            unit_waveforms: list[Any] = [None] * total_units
+            completed = 0
+            for batch in group_batches(units, Config.INFERENCE_BATCH_SIZE):
+                first = units[batch[0]]
+                texts = [units[i]["text"] for i in batch]
+                with stage("synthesize") as timer:
+                    results = await run_in_thread(
+                        self.tts.synthesize_batch, texts, first["speaker"], first["language"], first["quality"]
+                    )
+                for i, waveform in zip(batch, results):
+                    unit_waveforms[i] = waveform
+                self._record_segment(sum(len(t) for t in texts), timer.seconds, sum(len(w) for w in results))
+
+                completed += len(batch)
+                logger.info(f"✓ Unit {completed}/{total_units} complete")
+                await ctx.report_progress(progress=completed, total=total_units)
+            sample_rate = self.tts.sample_rate
+
+        return stitch(units, unit_waveforms, len(segments), sample_rate, Config.SENTENCE_PAUSE_MS), sample_rate
+
+    async def _synthesize_segments(
+        self, segments: list[dict[str, str]], in_memory: bool, temp_files: list[str], ctx,
+        pipeline: SegmentPipeline | None = None,
+    ) -> tuple[list[np.ndarray], int]:
+        """
+        Synthesize all segments, either to waveforms or to the temp files.
+
+        With a pipeline (in-process synthesis only), each finished segment is
+        handed to it in order instead of being collected.
 
-    async def run_async(self, script: str, ctx) -> dict[str, Any]:
+        Returns:
+            tuple: (waveforms, sample rate); waveforms is empty in file mode or with a pipeline
+        """
+        total_segments = len(segments)
+        waveforms: list[np.ndarray] = []
+        sample_rate = self.tts.sample_rate
+
+        pool = self._get_pool()
+        if Config.SENTENCE_CHUNKING:
+            waveforms, sample_rate = await self._synthesize_chunked(segments, ctx)
+        elif pool is not None:
+            async def on_complete(completed: int, total: int) -> None:
+                logger.info(f"✓ Segment {completed}/{total} complete")
+                await ctx.report_progress(progress=completed, total=total)
+
+            with stage("synthesize"):
+                results = await pool.run(segments, None if in_memory else temp_files, on_complete)
+            if in_memory:
+                waveforms = results
+                sample_rate = pool.sample_rate or sample_rate
+        else:
+            for i, segment in enumerate(segments):
+                text = segment["text"]
+
+                # Progress update
+                logger.info(f"Generating segment {i+1}/{total_segments}: '{text[:50]}...'")
+                await ctx.report_progress(progress=i, total=total_segments)
+
+                if in_memory:
+                    # Keep the raw waveform, no temp file round-trip
+                    with stage("synthesize") as timer:
+                        waveform = await run_in_thread(
+                            self.tts.synthesize, text, segment["speaker"], segment["language"], segment["quality"]
+                        )
+                    self._record_segment(len(text), timer.seconds, len(waveform))
+                    if pipeline is not None:
+                        await pipeline.put(waveform)
+                    else:
+                        waveforms.append(waveform)
+                else:
+                    # Use speaker_id directly (no voice files needed)
+                    # Run TTS in executor to avoid blocking
+                    with stage("synthesize") as timer:
+                        await run_in_thread(
+                            self.tts.generate_segment, text, segment["speaker"], segment["language"], temp_files[i],
+                            segment["quality"],
+                        )
+                    info = probe_pcm_wav(temp_files[i])
+                    frames = info["data_size"] // (info["channels"] * info["sample_width"]) if info else None
+                    self._record_segment(len(text), timer.seconds, frames, info["sample_rate"] if info else None)
+                    if pipeline is not None:
+                        await pipeline.put(temp_files[i])
+
+                logger.info(f"✓ Segment {i+1}/{total_segments} complete")
+                await ctx.report_progress(progress=i+1, total=total_segments)
+            sample_rate = self.tts.sample_rate
+
+        return waveforms, sample_rate
+
+    def _record_segment(self, chars: int, seconds: float, frames: int | None, sample_rate: int | None = None) -> None:
+        """Add a per-segment timing (and its audio duration, if known) to the current render."""
+        render = current_render()
+        if render is None:
+            return
+        audio_seconds = frames / (sample_rate or self.tts.sample_rate) if frames else None
+        render.add_segment(chars, seconds, audio_seconds)
+
+    async def _render_streaming(
+        self, segments: list[dict[str, str]], output_file: str, pause_ms: int, output_format: str, ctx
+    ) -> str:
+        """
+        Synthesize with streaming inference and append audio straight to the output file.
+
+        For WAV the header is rewritten after the first chunk and then every
+        STREAM_HEADER_INTERVAL_S, so the file is playable while it grows.
+        Compressed formats are encoded by ffmpeg as the chunks arrive.
+        Progress messages carry the currently playable duration.
+
+        Returns:
+            str: Path to the output file
+        """
+        loop = asyncio.get_running_loop()
+        total_segments = len(segments)
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        writer: StreamingWavWriter | StreamingEncoder | None = None
+        last_flush = 0.0
+
+        def stream_segment(index: int, segment: dict[str, str]) -> None:
+            nonlocal writer, last_flush
+            if writer is not None and pause_ms > 0:
+                writer.write_silence(pause_ms)
+
+            chunks = self.tts.synthesize_stream(
+                segment["text"], segment["speaker"], segment["language"], segment["quality"]
+            )
+            for chunk in chunks:
+                if writer is None:
+                    # Opened on the first chunk, once the model's sample rate is known
+                    writer = open_writer(output_file, output_format, self.tts.sample_rate)
+                    logger.info(f"First audio after {time.time() - start:.2f}s")
+                writer.write_waveform(chunk)
+
+                now = time.monotonic()
+                if last_flush == 0.0 or now - last_flush >= Config.STREAM_HEADER_INTERVAL_S:
+                    writer.flush_header()
+                    last_flush = now
+                    asyncio.run_coroutine_threadsafe(
+                        ctx.report_progress(
+                            progress=index,
+                            total=total_segments,
+                            message=f"{writer.duration_seconds:.1f}s playable",
+                        ),
+                        loop,
+                    )
+
+            if writer is not None:
+                writer.flush_header()
+
+        start = time.time()
+        try:
+            for i, segment in enumerate(segments):
+                logger.info(f"Streaming segment {i+1}/{total_segments}: '{segment['text'][:50]}...'")
+                before = writer.data_bytes // writer.frame_size if writer is not None else 0
+                if writer is not None and pause_ms > 0:
+                    before += int(writer.sample_rate * pause_ms / 1000)  # The pause is not segment audio
+                with stage("synthesize") as timer:
+                    await run_in_thread(stream_segment, i, segment)
+
+                playable = writer.duration_seconds if writer is not None else 0.0
+                if writer is not None:
+                    self._record_segment(
+                        len(segment["text"]), timer.seconds, writer.data_bytes // writer.frame_size - before, writer.sample_rate
+                    )
+                logger.info(f"✓ Segment {i+1}/{total_segments} complete ({playable:.1f}s playable)")
+                await ctx.report_progress(
+                    progress=i+1, total=total_segments, message=f"{playable:.1f}s playable"
+                )
+
+            if writer is None:
+                raise ValueError("No audio was generated")
+            with stage("export"):
+                await run_in_thread(writer.close)
+            return output_file
+        except BaseException:
+            # Do not leave a truncated episode behind
+            if writer is not None:
+                writer.abort()
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            raise
+
+    async def run_async(
+        self, script: str, ctx, script_file: str | None = None, prepared: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """
         Executes the podcast generation flow with progress updates.
+
+        If script_file is given, the script is read from that file instead
+        (no length limit) and script is ignored. A caller that already parsed
+        the script with prepare_async() (e.g. for estimate_async) passes the
+        result as prepared, so it is not parsed again. Successful results
+        carry a 'metrics' dict with per-stage timings, characters per second
+        and the real-time factor of the render.
+
+        If the calling task is cancelled (the MCP client cancelled the request
+        or disconnected), synthesis stops at the next sentence or segment
+        boundary and temp files and partial output are removed.
+        """
+        return await self._tracked(self._run_render(script, script_file, None, ctx, prepared), ctx)
+
+    async def resume_async(self, render_id: str, ctx) -> dict[str, Any]:
+        """
+        Resume a checkpointed render that failed or was interrupted.
+
+        Only segments without finished audio are synthesized; the output is
+        then assembled from all segments as in the original render.
+        """
+        return await self._tracked(self._run_render("", None, render_id, ctx), ctx)
+
+    async def _tracked(self, render_coro, ctx) -> dict[str, Any]:
+        # A job's context brings its own token, so cancelling the job stops the synthesis threads too
+        with track_render() as render, cancel_scope(getattr(ctx, "cancel_token", None)):
+            try:
+                result = await render_coro
+            except asyncio.CancelledError:
+                render.finish(False, cancelled=True)
+                raise
+            render.finish(bool(result.get("success")), cancelled=bool(result.get("cancelled")))
+        if result.get("success"):
+            result["metrics"] = render.summary()
+        await asyncio.to_thread(self.tts.costs.save)
+        return result
+
+    def predict_seconds(self, segments: list[dict[str, str]]) -> list[float]:
+        """Predicted synthesis seconds of each segment from the cost model (0 for cached lines)."""
+        return [self.tts.predict_seconds(s["text"], s["speaker"], s["language"], s["quality"]) for s in segments]
+
+    async def prepare_async(self, script: str, script_file: str | None = None) -> dict[str, Any]:
+        """
+        Parse a script once, to share between estimate_async and run_async.
+
+        Raises:
+            ValueError: If the script cannot be parsed or has no dialogue
+        """
+        return await self._prepare_script(script, script_file)
+
+    async def estimate_async(
+        self, script: str, script_file: str | None = None, prepared: dict[str, Any] | None = None
+    ) -> float:
+        """
+        Predicted synthesis time of a script in seconds, from the cost model.
+
+        Raises:
+            ValueError: If the script cannot be parsed or has no dialogue
+        """
+        if prepared is None:
+            prepared = await self._prepare_script(script, script_file)
+        seconds = await asyncio.to_thread(lambda: sum(self.predict_seconds(prepared["segments"])))
+        return seconds / Config.TTS_WORKERS if Config.TTS_WORKERS > 1 else seconds
+
+    def _render_params(
+        self, output_file: str, pause_ms: int, output_format: str, quality: str = QUALITY_FINAL
+    ) -> dict[str, Any]:
+        """Everything a resumed render needs to reassemble the output and to match the finished segments."""
+        return {
+            "output_file": output_file,
+            "pause_ms": pause_ms,
+            "format": output_format,
+            "quality": quality,
+            "model": self.tts.model_id_for(quality),
+            "speed": Config.TTS_SPEED,
+            "voices": self.tts.DRAFT_SPEAKERS if quality == QUALITY_DRAFT else self.tts.SPEAKERS,
+        }
+
+    def _load_checkpoint(self, render_id: str) -> RenderCheckpoint:
+        checkpoint = RenderCheckpoint.load(render_id)
+        params = checkpoint.params
+        current = self._render_params(
+            params["output_file"], params["pause_ms"], params["format"], params.get("quality", QUALITY_FINAL)
+        )
+        for key in ("model", "speed", "voices"):
+            if params.get(key) != current[key]:
+                raise ValueError(
+                    f"The {key} setting changed since render {render_id} started; "
+                    f"finished segments would not match. Start a new render instead."
+                )
+        return checkpoint
+
+    async def _synthesize_checkpointed(
+        self, checkpoint: RenderCheckpoint, ctx, pipeline: SegmentPipeline | None = None
+    ) -> None:
+        """
+        Synthesize the segments a checkpoint is missing, recording each one as it finishes.
+
+        A failing segment is retried SEGMENT_RETRIES times and then marked as
+        failed while the remaining segments carry on. With a pipeline
+        (in-process synthesis only), segment files are handed to it in script
+        order as soon as they and all earlier ones exist.
+
+        Raises:
+            SegmentsFailed: If any segment still failed at the end
+        """
+        segments = checkpoint.segments
+        paths = checkpoint.segment_paths()
+        pending = checkpoint.pending()
+        total_segments = len(segments)
+        done = total_segments - len(pending)
+        if done:
+            logger.info(f"Resuming render {checkpoint.render_id}: {done}/{total_segments} segments already done")
+        await ctx.report_progress(progress=done, total=total_segments)
+
+        ready = set(range(total_segments)) - set(pending)
+        next_ready = 0
+
+        async def feed() -> None:
+            nonlocal next_ready
+            while next_ready in ready:
+                await pipeline.put(paths[next_ready])
+                next_ready += 1
+
+        pool = self._get_pool()
+        if pool is not None:
+            async def on_complete(completed: int, total: int) -> None:
+                logger.info(f"✓ Segment {done + completed}/{total_segments} finished")
+                await ctx.report_progress(progress=done + completed, total=total_segments)
+
+            def on_result(indices: list[int]) -> None:
+                for j in indices:
+                    checkpoint.mark_done(pending[j])
+
+            def on_error(indices: list[int], error: str) -> None:
+                for j in indices:
+                    checkpoint.mark_failed(pending[j], error)
+
+            with stage("synthesize"):
+                await pool.run(
+                    [segments[i] for i in pending], [paths[i] for i in pending], on_complete, on_result,
+                    retries=max(0, Config.SEGMENT_RETRIES), on_error=on_error,
+                )
+        else:
+            if pipeline is not None:
+                await feed()  # Segments finished before a resume
+            for i in pending:
+                segment = segments[i]
+                text = segment["text"]
+                logger.info(f"Generating segment {i+1}/{total_segments}: '{text[:50]}...'")
+
+                error = None
+                for attempt in range(1 + max(0, Config.SEGMENT_RETRIES)):
+                    try:
+                        with stage("synthesize") as timer:
+                            await run_in_thread(
+                                self.tts.generate_segment, text, segment["speaker"], segment["language"], paths[i],
+                                segment.get("quality", QUALITY_FINAL),
+                            )
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                        logger.warning(f"Segment {i+1} failed (attempt {attempt + 1}): {error}")
+                        continue
+                    checkpoint.mark_done(i)
+                    info = probe_pcm_wav(paths[i])
+                    frames = info["data_size"] // (info["channels"] * info["sample_width"]) if info else None
+                    self._record_segment(len(text), timer.seconds, frames, info["sample_rate"] if info else None)
+                    error = None
+                    break
+                if error is not None:
+                    checkpoint.mark_failed(i, error)
+                elif pipeline is not None:
+                    ready.add(i)
+                    await feed()
+
+                done += 1
+                logger.info(f"✓ Segment {i+1}/{total_segments} {'failed' if error else 'complete'}")
+                await ctx.report_progress(progress=done, total=total_segments)
+
+        failed = checkpoint.failed()
+        if failed:
+            raise SegmentsFailed(checkpoint.render_id, failed)
+
+    async def _prepare_script(self, script: str, script_file: str | None) -> dict[str, Any]:
+        """
+        Parse a script into synthesis segments and output settings.
+
+        Returns:
+            dict: 'segments' (dicts with 'text', 'speaker', 'language', 'quality'),
+            'output_file' (absolute), 'pause_ms' and 'format'
+
+        Raises:
+            ValueError: If the script cannot be parsed or has no dialogue
         """
+        if script_file:
+            script_file = resolve_script_file(script_file)
+        try:
+            with stage("parse"):
+                if script_file:
+                    with open(script_file, "r", encoding="utf-8") as f:
+                        data = await asyncio.to_thread(parse_script, f)
+                else:
+                    data = parse_script(script)
+        except Exception as e:
+            logger.error(f"Failed to parse script: {e}")
+            raise ValueError(f"Script parsing error: {str(e)}")
+
+        dialogue_data: list[dict[str, str]] = data.get("dialogue", [])
+        language: str = data.get("language", "en")
+        quality: str = data.get("quality", QUALITY_FINAL)
+        output_config: dict[str, Any] = data.get("output", {})
+
+        if not dialogue_data:
+            raise ValueError("No dialogue found in script")
+
+        # Identify all unique speakers used in the script
+        used_speaker_ids = set(d["speaker"] for d in dialogue_data)
+        
+        # Create speaker map dynamically
+        speaker_map: dict[str, dict[str, str]] = {}
+        for speaker_id in used_speaker_ids:
+            # We assume all speakers use the same language for now
+            speaker_map[speaker_id] = {"id": speaker_id, "language": language}
+
+        segments = [
+            {
+                "text": line["text"],
+                "speaker": line["speaker"],
+                "language": speaker_map[line["speaker"]].get("language", "en"),
+                "quality": quality,
+            }
+            for line in dialogue_data
+        ]
+
+        # Output settings
+        output_file = output_config.get("file", "podcast.wav")
+        if not os.path.isabs(output_file):
+            output_file = os.path.join(Config.OUTPUT_DIR, output_file)
+
+        return {
+            "segments": segments,
+            "output_file": output_file,
+            "pause_ms": output_config.get("pause_ms", Config.DEFAULT_PAUSE_MS),
+            "format": output_config.get("format", Config.DEFAULT_FORMAT),
+        }
+
+    async def _run_render(
+        self, script: str, script_file: str | None, resume_id: str | None, ctx, prepared: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         # Ensure output and temp directories exist
         Config.ensure_dirs()
         
         start_time = time.time()
+        render = current_render()
         temp_files: list[str] = []
+        # Sentence chunking stitches waveforms, so it always uses the in-memory path
+        in_memory = Config.AUDIO_PIPELINE == "memory" or Config.SENTENCE_CHUNKING
+        run_id = uuid.uuid4().hex[:12]
+        checkpoint: RenderCheckpoint | None = None
+        keep_checkpoint = False
+        unresumable: str | None = None
         
         try:
-            # Parse script
-            try:
-                data = parse_script(script)
-            except Exception as e:
-                logger.error(f"Failed to parse script: {e}")
-                return {"success": False, "error": f"Script parsing error: {str(e)}"}
+            if resume_id:
+                try:
+                    checkpoint = self._load_checkpoint(resume_id)
+                except (FileNotFoundError, ValueError) as e:
+                    return {"success": False, "error": str(e)}
+                segments = [
+                    {
+                        "text": s["text"], "speaker": s["speaker"], "language": s["language"],
+                        "quality": s.get("quality", QUALITY_FINAL),
+                    }
+                    for s in checkpoint.segments
+                ]
+                output_file = checkpoint.params["output_file"]
+                pause_ms = checkpoint.params["pause_ms"]
+                output_format = checkpoint.params["format"]
+                total_segments = len(segments)
+            else:
+                try:
+                    if prepared is None:
+                        prepared = await self._prepare_script(script, script_file)
+                except ValueError as e:
+                    return {"success": False, "error": str(e)}
+                segments = prepared["segments"]
+                output_file = prepared["output_file"]
+                pause_ms = prepared["pause_ms"]
+                output_format = prepared["format"]
+                total_segments = len(segments)
 
-            dialogue_data: list[dict[str, str]] = data.get("dialogue", [])
-            language: str = data.get("language", "en")
-            output_config: dict[str, Any] = data.get("output", {})
+            # A resumed render only synthesizes what the checkpoint is missing
+            todo = checkpoint.pending() if checkpoint is not None else range(total_segments)
+            if render is not None:
+                render.chars = sum(len(segments[i]["text"]) for i in todo)
 
-            if not dialogue_data:
-                return {"success": False, "error": "No dialogue found in script"}
+            # Progress messages carry the share of predicted work done and the time remaining
+            costs = await asyncio.to_thread(self.predict_seconds, segments)
+            estimated_seconds = sum(costs[i] for i in todo)
+            ctx = EtaContext(ctx, costs)
 
-            # Identify all unique speakers used in the script
-            used_speaker_ids = set(d["speaker"] for d in dialogue_data)
-            
-            # Create speaker map dynamically
-            speaker_map: dict[str, dict[str, str]] = {}
-            for speaker_id in used_speaker_ids:
-                # We assume all speakers use the same language for now
-                speaker_map[speaker_id] = {"id": speaker_id, "language": language}
-
-            # 2. Generate Audio Segments
-            total_segments = len(dialogue_data)
-            
+            streaming = Config.STREAMING_OUTPUT and checkpoint is None
+
+            # Segment files of the file pipeline are checkpointed so a failed render can be resumed
+            if checkpoint is None and not in_memory and not streaming and Config.RENDER_CHECKPOINTS:
+                checkpoint = RenderCheckpoint.create(
+                    run_id, segments, self._render_params(output_file, pause_ms, output_format, segments[0]["quality"])
+                )
+            if checkpoint is None:
+                # Waveforms and streamed output are not kept on disk, so there is nothing to resume from
+                unresumable = (
+                    "SENTENCE_CHUNKING" if Config.SENTENCE_CHUNKING
+                    else "AUDIO_PIPELINE=memory" if in_memory
+                    else "STREAMING_OUTPUT" if streaming
+                    else "RENDER_CHECKPOINTS=false"
+                )
+
+            # Generate Audio Segments
             logger.info(f"Starting generation of {total_segments} segments...")
             
             # Report initial progress
             await ctx.report_progress(progress=0, total=total_segments)
-            
-            for i, line in enumerate(dialogue_data):
-                speaker_id = line["speaker"]
-                text = line["text"]
-                speaker_info = speaker_map[speaker_id]
-                segment_language = speaker_info.get("language", "en")
 
-                # Progress update
-                logger.info(f"Generating segment {i+1}/{total_segments}: '{text[:50]}...'")
-                await ctx.report_progress(progress=i, total=total_segments)
-
-                segment_filename = f"segment_{i}_{int(time.time()*1000)}.wav"
-                segment_path = os.path.join(Config.TEMP_DIR, segment_filename)
-                temp_files.append(segment_path)
-                
-                # Use speaker_id directly (no voice files needed)
-                # Run TTS in executor to avoid blocking
-                await asyncio.to_thread(
-                    self.tts.generate_segment, text, speaker_id, segment_language, segment_path
+            if checkpoint is not None:
+                temp_files = checkpoint.segment_paths()
+            elif not in_memory:
+                # Register all paths up front so failed segments are cleaned up too
+                temp_files.extend(
+                    os.path.join(Config.TEMP_DIR, f"segment_{run_id}_{i}.wav") for i in range(total_segments)
                 )
-                
-                logger.info(f"✓ Segment {i+1}/{total_segments} complete")
-                await ctx.report_progress(progress=i+1, total=total_segments)
 
-            # 3. Combine Audio
-            output_file = output_config.get("file", "podcast.wav")
-            if not os.path.isabs(output_file):
-                output_file = os.path.join(Config.OUTPUT_DIR, output_file)
-            
-            pause_ms = output_config.get("pause_ms", Config.DEFAULT_PAUSE_MS)
-            output_format = output_config.get("format", Config.DEFAULT_FORMAT)
-            
-            final_path = await asyncio.to_thread(
-                combine_segments, temp_files, pause_ms, output_file, output_format
-            )
-            
+            if streaming:
+                # Audio is appended to the output file while it is synthesized
+                final_path = await self._render_streaming(segments, output_file, pause_ms, output_format, ctx)
+            else:
+                post = PostProcessor.from_config([s["speaker"] for s in segments])
+                pipeline: SegmentPipeline | None = None
+                if Config.PIPELINE_DEPTH > 0 and self._get_pool() is None and not Config.SENTENCE_CHUNKING:
+                    # Each segment is post-processed and written while the next one is synthesized;
+                    # segment files carry their own sample rate, waveforms have the model's
+                    from_waveforms = in_memory and checkpoint is None
+                    pipeline = SegmentPipeline(lambda items: combine_stream(
+                        items, self.tts.sample_rate if from_waveforms else None,
+                        pause_ms, output_file, output_format, post,
+                    ))
+
+                try:
+                    if checkpoint is not None:
+                        # From here on, finished segments are kept if anything fails
+                        keep_checkpoint = True
+                        await self._synthesize_checkpointed(checkpoint, ctx, pipeline)
+                        waveforms, sample_rate = [], self.tts.sample_rate
+                    else:
+                        waveforms, sample_rate = await self._synthesize_segments(
+                            segments, in_memory, temp_files, ctx, pipeline
+                        )
+                    if pipeline is not None:
+                        final_path = await pipeline.close()
+                except BaseException:
+                    if pipeline is not None:
+                        await pipeline.abort()
+                    raise
+
+                cache_stats = self.tts.cache.stats()
+                logger.info(f"Segment cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+                # Combine Audio (already written if pipelined)
+                if pipeline is None:
+                    with stage("combine"):
+                        if in_memory and checkpoint is None:
+                            final_path = await run_in_thread(
+                                combine_waveforms, waveforms, sample_rate, pause_ms, output_file, output_format, post
+                            )
+                        else:
+                            final_path = await run_in_thread(
+                                combine_segments, temp_files, pause_ms, output_file, output_format, post
+                            )
+                keep_checkpoint = False
+
+            if render is not None:
+                render.audio_seconds = self._output_seconds(final_path, render, pause_ms)
             duration = time.time() - start_time
             
             logger.info(f"✓ Podcast generation complete! Output: {final_path}")
@@ -99,30 +678,346 @@ class GeneratePodcastTool:
                 "success": True,
                 "output_file": final_path,
                 "processing_time_seconds": round(duration, 2),
-                "total_segments": len(dialogue_data),
-                "message": f"Successfully generated {len(dialogue_data)} segments in {round(duration, 2)}s"
+                "total_segments": total_segments,
+                "quality": segments[0]["quality"],
+                "estimated_seconds": round(estimated_seconds, 1),
+                "message": f"Successfully generated {total_segments} segments in {round(duration, 2)}s"
+            }
+
+        except RenderCancelled as e:
+            keep_checkpoint = False
+            return self._cancelled(ctx, str(e))
+
+        except asyncio.CancelledError:
+            # The client cancelled the request or went away: nobody will read the output
+            keep_checkpoint = False
+            self._cancelled(ctx, CLIENT_CANCELLED)
+            raise
+
+        except SegmentsFailed as e:
+            logger.error(str(e))
+            return {
+                "success": False,
+                "error": str(e),
+                "render_id": e.render_id,
+                "failed_segments": ",".join(str(i + 1) for i in e.failed),
             }
 
         except Exception as e:
             logger.exception("Generation failed")
-            return {"success": False, "error": str(e)}
+            result = {"success": False, "error": str(e)}
+            if keep_checkpoint:
+                result["render_id"] = checkpoint.render_id
+            elif unresumable is not None:
+                result["error"] += f" (renders with {unresumable} keep no checkpoint and cannot be resumed)"
+            return result
             
         finally:
             # Cleanup - runs even if exception occurs
-            for f in temp_files:
+            if checkpoint is not None:
+                if keep_checkpoint:
+                    logger.info(f"Kept checkpoint of render {checkpoint.render_id} for resuming")
+                else:
+                    checkpoint.discard()
+            else:
+                for f in temp_files:
+                    try:
+                        if os.path.exists(f):
+                            os.remove(f)
+                    except OSError:
+                        pass
+
+    @staticmethod
+    def _cancelled(ctx, reason: str) -> dict[str, Any]:
+        """Log and count the synthesis a cancelled render skips; returns the render's result."""
+        saved = ctx.remaining_work if isinstance(ctx, EtaContext) else 0.0
+        METRICS.inc(
+            "podcast_cancelled_work_seconds_total", round(saved, 3),
+            help="Predicted synthesis seconds skipped by cancelled renders",
+        )
+        logger.info(f"Render cancelled ({reason}), skipped about {format_seconds(saved)} of synthesis")
+        return {"success": False, "cancelled": True, "error": reason, "saved_seconds": round(saved, 1)}
+
+    async def run_batch_async(
+        self,
+        scripts: list[str],
+        ctx,
+        script_files: list[str] | None = None,
+        on_result: Callable[[int, dict[str, Any]], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Render many scripts in one pass over the model.
+
+        Identical lines (same text, speaker and language) are synthesized once
+        for the whole batch. Synthesis runs script by script, grouped by
+        speaker like sentence batches; a script is assembled and written as
+        soon as all of its audio exists, while synthesis of the next scripts
+        carries on. With TTS_WORKERS all scripts are queued on the pool at once.
+
+        Args:
+            scripts: Script texts
+            ctx: Context with report_progress (progress counts unique units)
+            script_files: Script file paths, rendered after the texts
+            on_result: Awaited with (script index, result) as each script finishes
+
+        Returns:
+            dict: 'success' (all scripts rendered), 'results' (one run()-style
+            result per script, texts first), unique/total unit counts, timing
+            and 'metrics' for the whole batch
+        """
+        with track_render() as render, cancel_scope():
+            try:
+                result = await self._run_batch(scripts, script_files or [], ctx, on_result)
+            except asyncio.CancelledError:
+                render.finish(False, cancelled=True)
+                raise
+            render.finish(result["success"])
+        result["metrics"] = render.summary()
+        await asyncio.to_thread(self.tts.costs.save)
+        return result
+
+    async def _run_batch(
+        self,
+        scripts: list[str],
+        script_files: list[str],
+        ctx,
+        on_result: Callable[[int, dict[str, Any]], Awaitable[None]] | None,
+    ) -> dict[str, Any]:
+        Config.ensure_dirs()
+        start_time = time.time()
+        render = current_render()
+        sources = [(script, None) for script in scripts] + [("", path) for path in script_files]
+        results: list[dict[str, Any] | None] = [None] * len(sources)
+        if not sources:
+            return {"success": False, "error": "No scripts given", "results": []}
+
+        prepared: list[dict[str, Any]] = []
+        positions: list[int] = []  # Index in sources of each prepared script
+        for i, (script, script_file) in enumerate(sources):
+            try:
+                prepared.append(await self._prepare_script(script, script_file))
+                positions.append(i)
+            except ValueError as e:
+                results[i] = {"success": False, "error": str(e)}
+        for job, path in zip(prepared, distinct_output_paths([job["output_file"] for job in prepared])):
+            job["output_file"] = path
+
+        plan = plan_batch([job["segments"] for job in prepared])
+        unique = plan["unique"]
+        ctx = EtaContext(ctx, await asyncio.to_thread(self.predict_seconds, unique))
+        total_units = sum(len(ids) for ids in plan["unit_ids"])
+        logger.info(
+            f"Batch of {len(sources)} scripts: {len(unique)} unique units out of {total_units}"
+        )
+        if render is not None:
+            render.chars = sum(len(unit["text"]) for unit in unique)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        waveforms: list[np.ndarray | None] = [None] * len(unique)
+        owned: list[list[int]] = [[] for _ in prepared]
+        for unit_id, owner in enumerate(plan["owner"]):
+            owned[owner].append(unit_id)
+        # Resolved once the units a script introduced to the batch are synthesized
+        synthesized: list[asyncio.Future] = [loop.create_future() for _ in prepared]
+        # Waveforms are released once every script using them is written
+        users = [0] * len(unique)
+        for ids in plan["unit_ids"]:
+            for unit_id in set(ids):
+                users[unit_id] += 1
+        completed_units = 0
+        finished_scripts = len(sources) - len(prepared)
+
+        async def report(message: str | None = None) -> None:
+            await ctx.report_progress(progress=completed_units, total=len(unique), message=message)
+
+        def settle(index: int, error: BaseException | None = None) -> None:
+            if not synthesized[index].done():
+                if error is None:
+                    synthesized[index].set_result(None)
+                else:
+                    synthesized[index].set_exception(error)
+
+        async def synthesize_in_process() -> None:
+            nonlocal completed_units
+            for index, unit_ids in enumerate(owned):
                 try:
-                    if os.path.exists(f):
-                        os.remove(f)
-                except OSError:
-                    pass
+                    units = [unique[u] for u in unit_ids]
+                    for batch in group_batches(units, Config.INFERENCE_BATCH_SIZE):
+                        first = units[batch[0]]
+                        texts = [units[i]["text"] for i in batch]
+                        with stage("synthesize") as timer:
+                            batch_waveforms = await run_in_thread(
+                                self.tts.synthesize_batch, texts, first["speaker"], first["language"], first["quality"]
+                            )
+                        for i, waveform in zip(batch, batch_waveforms):
+                            waveforms[unit_ids[i]] = waveform
+                        self._record_segment(
+                            sum(len(t) for t in texts), timer.seconds, sum(len(w) for w in batch_waveforms)
+                        )
+                        completed_units += len(batch)
+                        await report()
+                except RenderCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"Synthesis for script {positions[index] + 1} failed: {e}")
+                    settle(index, e)
+                else:
+                    settle(index)
+
+        async def synthesize_on_pool(index: int) -> None:
+            # Submitted in script order, so the pool's FIFO queue finishes early scripts first
+            nonlocal completed_units
+            unit_ids = owned[index]
+            reported = 0
+
+            async def on_complete(completed: int, total: int) -> None:
+                nonlocal completed_units, reported
+                completed_units += completed - reported
+                reported = completed
+                await report()
+
+            try:
+                if unit_ids:
+                    pool_waveforms = await pool.run([unique[u] for u in unit_ids], None, on_complete)
+                    for unit_id, waveform in zip(unit_ids, pool_waveforms):
+                        waveforms[unit_id] = waveform
+            except RenderCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"Synthesis for script {positions[index] + 1} failed: {e}")
+                settle(index, e)
+            else:
+                settle(index)
+
+        async def synthesize() -> None:
+            try:
+                if pool is not None:
+                    with stage("synthesize"):
+                        await asyncio.gather(*(synthesize_on_pool(i) for i in range(len(prepared))))
+                else:
+                    await synthesize_in_process()
+            finally:
+                # Nothing may wait forever on work that will not happen (e.g. after a cancel)
+                for i in range(len(prepared)):
+                    settle(i, RenderCancelled("Batch stopped before this script was synthesized"))
+
+        async def finish(index: int) -> None:
+            nonlocal finished_scripts
+            job = prepared[index]
+            unit_ids = plan["unit_ids"][index]
+            try:
+                for owner in sorted({plan["owner"][u] for u in unit_ids}):
+                    await synthesized[owner]
+                sample_rate = (pool.sample_rate if pool is not None else None) or self.tts.sample_rate
+                segment_waveforms = stitch(
+                    plan["units"][index], [waveforms[u] for u in unit_ids], len(job["segments"]),
+                    sample_rate, Config.SENTENCE_PAUSE_MS,
+                )
+                post = PostProcessor.from_config([s["speaker"] for s in job["segments"]])
+                with stage("combine"):
+                    final_path = await run_in_thread(
+                        combine_waveforms, segment_waveforms, sample_rate, job["pause_ms"],
+                        job["output_file"], job["format"], post,
+                    )
+                if render is not None:
+                    seconds = self._wav_seconds(final_path)
+                    if seconds is not None:
+                        render.audio_seconds += seconds
+                    else:
+                        render.audio_seconds += sum(len(w) for w in segment_waveforms) / sample_rate
+                        render.audio_seconds += job["pause_ms"] / 1000 * max(0, len(segment_waveforms) - 1)
+                duration = round(time.time() - start_time, 2)
+                result = {
+                    "success": True,
+                    "output_file": final_path,
+                    "processing_time_seconds": duration,
+                    "total_segments": len(job["segments"]),
+                    "message": f"Successfully generated {len(job['segments'])} segments in {duration}s",
+                }
+                logger.info(f"✓ Batch script {positions[index] + 1} complete: {final_path}")
+            except RenderCancelled as e:
+                result = {"success": False, "cancelled": True, "error": str(e)}
+            except Exception as e:
+                result = {"success": False, "error": str(e) or type(e).__name__}
+            finally:
+                for unit_id in set(unit_ids):
+                    users[unit_id] -= 1
+                    if users[unit_id] == 0:
+                        waveforms[unit_id] = None
+
+            results[positions[index]] = result
+            finished_scripts += 1
+            await report(f"{finished_scripts}/{len(sources)} scripts finished")
+            if on_result is not None:
+                await on_result(positions[index], result)
+
+        await report()
+        if on_result is not None:
+            for i, result in enumerate(results):
+                if result is not None:
+                    await on_result(i, result)
+
+        tasks = [asyncio.ensure_future(synthesize())]
+        tasks += [asyncio.ensure_future(finish(i)) for i in range(len(prepared))]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            self._cancelled(ctx, CLIENT_CANCELLED)
+            raise
+        except RenderCancelled as e:
+            logger.info(f"Batch cancelled: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for i, result in enumerate(results):
+                if result is None:
+                    results[i] = {"success": False, "cancelled": True, "error": str(e)}
+            for future in synthesized:
+                if future.done() and not future.cancelled():
+                    future.exception()  # Retrieved, so asyncio does not log it as unhandled
+
+        duration = round(time.time() - start_time, 2)
+        succeeded = sum(1 for r in results if r.get("success"))
+        return {
+            "success": succeeded == len(sources),
+            "results": results,
+            "scripts_succeeded": succeeded,
+            "scripts_failed": len(sources) - succeeded,
+            "unique_units": len(unique),
+            "total_units": total_units,
+            "processing_time_seconds": duration,
+        }
+
+    @staticmethod
+    def _wav_seconds(path: str) -> float | None:
+        """Duration of a PCM WAV file from its header, or None for other formats."""
+        info = probe_pcm_wav(path)
+        if info is None:
+            return None
+        return info["data_size"] / (info["sample_rate"] * info["channels"] * info["sample_width"])
+
+    @classmethod
+    def _output_seconds(cls, path: str, render, pause_ms: int) -> float:
+        """Duration of the rendered episode: read from a WAV header, else summed from the segments."""
+        seconds = cls._wav_seconds(path)
+        if seconds is not None:
+            return seconds
+        segment_seconds = [s["audio_seconds"] for s in render.segments if "audio_seconds" in s]
+        if not segment_seconds:
+            return 0.0
+        return sum(segment_seconds) + pause_ms / 1000 * max(0, len(render.segments) - 1)
 
     def run(self, script: str) -> dict[str, Any]:
         """
         Executes the podcast generation flow (sync version for backwards compatibility).
         """
-        # Create a minimal context that does nothing on report_progress
-        class SyncContext:
-            async def report_progress(self, progress: float, total: float | None = None, message: str | None = None) -> None:
-                pass # No-op for sync execution
-
         return asyncio.run(self.run_async(script, SyncContext()))
+
+    def resume(self, render_id: str) -> dict[str, Any]:
+        """Sync version of resume_async."""
+        return asyncio.run(self.resume_async(render_id, SyncContext()))
+
+    def run_batch(self, scripts: list[str], script_files: list[str] | None = None) -> dict[str, Any]:
+        """Sync version of run_batch_async."""
+        return asyncio.run(self.run_batch_async(scripts, SyncContext(), script_files))
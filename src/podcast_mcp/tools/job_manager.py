@@ -0,0 +1,325 @@
+import time
+import uuid
+import asyncio
+import logging
+import itertools
+from collections import OrderedDict
+from typing import Any, Optional
+from .render_scheduler import LOCAL_CLIENT, RenderScheduler
+from ..cancellation import CancelToken, RenderCancelled
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """Raised for jobs that would push the predicted queued work past MAX_QUEUED_WORK_S."""
+
+
+class Job:
+    """State of one submitted podcast render."""
+
+    def __init__(
+        self, script: str, priority: int = 0, script_file: Optional[str] = None, client_id: str = LOCAL_CLIENT,
+        estimated_seconds: Optional[float] = None,
+    ):
+        self.id = uuid.uuid4().hex[:12]
+        self.script = script
+        self.script_file = script_file
+        self.priority = priority
+        self.client_id = client_id
+        self.status = QUEUED
+        self.stage = "queued"
+        self.progress = 0.0
+        self.total: Optional[float] = None
+        self.message: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.cancel_requested = False
+        self.cancel_token = CancelToken()
+        # Predicted synthesis time from the cost model, and the render's latest time remaining
+        self.estimated_seconds = estimated_seconds
+        self._eta: Optional[tuple[float, float]] = None  # (seconds remaining, when reported)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """
+        Remaining time of a running job, or None if unknown.
+
+        Uses the render's own cost-model estimate when it reports one, else
+        extrapolates from progress so far.
+        """
+        if self.status != RUNNING:
+            return None
+        if self._eta is not None:
+            remaining, reported_at = self._eta
+            return max(0.0, remaining - (time.time() - reported_at))
+        if not self.total or self.progress <= 0 or self.started_at is None:
+            return None
+        elapsed = time.time() - self.started_at
+        return max(0.0, elapsed * (self.total - self.progress) / self.progress)
+
+    def remaining_work(self) -> float:
+        """Predicted seconds this job still needs (0 if finished or unknown)."""
+        if self.status == QUEUED:
+            return self.estimated_seconds or 0.0
+        if self.status == RUNNING:
+            eta = self.eta_seconds
+            return eta if eta is not None else self.estimated_seconds or 0.0
+        return 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        eta = self.eta_seconds
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "priority": self.priority,
+            "progress": self.progress,
+            "total": self.total,
+            "percent": round(100 * self.progress / self.total, 1) if self.total else 0.0,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "estimated_seconds": round(self.estimated_seconds, 1) if self.estimated_seconds is not None else None,
+            "message": self.message,
+            "error": self.error,
+        }
+
+
+class JobContext:
+    """
+    Progress context handed to GeneratePodcastTool.run_async for a job.
+
+    Records progress on the job and raises RenderCancelled once the job is
+    cancelled. The render also adopts the job's cancel_token, so synthesis
+    already under way stops at the next sentence or segment boundary.
+    """
+
+    def __init__(self, job: Job):
+        self.job = job
+        self.cancel_token = job.cancel_token
+
+    async def report_progress(self, progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        self.cancel_token.check()
+        self.job.progress = progress
+        self.job.total = total
+        if message is not None:
+            self.job.message = message
+        self.job.stage = "synthesizing" if total is None or progress < total else "combining"
+
+    def record_eta(self, seconds: Optional[float]) -> None:
+        """Keep the render's predicted time remaining for status queries."""
+        self.job._eta = (seconds, time.time()) if seconds is not None else None
+
+
+class JobManager:
+    """
+    Bounded-concurrency, priority-ordered scheduler in front of GeneratePodcastTool.
+
+    Higher priority jobs start first; equal priorities run in submission order.
+    At most MAX_CONCURRENT_RENDERS jobs run at once, the rest wait in the queue.
+
+    With a RenderScheduler, jobs instead wait for a slot of the scheduler,
+    which they share with direct renders and which takes turns between
+    clients.
+    """
+
+    def __init__(
+        self,
+        tool: Any,
+        max_concurrent: Optional[int] = None,
+        history_limit: Optional[int] = None,
+        scheduler: Optional[RenderScheduler] = None,
+    ):
+        self.tool = tool
+        self.max_concurrent = max_concurrent or Config.MAX_CONCURRENT_RENDERS
+        self.history_limit = history_limit or Config.JOB_HISTORY_LIMIT
+        self.scheduler = scheduler
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list[asyncio.Task] = []
+        self._tasks: dict[str, asyncio.Task] = {}  # Scheduled jobs not finished yet
+        self._sequence = itertools.count()
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrent:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def submit(
+        self, script: str, priority: int = 0, script_file: Optional[str] = None, client_id: str = LOCAL_CLIENT,
+        estimated_seconds: Optional[float] = None,
+    ) -> Job:
+        """
+        Queue a render and return its job immediately.
+
+        Args:
+            estimated_seconds: Predicted synthesis time (from the cost model), if known
+
+        Raises:
+            ServerDraining: If the scheduler no longer accepts renders
+            QueueFull: If the job would push the queued work past MAX_QUEUED_WORK_S
+        """
+        if self.scheduler is not None:
+            self.scheduler.admit()
+        if Config.MAX_QUEUED_WORK_S > 0 and estimated_seconds:
+            backlog = self.queued_work()
+            if backlog + estimated_seconds > Config.MAX_QUEUED_WORK_S:
+                raise QueueFull(
+                    f"The queue holds {backlog:.0f}s of predicted work; this script (about "
+                    f"{estimated_seconds:.0f}s) would exceed the {Config.MAX_QUEUED_WORK_S:.0f}s limit. "
+                    f"Try again later."
+                )
+        job = Job(script, priority, script_file, client_id, estimated_seconds)
+        self.jobs[job.id] = job
+        self._prune()
+        if self.scheduler is not None:
+            task = asyncio.create_task(self._run_scheduled(job))
+            self._tasks[job.id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+            logger.info(f"Queued job {job.id} (client={client_id}, priority={priority})")
+            return job
+        self._ensure_workers()
+        await self._queue.put((-priority, next(self._sequence), job.id))
+        logger.info(f"Queued job {job.id} (priority={priority}, queue={self._queue.qsize()})")
+        return job
+
+    async def _run_scheduled(self, job: Job) -> None:
+        async with self.scheduler.slot(job.client_id, job.priority):
+            if job.status == QUEUED:
+                await self._run(job)
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all scheduled jobs to finish.
+
+        Returns:
+            bool: True if they finished within timeout
+        """
+        if not self._tasks:
+            return True
+        _, pending = await asyncio.wait(list(self._tasks.values()), timeout=timeout)
+        return not pending
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        return list(self.jobs.values())
+
+    @property
+    def concurrency(self) -> int:
+        return self.scheduler.capacity if self.scheduler is not None else self.max_concurrent
+
+    def queued_work(self) -> float:
+        """Predicted seconds of work in queued and running jobs."""
+        return sum(job.remaining_work() for job in self.jobs.values())
+
+    def expected_start(self, job_id: str) -> Optional[float]:
+        """
+        Predicted seconds until a queued job starts, or None if it is not queued.
+
+        The work of running jobs and of queued jobs ahead of it is spread over
+        the render slots.
+        """
+        position = self.queue_position(job_id)
+        if position is None:
+            return None
+        job = self.jobs[job_id]
+        ahead = [
+            j for j in self.jobs.values()
+            if j.status == RUNNING or (j.status == QUEUED and not j.cancel_requested and j is not job
+                                       and (-j.priority, j.created_at) < (-job.priority, job.created_at))
+        ]
+        return sum(j.remaining_work() for j in ahead) / max(1, self.concurrency)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among queued jobs, or None if the job is not queued."""
+        queued = sorted(
+            (j for j in self.jobs.values() if j.status == QUEUED and not j.cancel_requested),
+            key=lambda j: (-j.priority, j.created_at),
+        )
+        for position, job in enumerate(queued, start=1):
+            if job.id == job_id:
+                return position
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation. Queued jobs never start; running jobs stop at the
+        next sentence or segment boundary.
+
+        Returns:
+            bool: False if the job is unknown or already finished
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return False
+        job.cancel_requested = True
+        job.cancel_token.cancel(f"Job {job_id} was cancelled")
+        if job.status == QUEUED:
+            self._finish(job, CANCELLED)
+            task = self._tasks.get(job_id)
+            if task is not None:
+                task.cancel()  # Leave the scheduler's queue
+        logger.info(f"Cancellation requested for job {job_id}")
+        return True
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.stage = "done"
+        job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [j.id for j in self.jobs.values() if j.status in FINISHED_STATES]
+        for job_id in finished[: max(0, len(self.jobs) - self.history_limit)]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None or job.status != QUEUED:
+                    continue  # Cancelled or pruned while waiting
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.stage = "parsing"
+        job.started_at = time.time()
+        logger.info(f"Starting job {job.id}")
+
+        try:
+            if job.script_file:
+                result = await self.tool.run_async(job.script, JobContext(job), script_file=job.script_file)
+            else:
+                result = await self.tool.run_async(job.script, JobContext(job))
+        except Exception as e:
+            logger.exception(f"Job {job.id} crashed")
+            result = {"success": False, "error": str(e)}
+
+        job.result = result
+        if job.cancel_requested:
+            job.error = "Cancelled"
+            self._finish(job, CANCELLED)
+        elif result.get("success"):
+            self._finish(job, SUCCEEDED)
+        else:
+            job.error = result.get("error")
+            self._finish(job, FAILED)
+        logger.info(f"Job {job.id} {job.status} after {job.finished_at - job.started_at:.2f}s")
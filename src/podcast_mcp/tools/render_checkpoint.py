@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import shutil
+import logging
+from typing import Any, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def _root(directory: Optional[str] = None) -> str:
+    return directory or Config.RENDER_CHECKPOINT_DIR or os.path.join(Config.TEMP_DIR, "renders")
+
+
+class SegmentsFailed(Exception):
+    """Raised after a checkpointed render finished with some segments still failing."""
+
+    def __init__(self, render_id: str, failed: dict[int, str]):
+        self.render_id = render_id
+        self.failed = failed
+        first = next(iter(failed.items()))
+        super().__init__(
+            f"{len(failed)} segment(s) failed (first: segment {first[0] + 1}: {first[1]}). "
+            f"Completed segments were kept; resume render {render_id} to retry."
+        )
+
+
+class RenderCheckpoint:
+    """
+    On-disk manifest of a render in progress.
+
+    Each render gets a directory under RENDER_CHECKPOINT_DIR (default
+    TEMP_DIR/renders) holding the segment audio files and manifest.json,
+    which records the render parameters and the state of every segment.
+    The manifest is rewritten
+    atomically after every finished segment, so a crash or restart loses at
+    most the segment that was being synthesized. A segment only counts as
+    done once the manifest says so; a half-written file from a killed
+    process is simply synthesized again.
+    """
+
+    def __init__(self, render_id: str, manifest: dict[str, Any], directory: Optional[str] = None):
+        self.render_id = render_id
+        self.directory = os.path.join(_root(directory), render_id)
+        self.manifest = manifest
+
+    @classmethod
+    def create(cls, render_id: str, segments: list[dict[str, str]], params: dict[str, Any],
+               directory: Optional[str] = None) -> "RenderCheckpoint":
+        """
+        Start a checkpoint for a new render and write its manifest.
+
+        Args:
+            render_id: Unique id, also the directory name
+            segments: Dicts with 'text', 'speaker' and 'language'
+            params: Render parameters needed to reassemble the output
+                (output_file, pause_ms, format, plus anything that changes the audio)
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "render_id": render_id,
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "params": params,
+            "segments": [
+                {**segment, "status": PENDING, "attempts": 0, "error": None} for segment in segments
+            ],
+        }
+        checkpoint = cls(render_id, manifest, directory)
+        os.makedirs(checkpoint.directory, exist_ok=True)
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, render_id: str, directory: Optional[str] = None) -> "RenderCheckpoint":
+        """
+        Load the checkpoint of an earlier render.
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint for render_id
+            ValueError: If the manifest is unreadable
+        """
+        render_id = os.path.basename(render_id)  # The id names a directory; never follow paths
+        path = os.path.join(_root(directory), render_id, MANIFEST_NAME)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No resumable render {render_id}")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Checkpoint of render {render_id} is corrupt: {e}")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Checkpoint of render {render_id} has unsupported version {manifest.get('version')}")
+        return cls(render_id, manifest, directory)
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return self.manifest["params"]
+
+    @property
+    def segments(self) -> list[dict[str, Any]]:
+        return self.manifest["segments"]
+
+    def segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"segment_{index}.wav")
+
+    def segment_paths(self) -> list[str]:
+        return [self.segment_path(i) for i in range(len(self.segments))]
+
+    def is_done(self, index: int) -> bool:
+        return self.segments[index]["status"] == DONE and os.path.exists(self.segment_path(index))
+
+    def pending(self) -> list[int]:
+        """Indices of segments that still need synthesis (pending, failed or missing on disk)."""
+        return [i for i in range(len(self.segments)) if not self.is_done(i)]
+
+    def failed(self) -> dict[int, str]:
+        return {i: s["error"] or "unknown error" for i, s in enumerate(self.segments) if s["status"] == FAILED}
+
+    def mark_done(self, index: int) -> None:
+        segment = self.segments[index]
+        segment["status"] = DONE
+        segment["attempts"] += 1
+        segment["error"] = None
+        self.save()
+
+    def mark_failed(self, index: int, error: str) -> None:
+        segment = self.segments[index]
+        segment["status"] = FAILED
+        segment["attempts"] += 1
+        segment["error"] = error
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically (write to a temp file, then rename over it)."""
+        self.manifest["updated_at"] = time.time()
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        partial = f"{path}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, path)
+
+    def discard(self) -> None:
+        """Delete the manifest and all segment files."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def summary(self) -> dict[str, Any]:
+        done = sum(1 for i in range(len(self.segments)) if self.is_done(i))
+        return {
+            "render_id": self.render_id,
+            "output_file": self.params.get("output_file"),
+            "segments_done": done,
+            "segments_total": len(self.segments),
+            "segments_failed": len(self.failed()),
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.manifest["updated_at"])),
+        }
+
+
+def list_checkpoints(directory: Optional[str] = None) -> list[RenderCheckpoint]:
+    """All resumable renders, most recently updated first. Unreadable ones are skipped."""
+    directory = _root(directory)
+    if not os.path.isdir(directory):
+        return []
+    checkpoints = []
+    for name in os.listdir(directory):
+        try:
+            checkpoints.append(RenderCheckpoint.load(name, directory))
+        except (FileNotFoundError, ValueError):
+            continue
+    return sorted(checkpoints, key=lambda c: c.manifest["updated_at"], reverse=True)
+
+
+def prune_checkpoints(max_age_hours: Optional[float] = None, directory: Optional[str] = None) -> int:
+    """
+    Delete checkpoints not updated within max_age_hours.
+
+    Returns:
+        int: Number of checkpoints removed
+    """
+    max_age_hours = Config.RENDER_CHECKPOINT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for checkpoint in list_checkpoints(directory):
+        if checkpoint.manifest["updated_at"] < cutoff:
+            checkpoint.discard()
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} stale render checkpoint(s)")
+    return removed
@@ -0,0 +1,82 @@
+import time
+import itertools
+from typing import Any, Optional
+
+
+def format_seconds(seconds: float) -> str:
+    """Short human-readable duration, e.g. 42s or 3m05s."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class EtaContext:
+    """
+    Progress context that adds the share of work done and a predicted time remaining to every update.
+
+    Wraps the context of a render. costs holds the predicted synthesis
+    seconds of each progress step (segments or units, from the cost model),
+    so a long line counts for more than a short one. Once work has been
+    done, the prediction is scaled by how fast this render actually went,
+    which absorbs load from other renders and a cost model that is off.
+
+    Progress counts are passed through unchanged; the estimate goes into the
+    message, and to record_eta(seconds) if the wrapped context has it (jobs
+    keep it for status queries). Other attributes are those of the wrapped
+    context.
+    """
+
+    def __init__(self, ctx: Any, costs: list[float]):
+        self.ctx = ctx
+        self._cumulative = [0.0] + list(itertools.accumulate(costs))
+        self._baseline: Optional[tuple[float, float]] = None  # (work done, time) at the first update
+        self._done = 0.0  # Work done at the latest update
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.ctx, name)
+
+    @property
+    def total_work(self) -> float:
+        return self._cumulative[-1]
+
+    @property
+    def remaining_work(self) -> float:
+        """Predicted seconds of work left after the latest update (skipped if the render stops now)."""
+        return max(0.0, self.total_work - self._done)
+
+    def _work_done(self, progress: float, total: Optional[float]) -> float:
+        steps = len(self._cumulative) - 1
+        if total == steps:
+            return self._cumulative[max(0, min(steps, int(progress)))]
+        if total:
+            return self.total_work * min(1.0, progress / total)
+        return 0.0
+
+    def eta_seconds(self, progress: float, total: Optional[float]) -> Optional[float]:
+        done = self._done = self._work_done(progress, total)
+        now = time.monotonic()
+        if self._baseline is None:
+            self._baseline = (done, now)
+        remaining = self.total_work - done
+        if remaining <= 0:
+            return 0.0
+        done_here, elapsed = done - self._baseline[0], now - self._baseline[1]
+        if done_here > 0 and elapsed > 0:
+            return remaining * elapsed / done_here
+        return remaining
+
+    async def report_progress(self, progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        eta = self.eta_seconds(progress, total)
+        if self.total_work > 0:
+            share = 100 * self._work_done(progress, total) / self.total_work
+            estimate = f"{share:.0f}% of work, ETA {format_seconds(eta)}"
+            message = f"{message}, {estimate}" if message else estimate
+        record = getattr(self.ctx, "record_eta", None)
+        if record is not None:
+            record(eta)
+        await self.ctx.report_progress(progress=progress, total=total, message=message)
@@ -0,0 +1,111 @@
+import queue
+import asyncio
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
+from ..config import Config
+from ..cancellation import wait_shielded
+from ..metrics import idle, stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_END = object()
+_ABORT = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside the consumer when the producer gave up."""
+
+
+class SegmentPipeline(Generic[T]):
+    """
+    Hands finished segments from the synthesis loop to a combining thread.
+
+    The producer (an async render) calls put() for each segment in script
+    order; consume runs in a worker thread and reads the segments from the
+    iterable it is given, so post-processing and encoding of segment N
+    overlap with the synthesis of segment N+1. At most `depth` segments are
+    queued or being processed at once: put() waits for a free slot, which
+    keeps memory bounded when the consumer falls behind.
+
+    Time the consumer spends waiting for the next segment is left out of
+    its "combine" stage, so the stage shows the real assembly cost. The
+    consumer gets a thread of its own: it lives as long as the render, and
+    in asyncio's default executor it would take a slot that concurrent
+    renders need for their (short) synthesis calls.
+    """
+
+    def __init__(self, consume: Callable[[Iterable[Any]], T], depth: Optional[int] = None):
+        self.depth = max(1, Config.PIPELINE_DEPTH if depth is None else depth)
+        self._consume = consume
+        self._items: queue.Queue = queue.Queue()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _arrivals(self) -> Iterator[Any]:
+        while True:
+            with idle():
+                item = self._items.get()
+            if item is _END:
+                return
+            if item is _ABORT:
+                raise PipelineAborted("Render stopped before all segments were produced")
+            yield item
+            # The consumer has finished with the item once it asks for the next one
+            self._loop.call_soon_threadsafe(self._slots.release)
+
+    def _run(self) -> T:
+        with stage("combine"):
+            return self._consume(self._arrivals())
+
+    def _start(self) -> None:
+        # Started by the first put(), outside any stage of the producer
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.depth)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-pipeline")
+        context = contextvars.copy_context()  # Render metrics and cancellation, as with to_thread
+        self._task = asyncio.ensure_future(self._loop.run_in_executor(executor, context.run, self._run))
+        self._task.add_done_callback(lambda _: executor.shutdown(wait=False))
+
+    async def put(self, item: Any) -> None:
+        """
+        Queue the next segment, waiting while `depth` segments are pending.
+
+        Raises:
+            Exception: Whatever the consumer failed with, if it stopped early
+        """
+        if self._task is None:
+            self._start()
+        acquire = asyncio.ensure_future(self._slots.acquire())
+        done, _ = await asyncio.wait({acquire, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if acquire not in done:
+            acquire.cancel()
+            self._task.result()
+            raise RuntimeError("Combining stopped before all segments were written")
+        self._items.put(item)
+
+    async def close(self) -> Optional[T]:
+        """Signal the end of the segments and return what consume returned (None if nothing was put)."""
+        if self._task is None:
+            return None
+        self._items.put(_END)
+        return await self._task
+
+    async def abort(self) -> None:
+        """
+        Stop the consumer without waiting for more segments and wait for it to exit.
+
+        Also waits while the render is being cancelled, so the partial output
+        is removed before the caller cleans up.
+        """
+        if self._task is None:
+            return
+        self._items.put(_ABORT)
+        await wait_shielded(self._task)
+        error = None if self._task.cancelled() else self._task.exception()
+        if error is not None and not isinstance(error, PipelineAborted):
+            logger.debug(f"Combining stopped with: {error}")
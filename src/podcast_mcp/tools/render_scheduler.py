@@ -0,0 +1,158 @@
+import heapq
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CLIENT = "local"
+
+
+class ServerDraining(Exception):
+    """Raised for renders requested after the server started shutting down."""
+
+
+class RenderScheduler:
+    """
+    Hands out render slots to many clients sharing one model.
+
+    At most `capacity` renders run at once (MAX_CONCURRENT_RENDERS) and each
+    client at most `per_client` of them (MAX_RENDERS_PER_CLIENT, 0 = no
+    per-client limit). A free slot goes to the waiting client with the fewest
+    running renders, ties going to the one served least recently, so one
+    client queueing many renders cannot starve the others; within a client,
+    higher priority goes first, then arrival order.
+
+    Callers check admit() when a render is requested; drain() stops
+    admitting renders and waits for the admitted ones (running and waiting)
+    to finish.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, per_client: Optional[int] = None):
+        self.capacity = max(1, capacity or Config.MAX_CONCURRENT_RENDERS)
+        self.per_client = Config.MAX_RENDERS_PER_CLIENT if per_client is None else per_client
+        self.draining = False
+        self._running: dict[str, int] = {}
+        self._waiting: dict[str, list[tuple[int, int, asyncio.Future]]] = {}
+        self._last_served: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._idle: Optional[asyncio.Event] = None
+
+    @property
+    def active(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "renders_active": self.active,
+            "renders_waiting": self.waiting,
+            "clients_active": len(set(self._running) | set(self._waiting)),
+        }
+
+    def _idle_event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    def admit(self) -> None:
+        """
+        Check that new renders are accepted.
+
+        Raises:
+            ServerDraining: If the server is shutting down
+        """
+        if self.draining:
+            raise ServerDraining("The server is shutting down and accepts no new renders")
+
+    @asynccontextmanager
+    async def slot(self, client_id: str = LOCAL_CLIENT, priority: int = 0) -> AsyncIterator[None]:
+        """Wait for a render slot and hold it for the duration of the block."""
+        future = asyncio.get_running_loop().create_future()
+        entry = (-priority, next(self._sequence), future)
+        queue = self._waiting.setdefault(client_id, [])
+        heapq.heappush(queue, entry)
+        self._idle_event().clear()
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(client_id)  # Granted just before the waiter was cancelled
+            else:
+                self._forget(client_id, entry)
+            raise
+        try:
+            yield
+        finally:
+            self._release(client_id)
+
+    def _eligible(self, client_id: str) -> bool:
+        return self.per_client <= 0 or self._running.get(client_id, 0) < self.per_client
+
+    def _dispatch(self) -> None:
+        while self.active < self.capacity:
+            candidates = [c for c in self._waiting if self._eligible(c)]
+            if not candidates:
+                return
+            client_id = min(candidates, key=lambda c: (self._running.get(c, 0), self._last_served.get(c, -1)))
+            queue = self._waiting[client_id]
+            _, _, future = heapq.heappop(queue)
+            if not queue:
+                del self._waiting[client_id]
+            if future.done():
+                continue  # Waiter gone
+            self._running[client_id] = self._running.get(client_id, 0) + 1
+            self._last_served[client_id] = next(self._sequence)
+            future.set_result(None)
+
+    def _forget(self, client_id: str, entry: tuple[int, int, asyncio.Future]) -> None:
+        queue = self._waiting.get(client_id)
+        if queue is not None and entry in queue:
+            queue.remove(entry)
+            heapq.heapify(queue)
+            if not queue:
+                del self._waiting[client_id]
+        self._check_idle()
+
+    def _release(self, client_id: str) -> None:
+        self._running[client_id] -= 1
+        if not self._running[client_id]:
+            del self._running[client_id]
+            if client_id not in self._waiting:
+                self._last_served.pop(client_id, None)  # Gone for now; a returning client starts fresh
+        self._dispatch()
+        self._check_idle()
+
+    def _check_idle(self) -> None:
+        if not self._running and not self._waiting:
+            self._idle_event().set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting renders and wait for the accepted ones to finish.
+
+        Args:
+            timeout: Seconds to wait (default SHUTDOWN_DRAIN_TIMEOUT_S)
+
+        Returns:
+            bool: True if all renders finished in time
+        """
+        self.draining = True
+        timeout = Config.SHUTDOWN_DRAIN_TIMEOUT_S if timeout is None else timeout
+        if self.active or self.waiting:
+            logger.info(f"Draining: waiting for {self.active} running and {self.waiting} queued renders")
+        try:
+            await asyncio.wait_for(self._idle_event().wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain timed out after {timeout}s with {self.active + self.waiting} renders left")
+            return False
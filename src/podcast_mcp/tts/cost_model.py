@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation: the estimate follows a changed machine or load within a few dozen segments
+DECAY = 0.9
+
+
+class CostModel:
+    """
+    Learned synthesis speed (characters per second) per model, device, language and voice.
+
+    Every real inference (cache hits do not count) is recorded with its
+    character count and wall time. Each key keeps exponentially decayed sums
+    of characters and seconds, so the rate is weighted by length and tracks
+    recent performance. Predictions fall back from the exact key to the same
+    model, device and language, then the same model and device, then
+    COST_MODEL_DEFAULT_CPS.
+
+    The table is stored as JSON at COST_MODEL_PATH (atomically, at most every
+    COST_MODEL_SAVE_INTERVAL_S and on save()) and loaded on first use, so
+    estimates are good right after a restart.
+
+    Worker processes use a recording model without a path: take_observations()
+    hands their raw observations to the parent, which owns the file.
+    """
+
+    def __init__(self, path: Optional[str] = None, default_cps: Optional[float] = None, record: bool = False):
+        self.path = Config.COST_MODEL_PATH if path is None else path
+        self.default_cps = Config.COST_MODEL_DEFAULT_CPS if default_cps is None else default_cps
+        self._lock = threading.Lock()
+        self._stats: dict[str, list[float]] = {}  # key -> [decayed chars, decayed seconds, observations]
+        # Observations not yet taken by take_observations() (record=True only)
+        self._recorded: Optional[list[tuple[int, float, str, str, str, str]]] = [] if record else None
+        self._loaded = False
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def _key(*parts: str) -> str:
+        return "|".join(parts)
+
+    def _ensure_loaded(self) -> None:
+        """Read the persisted table once. Caller must hold the lock."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._stats = {k: [float(v[0]), float(v[1]), float(v[2])] for k, v in data.get("rates", {}).items()}
+        except (OSError, ValueError, TypeError, IndexError) as e:
+            logger.warning(f"Ignoring unreadable cost model {self.path}: {e}")
+
+    def observe(self, chars: int, seconds: float, model: str, device: str, language: str, voice: str) -> None:
+        """Record one inference of `chars` characters that took `seconds`."""
+        if chars <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            if self._recorded is not None:
+                self._recorded.append((chars, seconds, model, device, language, voice))
+            self._ensure_loaded()
+            # The aggregate keys learn from every voice (and language), they back up unseen combinations
+            for key in (
+                self._key(model, device, language, voice),
+                self._key(model, device, language, "*"),
+                self._key(model, device, "*", "*"),
+            ):
+                stats = self._stats.setdefault(key, [0.0, 0.0, 0.0])
+                stats[0] = stats[0] * DECAY + chars
+                stats[1] = stats[1] * DECAY + seconds
+                stats[2] += 1
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= Config.COST_MODEL_SAVE_INTERVAL_S
+        if due:
+            self.save()
+
+    def take_observations(self) -> list[tuple[int, float, str, str, str, str]]:
+        """Observations recorded since the last call, as observe() arguments (empty unless recording)."""
+        with self._lock:
+            if not self._recorded:
+                return []
+            taken, self._recorded = self._recorded, []
+            return taken
+
+    def chars_per_second(self, model: str, device: str, language: str, voice: str) -> Optional[float]:
+        """Learned rate for the most specific known key, or None if nothing was observed yet."""
+        with self._lock:
+            self._ensure_loaded()
+            for key in (
+                self._key(model, device, language, voice),
+                self._key(model, device, language, "*"),
+                self._key(model, device, "*", "*"),
+            ):
+                stats = self._stats.get(key)
+                if stats and stats[1] > 0:
+                    return stats[0] / stats[1]
+        return None
+
+    def predict_seconds(self, chars: int, model: str, device: str, language: str, voice: str) -> float:
+        """Predicted synthesis time of a text with `chars` characters."""
+        cps = self.chars_per_second(model, device, language, voice) or self.default_cps
+        return chars / cps if cps > 0 else 0.0
+
+    def rates(self) -> dict[str, dict[str, Any]]:
+        """Learned rates by key, for status output."""
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                key: {"chars_per_second": round(c / s, 2), "observations": int(n)}
+                for key, (c, s, n) in self._stats.items() if s > 0
+            }
+
+    def save(self) -> None:
+        """Write the table if it changed since the last save."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            payload = json.dumps({"rates": self._stats}, indent=1, sort_keys=True)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)  # Worker processes may save too; readers never see partial files
+        except OSError as e:
+            logger.warning(f"Could not save cost model: {e}")
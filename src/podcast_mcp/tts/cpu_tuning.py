@@ -0,0 +1,132 @@
+import logging
+from contextlib import nullcontext
+from typing import Any, ContextManager
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+QUANTIZE_MODES = ("none", "int8")
+COMPILE_MODES = ("none", "compile")
+
+
+def cpu_mode_active() -> bool:
+    """True if the CPU performance settings apply (CPU_PERF_MODE on a CPU device)."""
+    return Config.CPU_PERF_MODE and Config.XTTS_DEVICE == "cpu"
+
+
+def variant_suffix() -> str:
+    """
+    Model id suffix for settings that change the produced audio.
+
+    Quantized weights give slightly different audio, so their segments must
+    not share cache entries with the full-precision model.
+    """
+    if cpu_mode_active() and Config.CPU_QUANTIZE == "int8":
+        return ":int8"
+    return ""
+
+
+def apply_thread_settings() -> None:
+    """
+    Pin torch's intra-op and inter-op thread pools to the configured sizes.
+
+    The inter-op pool can only be sized before torch runs its first parallel
+    work; if that already happened the setting is skipped with a warning.
+    """
+    if not cpu_mode_active():
+        return
+    import torch
+
+    if Config.TORCH_INTRA_OP_THREADS > 0:
+        torch.set_num_threads(Config.TORCH_INTRA_OP_THREADS)
+    if Config.TORCH_INTER_OP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(Config.TORCH_INTER_OP_THREADS)
+        except RuntimeError as e:
+            logger.warning(f"Could not set inter-op threads: {e}")
+    logger.info(
+        f"Torch threads: intra-op {torch.get_num_threads()}, inter-op {torch.get_num_interop_threads()}"
+    )
+
+
+def _conv1d_to_linear(module: Any) -> int:
+    """
+    Replace Hugging Face Conv1D layers (used by GPT-2) with equivalent nn.Linear layers.
+
+    Conv1D is a transposed linear layer that dynamic quantization does not
+    recognize; as nn.Linear it gets int8 weights like every other projection.
+
+    Returns:
+        int: Number of layers replaced
+    """
+    import torch
+
+    replaced = 0
+    for name, child in list(module.named_children()):
+        if type(child).__name__ == "Conv1D" and hasattr(child, "weight") and child.weight.dim() == 2:
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, bias=child.bias is not None)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                if child.bias is not None:
+                    linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+            replaced += 1
+        else:
+            replaced += _conv1d_to_linear(child)
+    return replaced
+
+
+def optimize_model(tts_model: Any) -> Any:
+    """
+    Apply the configured CPU optimizations to a loaded model.
+
+    Only the autoregressive GPT of XTTS (where nearly all CPU time goes) is
+    quantized; the HiFi-GAN vocoder is convolutional and quality-sensitive,
+    so it stays in full precision. Models without a 'gpt' are quantized
+    as a whole.
+
+    Args:
+        tts_model: The underlying model (synthesizer.tts_model)
+
+    Returns:
+        The same model, modified in place
+    """
+    if not cpu_mode_active() or tts_model is None:
+        return tts_model
+    import torch
+
+    target_name = "gpt" if hasattr(tts_model, "gpt") else None
+    target = getattr(tts_model, target_name) if target_name else tts_model
+    if not isinstance(target, torch.nn.Module):
+        logger.warning("CPU optimizations skipped: model is not a torch module")
+        return tts_model
+    target.eval()
+
+    if Config.CPU_QUANTIZE == "int8":
+        converted = _conv1d_to_linear(target)
+        quantized = torch.ao.quantization.quantize_dynamic(target, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        if target_name:
+            setattr(tts_model, target_name, quantized)
+        else:
+            tts_model = quantized
+        logger.info(f"Dynamic int8 quantization applied ({converted} Conv1D layers converted)")
+
+    if Config.CPU_COMPILE == "compile":
+        # The inner transformer runs once per generated token; compiling it pays off on long renders
+        inner = getattr(getattr(tts_model, "gpt", None), "gpt", None)
+        if isinstance(inner, torch.nn.Module) and hasattr(torch, "compile"):
+            tts_model.gpt.gpt = torch.compile(inner, dynamic=True)
+            logger.info("GPT transformer compiled with torch.compile")
+        else:
+            logger.warning("torch.compile unavailable for this model, running eagerly")
+
+    return tts_model
+
+
+def inference_context() -> ContextManager:
+    """torch.inference_mode() in CPU performance mode, a no-op otherwise."""
+    if not cpu_mode_active():
+        return nullcontext()
+    import torch
+    return torch.inference_mode()
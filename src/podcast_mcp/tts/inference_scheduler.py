@@ -0,0 +1,249 @@
+import time
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterator, Optional, TypeVar
+import numpy as np
+from ..config import Config
+from ..metrics import METRICS
+from ..cancellation import RenderCancelled, check_cancelled
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BATCH_SIZE_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32)
+
+# How often a caller waiting for its turn checks whether its render was cancelled
+CANCEL_POLL_S = 0.05
+
+
+class InferenceRequest:
+    """One text waiting for inference, plus the future its caller blocks on."""
+
+    def __init__(self, text: str, speaker_name: str, language: str, quality: str, learn: bool = True):
+        self.text = text
+        self.speaker_name = speaker_name
+        self.language = language
+        self.quality = quality
+        self.learn = learn  # Feed the measured time to the cost model (not for warm-ups)
+        self.func: Optional[Callable[[], Any]] = None  # Set for exclusive calls, which never batch
+        self.future: Future = Future()
+        self.submitted = time.monotonic()
+
+    def finish(self, result: Any) -> None:
+        """Hand the waveform, or the exception that failed this text, to the waiting caller (once)."""
+        if self.future.done():
+            return
+        if isinstance(result, Exception):
+            self.future.set_exception(result)
+        else:
+            self.future.set_result(result)
+
+    def compatible(self, other: "InferenceRequest", length_ratio: float) -> bool:
+        """True if both can share a forward pass: same model and language, similar length."""
+        if self.func is not None or other.func is not None:
+            return False
+        if (self.quality, self.language) != (other.quality, other.language):
+            return False
+        shorter, longer = sorted((max(1, len(self.text)), max(1, len(other.text))))
+        return longer <= shorter * length_ratio
+
+
+class InferenceScheduler:
+    """
+    Single thread that owns the TTS model and runs every inference of the process.
+
+    Renders running at the same time (tool calls, jobs, HTTP clients) submit
+    their texts here instead of calling the model from their own threads, so
+    the model is never used concurrently. Requests queued while a batch is
+    running are coalesced: the oldest request goes first, together with up
+    to INFERENCE_BATCH_SIZE - 1 others of the same quality and language
+    whose length is within INFERENCE_BATCH_LENGTH_RATIO of it (padding a
+    short text to a long one wastes the batch). When a batch finishes, its
+    callers and those still queued are the renders expected next: the next
+    batch waits up to INFERENCE_BATCH_WINDOW_MS after the finish (or the
+    oldest request's arrival) for all of them and goes as soon as they are
+    queued, so a lone render never waits. run_batch executes a batch and
+    returns one result per request: a waveform, or the exception that failed
+    that text alone. A backend that runs the batch back to back (XTTS has no
+    batched forward pass) finishes each request as soon as its text is done,
+    so callers do not wait for the rest of the batch; if a true batched call
+    raises, the requests it left unfinished are retried one by one so an
+    error reaches only the request that caused it.
+
+    Work that cannot be batched (file output, streamed chunks) runs through
+    call() on the same thread, in arrival order with the rest.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[InferenceRequest]], list[np.ndarray | Exception]],
+        window_ms: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        length_ratio: Optional[float] = None,
+    ):
+        self.run_batch = run_batch
+        self.window = (Config.INFERENCE_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.max_batch = max(1, max_batch or Config.INFERENCE_BATCH_SIZE)
+        self.length_ratio = max(1.0, length_ratio or Config.INFERENCE_BATCH_LENGTH_RATIO)
+        self._queue: list[InferenceRequest] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        # Requests expected for the next batch (callers of the last one plus those left queued), and
+        # when the last batch finished (monotonic)
+        self._expected = 1
+        self._finished = 0.0
+        self.batches = 0
+        self.requests = 0
+
+    def infer(self, request: InferenceRequest) -> np.ndarray:
+        """Queue a text for inference and wait for its waveform."""
+        if self._on_inference_thread():
+            result = self.run_batch([request])[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return self._wait(self._submit(request))
+
+    def infer_many(self, requests: list[InferenceRequest]) -> Iterator[np.ndarray]:
+        """
+        Queue several texts at once, so they can share one batch, and yield
+        their waveforms in order as each is ready.
+
+        A cancelled render stops between texts; closing the iterator early
+        (or an error while waiting) withdraws the texts that are still queued.
+        """
+        if self._on_inference_thread():
+            for request in requests:
+                yield self.infer(request)
+            return
+        self._submit(*requests)
+        try:
+            for request in requests:
+                check_cancelled()  # Stop between texts, even when the next one is already done
+                yield self._wait(request)
+        finally:
+            for request in requests:
+                request.future.cancel()  # Only succeeds for texts still waiting in the queue
+
+    def call(self, func: Callable[..., T], *args: Any) -> T:
+        """Run func(*args) on the inference thread, alone, and return its result."""
+        if self._on_inference_thread():
+            return func(*args)
+        request = InferenceRequest("", "", "", "")
+        request.func = lambda: func(*args)
+        return self._wait(self._submit(request))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "inference_queued": len(self._queue),
+            "inference_batches": self.batches,
+            "inference_mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _on_inference_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _submit(self, *requests: InferenceRequest) -> InferenceRequest:
+        """Queue requests together (the inference thread sees all or none of them); returns the first."""
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tts-inference", daemon=True)
+                self._thread.start()
+            self._queue.extend(requests)
+            self._condition.notify()
+        return requests[0]
+
+    @staticmethod
+    def _wait(request: InferenceRequest) -> Any:
+        """
+        Block until the request is done.
+
+        A cancelled render gives up its place while it is still queued; once
+        its batch runs, the result is waited for (the caller stops at its
+        next boundary instead).
+        """
+        while True:
+            try:
+                return request.future.result(timeout=CANCEL_POLL_S)
+            except FutureTimeoutError:
+                try:
+                    check_cancelled()
+                except RenderCancelled:
+                    if request.future.cancel():
+                        raise
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+            self._execute(batch)
+            if batch[0].func is None:
+                with self._condition:
+                    self._expected = min(self.max_batch, len(batch) + len(self._queue))
+                    self._finished = time.monotonic()
+
+    def _next_batch(self) -> list[InferenceRequest]:
+        """Wait for work and take the next batch off the queue (condition held)."""
+        while True:
+            self._queue = [r for r in self._queue if not r.future.cancelled()]
+            if not self._queue:
+                self._condition.wait()
+                continue
+            oldest = self._queue[0]
+            if oldest.func is None:
+                compatible = [r for r in self._queue if oldest.compatible(r, self.length_ratio)]
+                remaining = max(oldest.submitted, self._finished) + self.window - time.monotonic()
+                if len(compatible) < self._expected and remaining > 0:
+                    self._condition.wait(remaining)  # Give the renders of the last batch a moment to rejoin
+                    continue
+            else:
+                compatible = [oldest]
+
+            batch = []
+            for request in compatible[:self.max_batch]:
+                self._queue.remove(request)
+                if request.future.set_running_or_notify_cancel():
+                    batch.append(request)
+            if batch:
+                return batch
+
+    def _execute(self, batch: list[InferenceRequest]) -> None:
+        started = time.monotonic()
+        if batch[0].func is not None:
+            self._settle(batch[0], batch[0].func)
+            return
+
+        METRICS.observe("podcast_inference_batch_size", len(batch), buckets=BATCH_SIZE_BUCKETS,
+                        help="Texts per coalesced inference batch")
+        for request in batch:
+            METRICS.observe("podcast_inference_wait_seconds", started - request.submitted,
+                            help="Time a text waited for the inference thread")
+        self.batches += 1
+        self.requests += len(batch)
+        if len(batch) > 1:
+            logger.debug(f"Inference batch of {len(batch)} ({batch[0].quality}, {batch[0].language})")
+
+        try:
+            results = self.run_batch(batch)
+        except Exception as e:
+            unfinished = [r for r in batch if not r.future.done()]
+            if len(unfinished) <= 1:
+                for request in unfinished:
+                    request.finish(e)
+                return
+            logger.warning(f"Inference batch of {len(batch)} failed ({e}), retrying one by one")
+            for request in unfinished:
+                self._settle(request, lambda: self.run_batch([request])[0])
+            return
+        for request, result in zip(batch, results):
+            request.finish(result)
+
+    @staticmethod
+    def _settle(request: InferenceRequest, func: Callable[[], Any]) -> None:
+        try:
+            result = func()
+        except Exception as e:
+            result = e
+        request.finish(result)
@@ -0,0 +1,238 @@
+import os
+import gc
+import sys
+import ctypes
+import hashlib
+import logging
+import resource
+from typing import Any, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process (Linux), or the peak so far elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Highest resident set size of this process since it started."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _torch_module(model: Any) -> Any:
+    """The torch module holding the weights of a loaded TTS model, or None."""
+    candidate = getattr(getattr(model, "synthesizer", None), "tts_model", None)
+    if candidate is None:
+        candidate = model
+    return candidate if hasattr(candidate, "named_parameters") and hasattr(candidate, "named_buffers") else None
+
+
+def model_nbytes(model: Any) -> int:
+    """Bytes held by the model's parameters and buffers (0 for non-torch backends)."""
+    module = _torch_module(model)
+    if module is None:
+        return 0
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors if t.device.type != "meta")
+
+
+def release_memory() -> None:
+    """Return freed memory to the OS: collect garbage, empty the CUDA cache, trim the C heap."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def _source_stamp(model: Any) -> str:
+    """Sizes and modification times of the files the model was loaded from, if known."""
+    synthesizer = getattr(model, "synthesizer", None)
+    source = getattr(synthesizer, "model_dir", None) or getattr(synthesizer, "tts_checkpoint", None)
+    if not isinstance(source, str) or not os.path.exists(source):
+        return ""
+    paths = [source]
+    if os.path.isdir(source):
+        paths = sorted(os.path.join(source, name) for name in os.listdir(source))
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamps.append(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ",".join(stamps)
+
+
+def weights_cache_path(model_id: str, model: Any = None) -> str:
+    """
+    Weights file for offloading a model in this process.
+
+    The name covers the model id and the state of the model's files on disk,
+    so replaced model files never map stale weights back, and the process id,
+    so worker processes do not share (and delete) each other's files.
+    """
+    key = hashlib.sha256(f"{model_id}|{_source_stamp(model)}".encode("utf-8")).hexdigest()[:32]
+    return os.path.join(Config.MODEL_WEIGHTS_CACHE_DIR, f"{key}.{os.getpid()}.pt")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, owned by someone else
+    return True
+
+
+def purge_weights_cache() -> int:
+    """
+    Delete weights files left behind by processes that exited while offloaded.
+
+    Returns:
+        int: Number of files removed
+    """
+    try:
+        names = os.listdir(Config.MODEL_WEIGHTS_CACHE_DIR)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        parts = name.split(".")
+        if len(parts) >= 3 and parts[1].isdigit() and _pid_alive(int(parts[1])):
+            continue
+        try:
+            os.remove(os.path.join(Config.MODEL_WEIGHTS_CACHE_DIR, name))
+            removed += 1
+        except OSError:
+            pass
+    if removed:
+        logger.info(f"Removed {removed} stale weights cache file(s)")
+    return removed
+
+
+def can_offload(model: Any) -> bool:
+    """
+    True if the model's weights can be swapped out and mmap-loaded back.
+
+    Quantized and compiled models keep state outside plain parameters and
+    buffers, so they always take the full reload path.
+    """
+    module = _torch_module(model)
+    if module is None or "torch" not in sys.modules:
+        return False
+    for child in module.modules():
+        name = type(child).__module__
+        if "quantized" in name or "_dynamo" in name:
+            return False
+    return True
+
+
+def offload(model: Any, cache_path: str) -> bool:
+    """
+    Release the model's weights but keep its module structure.
+
+    All parameters and buffers are written to cache_path, then moved to the
+    'meta' device, which frees their memory. restore() maps them back from
+    the file and deletes it.
+
+    Returns:
+        bool: False if the weights could not be offloaded (the caller then
+        drops the whole model instead)
+    """
+    if not can_offload(model):
+        return False
+    import torch
+
+    module = _torch_module(model)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tensors = {name: t.detach().cpu() for name, t in module.named_parameters()}
+        tensors.update({f"buffer:{name}": t.detach().cpu() for name, t in module.named_buffers()})
+        tmp_path = f"{cache_path}.tmp"
+        torch.save(tensors, tmp_path)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Wrote weights cache {cache_path}")
+        module.to("meta")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not offload model weights ({e}), dropping the model instead")
+        return False
+
+
+def _set_tensor(module: Any, name: str, tensor: Any, is_buffer: bool) -> None:
+    import torch
+
+    *path, leaf = name.split(".")
+    owner = module
+    for part in path:
+        owner = getattr(owner, part)
+    if is_buffer:
+        owner._buffers[leaf] = tensor
+    else:
+        owner._parameters[leaf] = torch.nn.Parameter(tensor, requires_grad=False)
+
+
+def restore(model: Any, cache_path: str, device: str) -> bool:
+    """
+    Map offloaded weights back from cache_path.
+
+    With mmap the file is not read up front: pages are faulted in on first
+    use and come straight from the page cache if the file is still cached,
+    so a reload costs far less than building the model again. The file is
+    deleted once its tensors are mapped (the mapping outlives the name), so
+    the next eviction writes the weights the model holds then.
+
+    Returns:
+        bool: False if the cache is missing or does not match the model
+    """
+    module = _torch_module(model)
+    if module is None or not os.path.exists(cache_path):
+        return False
+    import torch
+
+    try:
+        tensors = torch.load(cache_path, map_location="cpu", mmap=True, weights_only=True)
+        expected = {name for name, _ in module.named_parameters()} | {
+            f"buffer:{name}" for name, _ in module.named_buffers()
+        }
+        if expected != set(tensors):
+            logger.warning("Weights cache does not match the model structure")
+            return False
+        for name, tensor in tensors.items():
+            if name.startswith("buffer:"):
+                _set_tensor(module, name[len("buffer:"):], tensor, is_buffer=True)
+            else:
+                _set_tensor(module, name, tensor, is_buffer=False)
+        if device != "cpu":
+            module.to(device)
+        module.eval()
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass  # Mapped files cannot be removed on Windows; purge_weights_cache() does it later
+        return True
+    except Exception as e:
+        logger.warning(f"Could not restore weights from {cache_path}: {e}")
+        return False
+
+
+def describe(model: Optional[Any]) -> dict[str, float]:
+    """Memory figures for status reporting, in MB."""
+    return {
+        "model_memory_mb": round(model_nbytes(model) / 2**20, 1) if model is not None else 0.0,
+        "rss_mb": round(process_rss_bytes() / 2**20, 1),
+        "peak_rss_mb": round(peak_rss_bytes() / 2**20, 1),
+    }
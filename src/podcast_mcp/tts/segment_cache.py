@@ -0,0 +1,240 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+import numpy as np
+from ..config import Config
+from ..audio.wav_io import read_wav, write_wav
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".wav"
+
+
+class SegmentCache:
+    """
+    Persistent, content-addressed cache of synthesized segments.
+
+    Entries are stored as audio files named after the SHA-256 of everything that
+    influences the synthesized audio (text, speaker, language, speed, model).
+    The cache is bounded by a size budget and evicts the least recently used
+    entries first. Recency survives restarts through the file modification time.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.cache_dir = cache_dir or Config.SEGMENT_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Config.SEGMENT_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = Config.SEGMENT_CACHE_ENABLED if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self._loaded = False
+
+    @staticmethod
+    def make_key(text: str, speaker_name: str, language: str, speed: float, model: str) -> str:
+        """
+        Build the cache key for a segment.
+
+        A voice given as reference audio is identified by its path plus the
+        file's size and modification time, so replacing the WAV file does not
+        keep serving segments cloned from the old one.
+
+        Args:
+            text: Text to synthesize
+            speaker_name: Resolved speaker name (not the "1".."4" id) or reference audio path
+            language: Language code
+            speed: Speaking rate passed to the model
+            model: Model identifier
+
+        Returns:
+            str: Hex digest identifying the segment audio
+        """
+        fields = {"text": text, "speaker": speaker_name, "language": language, "speed": speed, "model": model}
+        if os.path.isfile(speaker_name):
+            stat = os.stat(speaker_name)
+            fields["speaker_file"] = [stat.st_size, stat.st_mtime_ns]
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + CACHE_SUFFIX)
+
+    def _ensure_loaded(self) -> None:
+        """Index existing cache entries (oldest first). Caller must hold the lock."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        found: list[tuple[float, str, int]] = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(CACHE_SUFFIX):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, name[: -len(CACHE_SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        logger.debug(f"Segment cache indexed {len(self._entries)} entries ({self._total_bytes} bytes)")
+
+    def contains(self, key: str) -> bool:
+        """Whether a segment is cached, without counting a hit or miss."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._ensure_loaded()
+            return key in self._entries
+
+    def get(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached segment to output_path.
+
+        Returns:
+            bool: True on a cache hit, False otherwise
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._entries:
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+            os.utime(path)  # Persist recency for the next process
+        except OSError:
+            # Entry vanished behind our back (manual cleanup, other process)
+            self._drop_broken(key)
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def get_waveform(self, key: str, sample_rate: Optional[int] = None) -> Optional[tuple[np.ndarray, int]]:
+        """
+        Load a cached segment as a float waveform.
+
+        Args:
+            key: Cache key from make_key
+            sample_rate: Required sample rate; an entry at another rate counts as a miss
+
+        Returns:
+            tuple: (waveform, sample_rate) on a cache hit, None otherwise
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            result = read_wav(path)
+            os.utime(path)
+        except (OSError, EOFError, ValueError):
+            self._drop_broken(key)
+            return None
+
+        with self._lock:
+            if sample_rate is not None and result[1] != sample_rate:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return result
+
+    def _drop_broken(self, key: str) -> None:
+        """Forget an entry whose file is missing or unreadable and count the miss."""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self.misses += 1
+
+    def put(self, key: str, source_path: str) -> None:
+        """Store a freshly synthesized segment and evict old entries if over budget."""
+        self._store(key, lambda tmp_path: shutil.copyfile(source_path, tmp_path))
+
+    def put_waveform(self, key: str, waveform: np.ndarray, sample_rate: int) -> None:
+        """Store a freshly synthesized waveform and evict old entries if over budget."""
+        self._store(key, lambda tmp_path: write_wav(tmp_path, waveform, sample_rate))
+
+    def _store(self, key: str, write) -> None:
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            write(tmp_path)
+            os.replace(tmp_path, path)  # Atomic, so readers never see partial files
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"Could not store segment in cache: {e}")
+            return
+
+        with self._lock:
+            self._ensure_loaded()
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under budget. Caller must hold the lock."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            logger.debug(f"Evicted cached segment {key[:12]} ({size} bytes)")
+
+    def clear(self) -> None:
+        """Remove all cached segments."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current cache usage."""
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
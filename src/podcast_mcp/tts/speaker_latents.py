@@ -0,0 +1,110 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Any, Optional
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerLatentStore:
+    """
+    In-memory and on-disk store of XTTS speaker conditioning.
+
+    Each voice resolves to a (gpt_cond_latent, speaker_embedding) pair. Built-in
+    speakers come from the model's speaker manager, while a voice configured as
+    a path to reference audio is encoded with get_conditioning_latents(), which
+    is expensive. Both are persisted keyed by model and voice so restarts only
+    load tensors from disk; reference audio is also keyed by the file's size
+    and modification time, so replacing the file re-encodes it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, model_id: Optional[str] = None):
+        self.cache_dir = cache_dir or Config.SPEAKER_LATENT_DIR
+        self.model_id = model_id or Config.XTTS_MODEL
+        self._latents: dict[str, tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_stamp(voice: str) -> list[str]:
+        """Size and modification time of reference audio (empty for built-in speakers)."""
+        if not os.path.isfile(voice):
+            return []
+        stat = os.stat(voice)
+        return [str(stat.st_size), str(stat.st_mtime_ns)]
+
+    def _memory_key(self, voice: str) -> str:
+        return "\0".join([voice] + self._file_stamp(voice))
+
+    def _disk_key(self, voice: str) -> str:
+        parts = [self.model_id, voice] + self._file_stamp(voice)
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _disk_path(self, voice: str) -> str:
+        return os.path.join(self.cache_dir, self._disk_key(voice) + ".pth")
+
+    def get(self, tts_model: Any, voice: str) -> tuple[Any, Any]:
+        """
+        Return the conditioning for a voice, computing it at most once.
+
+        Args:
+            tts_model: The underlying XTTS model (synthesizer.tts_model)
+            voice: Built-in speaker name or path to reference audio
+
+        Returns:
+            tuple: (gpt_cond_latent, speaker_embedding)
+        """
+        key = self._memory_key(voice)
+        cached = self._latents.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            if key not in self._latents:
+                self._latents[key] = self._load_or_compute(tts_model, voice)
+            return self._latents[key]
+
+    def preload(self, tts_model: Any, voices: list[str]) -> None:
+        """Resolve conditioning for all configured voices, skipping ones that fail."""
+        for voice in voices:
+            try:
+                self.get(tts_model, voice)
+            except Exception as e:
+                logger.warning(f"Could not prepare conditioning for voice '{voice}': {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latents.clear()
+
+    def _load_or_compute(self, tts_model: Any, voice: str) -> tuple[Any, Any]:
+        import torch
+
+        path = self._disk_path(voice)
+        if os.path.exists(path):
+            try:
+                data = torch.load(path, map_location=Config.XTTS_DEVICE)
+                logger.debug(f"Loaded conditioning for '{voice}' from {path}")
+                return data["gpt_cond_latent"], data["speaker_embedding"]
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable latent cache {path}: {e}")
+
+        if os.path.isfile(voice):
+            logger.info(f"Computing conditioning latents from reference audio {voice}")
+            gpt_cond_latent, speaker_embedding = tts_model.get_conditioning_latents(audio_path=[voice])
+        else:
+            speakers = tts_model.speaker_manager.speakers
+            if voice not in speakers:
+                raise ValueError(f"Unknown speaker '{voice}'")
+            speaker = speakers[voice]
+            gpt_cond_latent, speaker_embedding = speaker["gpt_cond_latent"], speaker["speaker_embedding"]
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            torch.save({"gpt_cond_latent": gpt_cond_latent, "speaker_embedding": speaker_embedding}, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist conditioning for '{voice}': {e}")
+
+        return gpt_cond_latent, speaker_embedding
@@ -0,0 +1,157 @@
+import re
+from typing import Any
+import numpy as np
+from ..config import Config
+from .tts_manager import QUALITY_FINAL
+
+# XTTS v2 per-language character limits (from the model's tokenizer); longer
+# inputs degrade and trigger truncation warnings
+XTTS_CHAR_LIMITS: dict[str, int] = {
+    "en": 250, "de": 253, "fr": 273, "es": 239, "it": 213, "pt": 203, "pl": 224,
+    "tr": 226, "ru": 182, "nl": 251, "cs": 186, "ar": 166, "zh": 82, "zh-cn": 82,
+    "ja": 71, "hu": 224, "ko": 95, "hi": 150,
+}
+DEFAULT_CHAR_LIMIT = 200
+
+# Fragments shorter than this are merged into a neighbour (XTTS is unstable on very short input)
+MIN_UNIT_CHARS = 20
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…。！？])\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:，；：])\s+')
+
+
+def char_limit(language: str) -> int:
+    """Maximum characters per inference call for a language."""
+    limit = XTTS_CHAR_LIMITS.get(language.lower(), DEFAULT_CHAR_LIMIT)
+    if Config.CHUNK_MAX_CHARS > 0:
+        limit = min(limit, Config.CHUNK_MAX_CHARS)
+    return limit
+
+
+def _split_long(text: str, limit: int) -> list[str]:
+    """Split a sentence over the limit at clause boundaries, then at word boundaries."""
+    if len(text) <= limit:
+        return [text]
+
+    pieces: list[str] = []
+    for clause in _CLAUSE_END.split(text):
+        if len(clause) <= limit:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > limit:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+    return _pack(pieces, limit)
+
+
+def _pack(pieces: list[str], limit: int) -> list[str]:
+    """Merge adjacent pieces while they fit, so fragments are not needlessly tiny."""
+    packed: list[str] = []
+    for piece in pieces:
+        if packed and (len(packed[-1]) < MIN_UNIT_CHARS or len(piece) < MIN_UNIT_CHARS) \
+                and len(packed[-1]) + 1 + len(piece) <= limit:
+            packed[-1] = f"{packed[-1]} {piece}"
+        else:
+            packed.append(piece)
+    return packed
+
+
+def split_text(text: str, language: str) -> list[str]:
+    """
+    Split text into sentence-sized units under the model's per-call limit.
+
+    Args:
+        text: Segment text
+        language: Language code, selects the character limit
+
+    Returns:
+        list[str]: Units in reading order
+    """
+    limit = char_limit(language)
+    text = " ".join(text.split())
+    units: list[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        if sentence:
+            units.extend(_split_long(sentence, limit))
+    return _pack(units, limit)
+
+
+def plan_units(segments: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """
+    Break dialogue segments into synthesis units.
+
+    Args:
+        segments: Dicts with 'text', 'speaker', 'language' and optionally 'quality'
+
+    Returns:
+        list: Unit dicts with 'segment' (index of the source segment), 'text',
+        'speaker', 'language' and 'quality', in script order
+    """
+    units: list[dict[str, Any]] = []
+    for index, segment in enumerate(segments):
+        for text in split_text(segment["text"], segment["language"]):
+            units.append({
+                "segment": index,
+                "text": text,
+                "speaker": segment["speaker"],
+                "language": segment["language"],
+                "quality": segment.get("quality", QUALITY_FINAL),
+            })
+    return units
+
+
+def group_batches(units: list[dict[str, Any]], batch_size: int) -> list[list[int]]:
+    """
+    Group unit indices into batches sharing speaker, language and quality.
+
+    Within a group, units are ordered by length so a batch holds inputs of
+    similar size. Batches are returned in order of their earliest unit, so
+    the batch holding the start of the script runs first; with length
+    sorting, later units may still finish before earlier ones of another
+    batch.
+
+    Returns:
+        list: Batches of indices into units
+    """
+    groups: dict[tuple[str, str, str], list[int]] = {}
+    for i, unit in enumerate(units):
+        groups.setdefault((unit["speaker"], unit["language"], unit.get("quality", QUALITY_FINAL)), []).append(i)
+
+    batches: list[list[int]] = []
+    for indices in groups.values():
+        indices.sort(key=lambda i: len(units[i]["text"]))
+        for start in range(0, len(indices), max(1, batch_size)):
+            batches.append(indices[start:start + batch_size])
+    batches.sort(key=min)
+    return batches
+
+
+def stitch(units: list[dict[str, Any]], waveforms: list[np.ndarray], segment_count: int,
+           sample_rate: int, gap_ms: int = 0) -> list[np.ndarray]:
+    """
+    Reassemble per-unit waveforms into one waveform per segment.
+
+    Args:
+        units: Units from plan_units
+        waveforms: One waveform per unit, same order as units
+        segment_count: Number of source segments
+        sample_rate: Sample rate of the waveforms
+        gap_ms: Silence inserted between units of the same segment
+
+    Returns:
+        list[np.ndarray]: One waveform per segment, in script order
+    """
+    gap = np.zeros(int(sample_rate * gap_ms / 1000), dtype=np.float32)
+    parts: list[list[np.ndarray]] = [[] for _ in range(segment_count)]
+    for unit, waveform in zip(units, waveforms):
+        if parts[unit["segment"]] and len(gap):
+            parts[unit["segment"]].append(gap)
+        parts[unit["segment"]].append(np.asarray(waveform, dtype=np.float32))
+    return [np.concatenate(p) if p else np.zeros(0, dtype=np.float32) for p in parts]
@@ -0,0 +1,102 @@
+import time
+import zlib
+import numpy as np
+from ..config import Config
+from ..audio.wav_io import write_wav
+
+SAMPLE_RATE = 24000
+CHARS_PER_SECOND = 15.0  # Roughly XTTS speaking rate at speed 1.0
+
+
+class _Synthesizer:
+    output_sample_rate = SAMPLE_RATE
+
+
+class SyntheticTTS:
+    """
+    Deterministic stand-in for Coqui's TTS API (TTS_BACKEND=synthetic).
+
+    Produces speech-like audio without a model: one tone burst per word with
+    a pitch derived from the speaker and the word, separated by short gaps,
+    so the duration scales with text length like real speech. Each call can
+    be slowed down to emulate inference cost (SYNTHETIC_TTS_LATENCY_MS per
+    call plus SYNTHETIC_TTS_RTF seconds per second of audio). The same input
+    always yields the same samples.
+
+    Unlike Coqui's API it also has a batched call (tts_batch), so the
+    batching of the inference scheduler can be measured.
+    """
+
+    def __init__(self, model_name: str = "synthetic", **kwargs):
+        self.model_name = model_name
+        self.synthesizer = _Synthesizer()
+
+    def to(self, device: str) -> "SyntheticTTS":
+        return self
+
+    def tts(self, text: str, language: str = "en", speed: float = 1.0,
+            speaker: str | None = None, speaker_wav: str | None = None, **kwargs) -> np.ndarray:
+        started = time.perf_counter()
+        waveform = render(text, speaker or speaker_wav or "", speed)
+
+        # Emulate inference cost
+        target = Config.SYNTHETIC_TTS_LATENCY_MS / 1000 + Config.SYNTHETIC_TTS_RTF * len(waveform) / SAMPLE_RATE
+        remaining = target - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return waveform
+
+    def tts_batch(self, texts: list[str], speakers: list[str], language: str = "en",
+                  speed: float = 1.0, **kwargs) -> list[np.ndarray]:
+        """
+        Synthesize several texts in one emulated batched forward pass.
+
+        The per-call latency is paid once and the pass lasts as long as its
+        longest item, as for a padded batch on an accelerator.
+        """
+        started = time.perf_counter()
+        waveforms = [render(text, speaker, speed) for text, speaker in zip(texts, speakers)]
+
+        longest = max((len(w) for w in waveforms), default=0)
+        target = Config.SYNTHETIC_TTS_LATENCY_MS / 1000 + Config.SYNTHETIC_TTS_RTF * longest / SAMPLE_RATE
+        remaining = target - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return waveforms
+
+    def tts_to_file(self, text: str, file_path: str, language: str = "en", speed: float = 1.0,
+                    speaker: str | None = None, speaker_wav: str | None = None, **kwargs) -> str:
+        waveform = self.tts(text, language=language, speed=speed, speaker=speaker, speaker_wav=speaker_wav)
+        return write_wav(file_path, waveform, SAMPLE_RATE)
+
+
+def render(text: str, speaker: str, speed: float = 1.0) -> np.ndarray:
+    """
+    Render text to a deterministic speech-like waveform.
+
+    Args:
+        text: Input text; its length determines the duration
+        speaker: Speaker name; selects the base pitch
+        speed: Speaking rate multiplier
+
+    Returns:
+        np.ndarray: Mono float32 waveform at SAMPLE_RATE
+    """
+    base_pitch = 110.0 + zlib.crc32(speaker.encode("utf-8")) % 120
+    seconds_per_char = 1.0 / (CHARS_PER_SECOND * max(speed, 0.1))
+    gap = np.zeros(int(0.04 * SAMPLE_RATE), dtype=np.float32)
+
+    parts: list[np.ndarray] = []
+    for word in text.split():
+        n = max(1, int(len(word) * seconds_per_char * SAMPLE_RATE))
+        t = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+        pitch = base_pitch * (1.0 + (zlib.crc32(word.encode("utf-8")) % 40) / 100.0)
+        # Fundamental plus two harmonics under a smooth envelope
+        tone = np.sin(2 * np.pi * pitch * t) + 0.5 * np.sin(4 * np.pi * pitch * t) + 0.25 * np.sin(6 * np.pi * pitch * t)
+        envelope = np.sin(np.pi * np.arange(n, dtype=np.float32) / n)
+        parts.append((0.3 * tone * envelope).astype(np.float32))
+        parts.append(gap)
+
+    if not parts:
+        return np.zeros(int(0.1 * SAMPLE_RATE), dtype=np.float32)
+    return np.concatenate(parts[:-1])
@@ -1,21 +1,74 @@
 import os
+import time
 import logging
 import threading
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+import numpy as np
 from ..config import Config
-
-# Try importing TTS, but don't fail immediately if not present (allows for testing without full install)
-try:
-    from TTS.api import TTS
-except ImportError:
-    TTS = None
+from .segment_cache import SegmentCache
+from .speaker_latents import SpeakerLatentStore
+from .cost_model import CostModel
+from .inference_scheduler import InferenceRequest, InferenceScheduler
+from . import cpu_tuning, model_memory
+from ..audio.wav_io import write_wav
+from ..audio.post_process import resample
+from ..metrics import stage
+from ..cancellation import check_cancelled
 
 logger = logging.getLogger(__name__)
 
+# Native output rate of XTTS v2, used until the model reports its own
+MODEL_SAMPLE_RATE = 24000
+
+WARMUP_TEXT = "Hello, this is a warm-up."
+
+QUALITY_FINAL = "final"
+QUALITY_DRAFT = "draft"
+
+
+def _import_tts() -> Any:
+    """
+    Import the TTS backend class on first use.
+
+    TTS.api pulls in torch and takes seconds to import, so it is kept out of
+    module import time (the MCP handshake must not wait for it).
+    TTS_BACKEND=synthetic selects a model-free stand-in for benchmarks and
+    load tests.
+    """
+    if Config.TTS_BACKEND == "synthetic":
+        from .synthetic_backend import SyntheticTTS
+        return SyntheticTTS
+    try:
+        from TTS.api import TTS
+    except ImportError:
+        raise ImportError("Coqui TTS is not installed. Please install 'coqui-tts'.")
+    return TTS
+
 class TTSManager:
     _instance: Optional["TTSManager"] = None
     _lock: threading.Lock = threading.Lock()
     _model: Any = None
+    _sample_rate: int = MODEL_SAMPLE_RATE
+    _xtts: Any = None  # Underlying XTTS model when direct latent inference is available
+    _draft: Any = None  # Small fast model for draft renders, loaded on first use
+    _draft_sample_rate: Optional[int] = None
+    # Readiness: cold -> loading -> ready (or failed); warming while the preload warm-up runs,
+    # evicted after an idle unload (the next request loads it again)
+    state: str = "cold"
+    load_error: Optional[str] = None
+    load_timings: dict[str, float]
+    # Idle eviction: requests using the model right now, and when the last one finished (monotonic)
+    _usage_lock: threading.Lock
+    _in_flight: int = 0
+    last_used: float = 0.0
+    evictions: int = 0
+    _offloaded: Optional[tuple[Any, Any, str]] = None  # (model, xtts, weights file) for the mmap reload
+    _idle_watcher: Optional[threading.Thread] = None
+    cache: SegmentCache
+    latents: SpeakerLatentStore
+    costs: CostModel
+    scheduler: InferenceScheduler  # Owns the model: every inference runs on its thread
     
     # Get speaker names from config
     @property
@@ -27,11 +80,58 @@ class TTSManager:
             "4": Config.VOICE_4
         }
 
+    @property
+    def DRAFT_SPEAKERS(self) -> dict[str, str]:
+        return {
+            "1": Config.DRAFT_VOICE_1,
+            "2": Config.DRAFT_VOICE_2,
+            "3": Config.DRAFT_VOICE_3,
+            "4": Config.DRAFT_VOICE_4
+        }
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of waveforms returned by synthesize()."""
+        return self._sample_rate
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the active backend and model, part of every cache key."""
+        if Config.TTS_BACKEND == "coqui":
+            return Config.XTTS_MODEL + cpu_tuning.variant_suffix()
+        return f"{Config.TTS_BACKEND}:{Config.XTTS_MODEL}" + cpu_tuning.variant_suffix()
+
+    def model_id_for(self, quality: str) -> str:
+        """Model identifier of a render quality (draft audio never mixes with final audio in the cache)."""
+        if quality != QUALITY_DRAFT:
+            return self.model_id
+        if Config.TTS_BACKEND == "coqui":
+            return Config.DRAFT_MODEL
+        return f"{Config.TTS_BACKEND}:{Config.DRAFT_MODEL}"
+
+    def _resolve_speaker(self, speaker_id: str, quality: str = QUALITY_FINAL) -> str:
+        speakers = self.DRAFT_SPEAKERS if quality == QUALITY_DRAFT else self.SPEAKERS
+        return speakers.get(speaker_id, speakers["1"])
+
+    @staticmethod
+    def _speaker_kwargs(speaker_name: str) -> dict[str, str]:
+        # A voice configured as a file path is reference audio for cloning
+        if os.path.isfile(speaker_name):
+            return {"speaker_wav": speaker_name}
+        return {"speaker": speaker_name}
+
     def __new__(cls) -> "TTSManager":
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super(TTSManager, cls).__new__(cls)
+                    instance = super(TTSManager, cls).__new__(cls)
+                    instance.cache = SegmentCache()
+                    instance.latents = SpeakerLatentStore()
+                    instance.costs = CostModel()
+                    instance.scheduler = InferenceScheduler(instance._infer_batch)
+                    instance.load_timings = {}
+                    instance._usage_lock = threading.Lock()
+                    cls._instance = instance
         return cls._instance
 
     def load_model(self) -> None:
@@ -39,14 +139,339 @@ class TTSManager:
         if self._model is None:
             with self._lock:
                 if self._model is None:
-                    if TTS is None:
-                        raise ImportError("Coqui TTS is not installed. Please install 'coqui-tts'.")
-                    
-                    logger.info(f"Loading TTS model: {Config.XTTS_MODEL} on {Config.XTTS_DEVICE}")
-                    self._model = TTS(model_name=Config.XTTS_MODEL).to(Config.XTTS_DEVICE)
-                    logger.info("Model loaded successfully")
+                    self.state = "loading"
+                    try:
+                        with stage("load_model"):
+                            if not self._restore_offloaded():
+                                self._load_model_locked()
+                    except Exception as e:
+                        self.state = "failed"
+                        self.load_error = str(e)
+                        raise
+                    self.state = "ready"
+                    self.load_error = None
+                    self.last_used = time.monotonic()
+                    self._start_idle_watcher()
+
+    def _load_model_locked(self) -> None:
+        started = time.perf_counter()
+        TTS = _import_tts()
+        imported = time.perf_counter()
+        self.load_timings["import_seconds"] = round(imported - started, 3)
+
+        logger.info(f"Loading TTS model: {Config.XTTS_MODEL} on {Config.XTTS_DEVICE}")
+        if Config.TTS_BACKEND == "coqui":
+            cpu_tuning.apply_thread_settings()
+        self._model = TTS(model_name=Config.XTTS_MODEL).to(Config.XTTS_DEVICE)
+        synthesizer = getattr(self._model, "synthesizer", None)
+        output_sample_rate = getattr(synthesizer, "output_sample_rate", None)
+        if isinstance(output_sample_rate, int):
+            self._sample_rate = output_sample_rate
+        loaded = time.perf_counter()
+        self.load_timings["load_seconds"] = round(loaded - imported, 3)
+        logger.info("Model loaded successfully")
+
+        # Resolve speaker conditioning once instead of on every segment
+        tts_model = getattr(synthesizer, "tts_model", None)
+        if hasattr(tts_model, "inference") and hasattr(tts_model, "get_conditioning_latents"):
+            self._xtts = tts_model
+            self.latents.preload(tts_model, list(self.SPEAKERS.values()))
+            logger.info("Speaker conditioning ready")
+        conditioned = time.perf_counter()
+        self.load_timings["latents_seconds"] = round(conditioned - loaded, 3)
+
+        # After the latents, so configured voices are conditioned at full precision
+        if Config.TTS_BACKEND == "coqui" and cpu_tuning.cpu_mode_active():
+            optimized = cpu_tuning.optimize_model(tts_model)
+            if self._xtts is not None:
+                self._xtts = optimized
+            self.load_timings["optimize_seconds"] = round(time.perf_counter() - conditioned, 3)
+
+    def load_draft_model(self) -> None:
+        """Loads the draft model if not already loaded; the main model is not needed for drafts."""
+        if self._draft is None:
+            with self._lock:
+                if self._draft is None:
+                    with stage("load_model"):
+                        TTS = _import_tts()
+                        logger.info(f"Loading draft TTS model: {Config.DRAFT_MODEL} on {Config.XTTS_DEVICE}")
+                        draft = TTS(model_name=Config.DRAFT_MODEL).to(Config.XTTS_DEVICE)
+                    output_sample_rate = getattr(getattr(draft, "synthesizer", None), "output_sample_rate", None)
+                    self._draft_sample_rate = output_sample_rate if isinstance(output_sample_rate, int) else None
+                    self._draft = draft
+                    self.last_used = time.monotonic()
+                    self._start_idle_watcher()
+
+    def _ensure_loaded(self, quality: str) -> None:
+        if quality == QUALITY_DRAFT:
+            self.load_draft_model()
+        elif self._model is None:
+            self.load_model()
+
+    def _restore_offloaded(self) -> bool:
+        """Map the weights of an evicted model back in; False if a full load is needed."""
+        if self._offloaded is None:
+            return False
+        model, xtts, cache_path = self._offloaded
+        self._offloaded = None
+        started = time.perf_counter()
+        if not model_memory.restore(model, cache_path, Config.XTTS_DEVICE):
+            return False
+        self._model, self._xtts = model, xtts
+        self.load_timings["reload_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Model weights mapped back in {self.load_timings['reload_seconds']}s")
+        return True
+
+    @contextmanager
+    def _in_use(self) -> Iterator[None]:
+        """Mark the model busy for the duration of the block, so it is not evicted under a request."""
+        with self._usage_lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._usage_lock:
+                self._in_flight -= 1
+                self.last_used = time.monotonic()
+
+    def evict_if_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Unload the model if no request has used it for `timeout` seconds.
+
+        Holds the usage lock while unloading, so a request arriving meanwhile
+        waits and then loads the model again instead of finding it half gone.
+
+        Args:
+            timeout: Idle seconds required (default MODEL_IDLE_TIMEOUT_S)
+
+        Returns:
+            bool: True if the model was evicted
+        """
+        timeout = Config.MODEL_IDLE_TIMEOUT_S if timeout is None else timeout
+        with self._usage_lock:
+            if (self._model is None and self._draft is None) or self._in_flight:
+                return False
+            if self._model is not None and self.state != "ready":
+                return False
+            if time.monotonic() - self.last_used < timeout:
+                return False
+            with self._lock:
+                self._evict_locked()
+        return True
+
+    def _evict_locked(self) -> None:
+        started = time.perf_counter()
+        freed = model_memory.model_nbytes(self._model) + model_memory.model_nbytes(self._draft)
+        cache_path = model_memory.weights_cache_path(self.model_id, self._model)
+        if self._model is not None and Config.MODEL_MMAP_RELOAD and model_memory.offload(self._model, cache_path):
+            self._offloaded = (self._model, self._xtts, cache_path)
+        # The draft model is small and simply loaded again
+        self._draft = None
+        if self._model is not None:
+            self._model = None
+            self._xtts = None
+            self.state = "evicted"
+        self.evictions += 1
+        model_memory.release_memory()
+        logger.info(
+            f"Model evicted after {Config.MODEL_IDLE_TIMEOUT_S:g}s idle: ~{freed / 2**20:.0f} MB released "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _start_idle_watcher(self) -> None:
+        if Config.MODEL_IDLE_TIMEOUT_S <= 0:
+            return
+        if self._idle_watcher is not None and self._idle_watcher.is_alive():
+            return
+        self._idle_watcher = threading.Thread(target=self._watch_idle, name="model-idle-watcher", daemon=True)
+        self._idle_watcher.start()
+
+    def _watch_idle(self) -> None:
+        interval = min(30.0, max(1.0, Config.MODEL_IDLE_TIMEOUT_S / 4))
+        while True:
+            time.sleep(interval)
+            try:
+                self.evict_if_idle()
+            except Exception as e:
+                logger.warning(f"Idle eviction failed: {e}")
+
+    def memory_stats(self) -> dict[str, Any]:
+        """Model and process memory plus idle-eviction counters, for status reporting."""
+        idle = time.monotonic() - self.last_used if self._model is not None and not self._in_flight else 0.0
+        return {
+            **model_memory.describe(self._model),
+            "model_in_use": self._in_flight,
+            "model_idle_seconds": round(idle, 1),
+            "model_evictions": self.evictions,
+        }
+
+    def preload(self, warmup: bool = True) -> None:
+        """
+        Load the model and optionally run a short warm-up inference.
+
+        The first inference after loading is much slower than later ones
+        (lazy allocations, kernel selection); paying it here keeps it off the
+        first real request. Failures are recorded in state/load_error.
+        """
+        try:
+            with self._in_use():
+                self.load_model()
+                if warmup:
+                    self.state = "warming"
+                    started = time.perf_counter()
+                    self._infer(WARMUP_TEXT, self._resolve_speaker("1"), "en", learn=False)
+                    self.load_timings["warmup_seconds"] = round(time.perf_counter() - started, 3)
+                    self.state = "ready"
+            logger.info(f"Model preload complete: {self.load_timings}")
+        except Exception as e:
+            self.state = "failed"
+            self.load_error = str(e)
+            logger.error(f"Model preload failed: {e}")
+
+    def _infer(
+        self, text: str, speaker_name: str, language: str, learn: bool = True, quality: str = QUALITY_FINAL
+    ) -> np.ndarray:
+        """
+        Run inference for one text and return the waveform (model of the quality must be loaded).
+
+        The text is queued on the inference scheduler, which may batch it with
+        texts of concurrent renders; the calling thread waits for the result.
+        """
+        return self.scheduler.infer(InferenceRequest(text, speaker_name, language, quality, learn))
+
+    def _infer_batch(self, requests: list[InferenceRequest]) -> list[np.ndarray | Exception]:
+        """
+        Run one batch of the inference scheduler (requests share quality and language).
+
+        A model with a batched forward pass (tts_batch) synthesizes the batch
+        in one call, and the time is split between the texts by length for
+        the cost model. XTTS decodes autoregressively and has none, so its
+        batches run back to back on the inference thread: each request is
+        finished as soon as its own text is done, and a failing text fails
+        only its own request (returned as the exception).
+        """
+        quality = requests[0].quality
+        model = self._draft if quality == QUALITY_DRAFT else self._model
+        # Looked up on the class: XTTS conditioning goes through self._xtts, and mocks invent attributes
+        batched = len(requests) > 1 and hasattr(type(model), "tts_batch") \
+            and (quality == QUALITY_DRAFT or self._xtts is None)
+        waveforms: list[np.ndarray | Exception] = []
+        seconds: list[float] = []
+        with cpu_tuning.inference_context():
+            if batched:
+                started = time.perf_counter()
+                outputs = model.tts_batch(
+                    texts=[r.text for r in requests],
+                    speakers=[r.speaker_name for r in requests],
+                    language=requests[0].language,
+                    speed=Config.TTS_SPEED,
+                )
+                elapsed = time.perf_counter() - started
+                chars = sum(len(r.text) for r in requests) or 1
+                for request, output in zip(requests, outputs):
+                    waveform = self._to_numpy(output)
+                    waveforms.append(self._to_main_rate(waveform) if quality == QUALITY_DRAFT else waveform)
+                    seconds.append(elapsed * len(request.text) / chars)
+                for request, elapsed in zip(requests, seconds):
+                    if request.learn:
+                        self._learn_cost(request.text, request.speaker_name, request.language, elapsed, quality)
+            else:
+                for request in requests:
+                    started = time.perf_counter()
+                    try:
+                        if quality == QUALITY_DRAFT:
+                            waveform = self._infer_draft(request.text, request.speaker_name, request.language)
+                        else:
+                            waveform = self._infer_unguarded(request.text, request.speaker_name, request.language)
+                    except Exception as e:
+                        waveforms.append(e)
+                        request.finish(e)
+                        continue
+                    if request.learn:
+                        self._learn_cost(
+                            request.text, request.speaker_name, request.language,
+                            time.perf_counter() - started, quality,
+                        )
+                    waveforms.append(waveform)
+                    request.finish(waveform)  # Its caller goes on while the rest of the batch runs
+        return waveforms
+
+    def _learn_cost(
+        self, text: str, speaker_name: str, language: str, seconds: float, quality: str = QUALITY_FINAL
+    ) -> None:
+        self.costs.observe(len(text), seconds, self.model_id_for(quality), Config.XTTS_DEVICE, language, speaker_name)
+
+    def predict_seconds(self, text: str, speaker_id: str, language: str, quality: str = QUALITY_FINAL) -> float:
+        """
+        Predicted synthesis time of one segment from the cost model.
+
+        Cached segments cost nothing. Model loading is not included.
+        """
+        speaker_name = self._resolve_speaker(speaker_id, quality)
+        model_id = self.model_id_for(quality)
+        if self.cache.contains(SegmentCache.make_key(text, speaker_name, language, Config.TTS_SPEED, model_id)):
+            return 0.0
+        return self.costs.predict_seconds(len(text), model_id, Config.XTTS_DEVICE, language, speaker_name)
+
+    def _infer_draft(self, text: str, speaker_name: str, language: str) -> np.ndarray:
+        """
+        Synthesize with the draft model, resampled to self.sample_rate.
+
+        Speaker and language are only passed if the model takes them (the
+        default VCTK model is English only), so any script can be drafted.
+        """
+        kwargs: dict[str, str] = {}
+        if getattr(self._draft, "is_multi_speaker", True):
+            kwargs.update(self._speaker_kwargs(speaker_name))
+        if getattr(self._draft, "is_multi_lingual", True):
+            kwargs["language"] = language
+        return self._to_main_rate(self._to_numpy(self._draft.tts(text=text, speed=Config.TTS_SPEED, **kwargs)))
+
+    def _to_main_rate(self, waveform: np.ndarray) -> np.ndarray:
+        # Draft and final segments share one pipeline, which runs at the main model's rate
+        if self._draft_sample_rate and self._draft_sample_rate != self.sample_rate:
+            waveform = resample(waveform, self._draft_sample_rate, self.sample_rate)
+        return waveform
+
+    def _infer_unguarded(self, text: str, speaker_name: str, language: str) -> np.ndarray:
+        if self._xtts is not None:
+            gpt_cond_latent, speaker_embedding = self.latents.get(self._xtts, speaker_name)
+            out = self._xtts.inference(
+                text,
+                language,
+                gpt_cond_latent,
+                speaker_embedding,
+                speed=Config.TTS_SPEED,
+                enable_text_splitting=True,
+            )
+            wav = out["wav"]
+        else:
+            wav = self._model.tts(
+                text=text,
+                language=language,
+                speed=Config.TTS_SPEED,
+                **self._speaker_kwargs(speaker_name)
+            )
+        return self._to_numpy(wav)
+
+    @staticmethod
+    def _next_chunk(stream: Iterator[Any]) -> tuple[Any, float]:
+        """Decode the next chunk of an XTTS stream (None at the end) and time it."""
+        # Only the model's own steps run under inference mode, not the consumer's code
+        started = time.perf_counter()
+        with cpu_tuning.inference_context():
+            chunk = next(stream, None)
+        return chunk, time.perf_counter() - started
 
-    def generate_segment(self, text: str, speaker_id: str, language: str, output_path: str) -> str:
+    @staticmethod
+    def _to_numpy(wav: Any) -> np.ndarray:
+        if hasattr(wav, "cpu"):
+            wav = wav.cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).reshape(-1)
+
+    def generate_segment(
+        self, text: str, speaker_id: str, language: str, output_path: str, quality: str = QUALITY_FINAL
+    ) -> str:
         """
         Generate speech using standard TTS speakers (no voice cloning).
         
@@ -55,30 +480,198 @@ class TTSManager:
             speaker_id: "1", "2", "3", or "4" for different voices
             language: Language code (e.g., "en", "de")
             output_path: Where to save the audio file
+            quality: "final" (main model) or "draft" (draft model)
             
         Returns:
             str: Path to the generated audio file
         """
-        if self._model is None:
-            self.load_model()
-        
         # Get speaker name from mapping
-        speaker_name = self.SPEAKERS.get(speaker_id, self.SPEAKERS["1"])
-        
-        logger.info(f"Generating TTS: '{text[:30]}...' (speaker={speaker_name}, lang={language})")
-        
-        # Use standard TTS without voice cloning
-        # Note: TTS model inference might not be thread-safe depending on implementation/device
-        # but the singleton access is now safe.
-        # We might want to lock inference too if the underlying library isn't thread safe,
-        # but for now we assume it handles it or we accept the risk for parallel requests.
-        # Given this is a local tool, high concurrency is unlikely.
-        if self._model:
-             self._model.tts_to_file(
+        speaker_name = self._resolve_speaker(speaker_id, quality)
+
+        # Serve unchanged (or repeated) lines from the segment cache
+        cache_key = SegmentCache.make_key(text, speaker_name, language, Config.TTS_SPEED, self.model_id_for(quality))
+        if self.cache.get(cache_key, output_path):
+            logger.info(f"Cache hit: '{text[:30]}...' (speaker={speaker_name}, lang={language})")
+            return output_path
+
+        with self._in_use():
+            self._ensure_loaded(quality)
+
+            logger.info(f"Generating TTS: '{text[:30]}...' (speaker={speaker_name}, lang={language})")
+
+            # Use standard TTS without voice cloning; the model only ever runs on the scheduler's thread,
+            # and waveform inference can share batches with concurrent renders
+            if quality == QUALITY_DRAFT or self._xtts is not None or hasattr(type(self._model), "tts_batch"):
+                write_wav(output_path, self._infer(text, speaker_name, language, quality=quality), self.sample_rate)
+                self.cache.put(cache_key, output_path)
+            elif self._model:
+                self.scheduler.call(self._tts_to_file, text, speaker_name, language, output_path)
+                self.cache.put(cache_key, output_path)
+        return output_path
+
+    def _tts_to_file(self, text: str, speaker_name: str, language: str, output_path: str) -> None:
+        started = time.perf_counter()
+        with cpu_tuning.inference_context():
+            self._model.tts_to_file(
                 text=text,
-                speaker=speaker_name,
                 language=language,
                 file_path=output_path,
-                speed=Config.TTS_SPEED
+                speed=Config.TTS_SPEED,
+                **self._speaker_kwargs(speaker_name)
             )
-        return output_path
+        self._learn_cost(text, speaker_name, language, time.perf_counter() - started)
+
+    def synthesize(self, text: str, speaker_id: str, language: str, quality: str = QUALITY_FINAL) -> np.ndarray:
+        """
+        Generate speech and return the raw waveform instead of writing a file.
+
+        Args:
+            text: Text to synthesize
+            speaker_id: "1", "2", "3", or "4" for different voices
+            language: Language code (e.g., "en", "de")
+            quality: "final" (main model) or "draft" (draft model)
+
+        Returns:
+            np.ndarray: Mono float32 waveform at self.sample_rate
+        """
+        return self.synthesize_batch([text], speaker_id, language, quality)[0]
+
+    def synthesize_batch(
+        self, texts: list[str], speaker_id: str, language: str, quality: str = QUALITY_FINAL
+    ) -> list[np.ndarray]:
+        """
+        Generate speech for several texts of the same speaker and language.
+
+        The speaker conditioning is resolved once for the whole batch, cached
+        texts are skipped and a text repeated within the batch is synthesized
+        once. The remaining texts are queued on the inference
+        scheduler together, so a model with a batched forward pass
+        (tts_batch) synthesizes them in one call, possibly with texts of
+        concurrent renders; XTTS runs them back to back. Each waveform is
+        cached as it arrives; a cancelled render stops between texts and
+        withdraws those still queued.
+
+        Args:
+            texts: Texts to synthesize
+            speaker_id: "1", "2", "3", or "4" for different voices
+            language: Language code (e.g., "en", "de")
+            quality: "final" (main model) or "draft" (draft model)
+
+        Returns:
+            list[np.ndarray]: One mono float32 waveform per text, at self.sample_rate
+        """
+        speaker_name = self._resolve_speaker(speaker_id, quality)
+        model_id = self.model_id_for(quality)
+        results: list[Optional[np.ndarray]] = [None] * len(texts)
+        keys = [
+            SegmentCache.make_key(text, speaker_name, language, Config.TTS_SPEED, model_id)
+            for text in texts
+        ]
+
+        # Indices of each distinct text, so repeated texts are looked up and synthesized once
+        indices: dict[str, list[int]] = {}
+        for i, key in enumerate(keys):
+            indices.setdefault(key, []).append(i)
+
+        missing: list[str] = []
+        for key, positions in indices.items():
+            cached = self.cache.get_waveform(key, self.sample_rate)
+            if cached is None:
+                missing.append(key)
+                continue
+            logger.info(f"Cache hit: '{texts[positions[0]][:30]}...' (speaker={speaker_name}, lang={language})")
+            for i in positions:
+                results[i] = cached[0]
+
+        if missing:
+            with self._in_use():
+                self._ensure_loaded(quality)
+
+                logger.info(f"Generating TTS batch of {len(missing)} (speaker={speaker_name}, lang={language})")
+                requests = [
+                    InferenceRequest(texts[indices[key][0]], speaker_name, language, quality) for key in missing
+                ]
+                waveforms = self.scheduler.infer_many(requests)
+                try:
+                    for key, waveform in zip(missing, waveforms):
+                        # Earlier texts are cached, so a rerun after a failure picks up from here
+                        self.cache.put_waveform(key, waveform, self.sample_rate)
+                        for i in indices[key]:
+                            results[i] = waveform
+                finally:
+                    waveforms.close()
+
+        return results
+
+    def synthesize_stream(
+        self, text: str, speaker_id: str, language: str, quality: str = QUALITY_FINAL
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate speech incrementally, yielding waveform chunks as they are decoded.
+
+        Uses XTTS streaming inference when available; cached segments, drafts
+        and models without streaming support yield a single chunk. A
+        cancelled render stops between chunks.
+
+        Args:
+            text: Text to synthesize
+            speaker_id: "1", "2", "3", or "4" for different voices
+            language: Language code (e.g., "en", "de")
+            quality: "final" (main model) or "draft" (draft model)
+
+        Yields:
+            np.ndarray: Mono float32 chunks at self.sample_rate
+        """
+        speaker_name = self._resolve_speaker(speaker_id, quality)
+        cache_key = SegmentCache.make_key(text, speaker_name, language, Config.TTS_SPEED, self.model_id_for(quality))
+
+        cached = self.cache.get_waveform(cache_key, self.sample_rate)
+        if cached is not None:
+            logger.info(f"Cache hit: '{text[:30]}...' (speaker={speaker_name}, lang={language})")
+            yield cached[0]
+            return
+
+        # Held until the stream is exhausted or closed, so the model stays loaded between chunks
+        with self._in_use():
+            yield from self._stream_uncached(text, speaker_name, language, cache_key, quality)
+
+    def _stream_uncached(
+        self, text: str, speaker_name: str, language: str, cache_key: str, quality: str
+    ) -> Iterator[np.ndarray]:
+        self._ensure_loaded(quality)
+
+        logger.info(f"Streaming TTS: '{text[:30]}...' (speaker={speaker_name}, lang={language})")
+
+        if quality == QUALITY_DRAFT or self._xtts is None or not hasattr(self._xtts, "inference_stream"):
+            waveform = self._infer(text, speaker_name, language, quality=quality)
+            self.cache.put_waveform(cache_key, waveform, self.sample_rate)
+            yield waveform
+            return
+
+        # Conditioning may need the model, and every decoding step runs on the inference thread,
+        # so other renders' texts are served between this stream's chunks
+        gpt_cond_latent, speaker_embedding = self.scheduler.call(self.latents.get, self._xtts, speaker_name)
+        chunks: list[np.ndarray] = []
+        stream = self._xtts.inference_stream(
+            text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            stream_chunk_size=Config.STREAM_CHUNK_SIZE,
+            speed=Config.TTS_SPEED,
+            enable_text_splitting=True,
+        )
+        inference_seconds = 0.0
+        while True:
+            check_cancelled()
+            chunk, seconds = self.scheduler.call(self._next_chunk, stream)
+            inference_seconds += seconds
+            if chunk is None:
+                break
+            waveform = self._to_numpy(chunk)
+            chunks.append(waveform)
+            yield waveform
+
+        if chunks:
+            self._learn_cost(text, speaker_name, language, inference_seconds)
+            self.cache.put_waveform(cache_key, np.concatenate(chunks), self.sample_rate)
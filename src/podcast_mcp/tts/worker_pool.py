@@ -0,0 +1,204 @@
+import os
+import shutil
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+import numpy as np
+from ..config import Config
+from ..cancellation import wait_shielded
+from .cost_model import CostModel
+from .tts_manager import QUALITY_FINAL, TTSManager
+
+logger = logging.getLogger(__name__)
+
+# Model replica of the current worker process (set by _init_worker)
+_worker_manager: Optional[TTSManager] = None
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Process initializer: pin torch threads and load this worker's model replica."""
+    global _worker_manager
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+    _worker_manager = TTSManager()
+    # Timings go back to the parent with each result; only the parent writes COST_MODEL_PATH
+    _worker_manager.costs = CostModel(path="", record=True)
+    _worker_manager.load_model()
+    logger.info(f"TTS worker {os.getpid()} ready ({torch_threads} torch threads)")
+
+
+def _manager() -> TTSManager:
+    return _worker_manager if _worker_manager is not None else TTSManager()
+
+
+Observation = tuple[int, float, str, str, str, str]
+
+
+def _worker_generate_segment(
+    text: str, speaker_id: str, language: str, output_path: str, quality: str
+) -> tuple[str, list[Observation]]:
+    manager = _manager()
+    path = manager.generate_segment(text, speaker_id, language, output_path, quality)
+    return path, manager.costs.take_observations()
+
+
+def _worker_synthesize(
+    text: str, speaker_id: str, language: str, quality: str
+) -> tuple[np.ndarray, int, list[Observation]]:
+    manager = _manager()
+    waveform = manager.synthesize(text, speaker_id, language, quality)
+    return waveform, manager.sample_rate, manager.costs.take_observations()
+
+
+def _worker_warmup() -> int:
+    _manager().preload(warmup=True)
+    return os.getpid()
+
+
+class TTSWorkerPool:
+    """
+    Pool of worker processes, each holding its own TTS model replica.
+
+    Segments are dispatched longest-first so workers finish at about the same
+    time, identical lines are synthesized once, and results come back in
+    script order.
+    """
+
+    def __init__(self, workers: Optional[int] = None, torch_threads: Optional[int] = None, executor: Optional[Executor] = None):
+        self.workers = workers or Config.TTS_WORKERS
+        self.torch_threads = torch_threads or Config.TTS_WORKER_THREADS or max(1, (os.cpu_count() or 1) // self.workers)
+        self.sample_rate: Optional[int] = None
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # Never fork a process that may already hold torch threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.torch_threads,),
+            )
+            logger.info(f"Started TTS worker pool: {self.workers} processes x {self.torch_threads} torch threads")
+        self._executor = executor
+
+    async def run(
+        self,
+        segments: list[dict[str, str]],
+        output_paths: Optional[list[str]] = None,
+        on_complete: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        on_result: Optional[Callable[[list[int]], None]] = None,
+        retries: int = 0,
+        on_error: Optional[Callable[[list[int], str], None]] = None,
+    ) -> list[Any]:
+        """
+        Synthesize all segments in parallel.
+
+        Args:
+            segments: Dicts with 'text', 'speaker', 'language' and optionally 'quality'
+            output_paths: One file path per segment to write WAV files, or None
+                to get waveforms back
+            on_complete: Awaited with (completed, total) after each finished segment
+            on_result: Called with the indices of segments whose result is in
+                place, e.g. to record them in a render checkpoint
+            retries: Times a failing segment is submitted again
+            on_error: Called with the indices and error of segments that still
+                failed after the retries; their results stay None and the other
+                segments carry on. Without it the first failure is raised.
+
+        Returns:
+            list: Output paths or waveforms, in the same order as segments
+        """
+        loop = asyncio.get_running_loop()
+        total = len(segments)
+        results: list[Any] = [None] * total
+
+        # Identical lines are synthesized once and fanned out afterwards
+        groups: dict[tuple[str, str, str, str], list[int]] = {}
+        for i, segment in enumerate(segments):
+            key = (segment["text"], segment["speaker"], segment["language"], segment.get("quality", QUALITY_FINAL))
+            groups.setdefault(key, []).append(i)
+
+        futures: dict[asyncio.Future, tuple[tuple, list[int], int]] = {}
+        running: list[Future] = []
+
+        def submit(call: tuple, indices: list[int], attempt: int) -> asyncio.Future:
+            submitted = self._executor.submit(*call)
+            running.append(submitted)
+            future = asyncio.wrap_future(submitted, loop=loop)
+            futures[future] = (call, indices, attempt)
+            return future
+
+        # Longest texts first so the tail of the job is made of short segments
+        for key, indices in sorted(groups.items(), key=lambda item: len(item[0][0]), reverse=True):
+            text, speaker_id, language, quality = key
+            if output_paths is not None:
+                call = (_worker_generate_segment, text, speaker_id, language, output_paths[indices[0]], quality)
+            else:
+                call = (_worker_synthesize, text, speaker_id, language, quality)
+            submit(call, indices, 0)
+
+        completed = 0
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    call, indices, attempt = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if on_error is None:
+                            raise
+                        error = str(e) or type(e).__name__
+                        logger.warning(f"Segment {indices[0] + 1} failed (attempt {attempt + 1}): {error}")
+                        if attempt < retries:
+                            pending.add(submit(call, indices, attempt + 1))
+                            continue
+                        on_error(indices, error)
+                        completed += len(indices)
+                        if on_complete is not None:
+                            await on_complete(completed, total)
+                        continue
+
+                    if output_paths is not None:
+                        path, observations = result
+                        for i in indices[1:]:
+                            await asyncio.to_thread(shutil.copyfile, path, output_paths[i])
+                            results[i] = output_paths[i]
+                        results[indices[0]] = path
+                    else:
+                        waveform, self.sample_rate, observations = result
+                        for i in indices:
+                            results[i] = waveform
+                    # Learned here, so the parent's cost model (and its file) sees every worker's timings
+                    costs = TTSManager().costs
+                    for observation in observations:
+                        costs.observe(*observation)
+
+                    if on_result is not None:
+                        on_result(indices)
+                    completed += len(indices)
+                    if on_complete is not None:
+                        await on_complete(completed, total)
+        finally:
+            for future in pending:
+                future.cancel()
+            # Segments a worker already started cannot be stopped; wait so their files do not
+            # appear after the caller cleaned up (a cancelled render waits one segment per worker)
+            running = [f for f in running if not f.done()]
+            if running:
+                await wait_shielded(asyncio.gather(*(asyncio.wrap_future(f) for f in running), return_exceptions=True))
+
+        return results
+
+    def warm_up(self) -> None:
+        """Start the worker processes and run a warm-up inference in each, without waiting."""
+        for _ in range(self.workers):
+            self._executor.submit(_worker_warmup)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
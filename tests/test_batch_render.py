@@ -0,0 +1,110 @@
+import asyncio
+import os
+import wave
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.wav_io import read_wav
+from podcast_mcp.config import Config
+from podcast_mcp.tools.batch_plan import distinct_output_paths, plan_batch
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool, SyncContext
+
+INTRO = "Welcome to the daily briefing."
+
+
+def _script(name: str, *lines: str) -> str:
+    header = f"filename: {name}\n" if name else ""
+    return header + "\n".join(f"<voice{1 + i % 2}>{line}" for i, line in enumerate(lines))
+
+
+@pytest.fixture
+def tool(tmp_path):
+    tool = GeneratePodcastTool()
+    tool.tts.synthesize_batch = MagicMock(
+        side_effect=lambda texts, speaker, lang, quality="final": [np.full(100, 0.1, dtype=np.float32) for _ in texts]
+    )
+    with patch.object(Config, "OUTPUT_DIR", str(tmp_path)), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch.object(Config, "TTS_WORKERS", 0), \
+            patch.object(Config, "SENTENCE_CHUNKING", False):
+        yield tool
+
+
+def _synthesized_texts(tool) -> list[str]:
+    return [text for call in tool.tts.synthesize_batch.call_args_list for text in call.args[0]]
+
+
+def test_batch_synthesizes_shared_lines_once(tool, tmp_path):
+    scripts = [_script(f"day{i}.wav", INTRO, f"News of day {i}.") for i in range(3)]
+
+    result = tool.run_batch(scripts)
+
+    assert result["success"]
+    assert (result["unique_units"], result["total_units"]) == (4, 6)
+    texts = _synthesized_texts(tool)
+    assert sorted(texts) == sorted([INTRO] + [f"News of day {i}." for i in range(3)])
+    pause = int(tool.tts.sample_rate * Config.DEFAULT_PAUSE_MS / 1000)
+    for i, script_result in enumerate(result["results"]):
+        assert script_result["output_file"] == os.path.join(str(tmp_path), f"day{i}.wav")
+        waveform, _ = read_wav(script_result["output_file"])
+        assert len(waveform) == 200 + pause
+
+
+def test_batch_reports_audio_duration_and_saves_costs(tool, tmp_path):
+    scripts = [_script(f"day{i}.wav", INTRO, f"News of day {i}.") for i in range(2)]
+
+    with patch.object(tool.tts.costs, "save") as save:
+        result = tool.run_batch(scripts)
+
+    save.assert_called_once()
+    pause = int(tool.tts.sample_rate * Config.DEFAULT_PAUSE_MS / 1000)
+    assert result["metrics"]["audio_seconds"] == round(2 * (200 + pause) / tool.tts.sample_rate, 2)
+
+    stereo = str(tmp_path / "stereo.wav")
+    with wave.open(stereo, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(b"\0" * 8000 * 2 * 2)
+    assert GeneratePodcastTool._wav_seconds(stereo) == 1.0
+
+
+def test_batch_reports_each_script_and_isolates_failures(tool, tmp_path):
+    def synthesize_batch(texts, speaker, lang, quality="final"):
+        if "Broken line." in texts:
+            raise RuntimeError("model error")
+        return [np.zeros(50, dtype=np.float32) for _ in texts]
+
+    tool.tts.synthesize_batch.side_effect = synthesize_batch
+    scripts = [_script("", "First episode."), "no tags here", _script("", "Broken line."), _script("", "Third.")]
+    finished: list[int] = []
+
+    async def on_result(index, result):
+        finished.append(index)
+
+    result = asyncio.run(tool.run_batch_async(scripts, SyncContext(), on_result=on_result))
+
+    outcomes = [r["success"] for r in result["results"]]
+    assert outcomes == [True, False, False, True]
+    assert "No dialogue" in result["results"][1]["error"]
+    assert result["results"][2]["error"] == "model error"
+    assert sorted(finished) == [0, 1, 2, 3]
+    # Default names do not overwrite each other
+    assert result["results"][0]["output_file"].endswith("podcast.wav")
+    assert result["results"][3]["output_file"].endswith("podcast_3.wav")  # podcast_2 went to the failed script
+
+
+def test_plan_batch_with_sentence_chunking():
+    segments = [{"text": "Hello there. How are you today?", "speaker": "1", "language": "en"}]
+    with patch.object(Config, "SENTENCE_CHUNKING", True), patch.object(Config, "CHUNK_MAX_CHARS", 20):
+        plan = plan_batch([segments, segments])
+
+    assert len(plan["units"][0]) == 2
+    assert plan["unit_ids"][0] == plan["unit_ids"][1]
+    assert plan["owner"] == [0, 0]
+
+
+def test_distinct_output_paths():
+    assert distinct_output_paths(["/o/a.wav", "/o/a.wav", "/o/b.mp3", "/o/a.wav"]) == [
+        "/o/a.wav", "/o/a_2.wav", "/o/b.mp3", "/o/a_3.wav",
+    ]
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+import anyio
+import pytest
+from podcast_mcp.cancellation import CancelToken, RenderCancelled, cancel_scope
+from podcast_mcp.config import Config
+from podcast_mcp.metrics import METRICS
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool, SyncContext
+from podcast_mcp.tools.job_manager import Job, JobContext
+from podcast_mcp.tts.cost_model import CostModel
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SYNTHESIS_METHODS = ("generate_segment", "synthesize", "synthesize_batch", "synthesize_stream")
+
+SCRIPT = "filename: episode.wav\n" + "\n".join(f"<voice{1 + i % 2}>Line number {i} of the episode." for i in range(8))
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = TTSManager()
+    saved = (manager._model, manager._xtts, manager.state, manager.cache, manager.costs)
+    manager._model, manager._xtts, manager.state = None, None, "cold"
+    manager.cache = SegmentCache(cache_dir=str(tmp_path / "segments"), enabled=True)
+    manager.costs = CostModel(str(tmp_path / "costs.json"))
+    overrides = {name: manager.__dict__.pop(name) for name in list(manager.__dict__) if name in SYNTHESIS_METHODS}
+    with patch.object(Config, "TTS_BACKEND", "synthetic"), \
+            patch.object(Config, "SYNTHETIC_TTS_LATENCY_MS", 50), \
+            patch.object(Config, "MODEL_IDLE_TIMEOUT_S", 0), \
+            patch.object(Config, "OUTPUT_DIR", str(tmp_path / "out")), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch.object(Config, "TTS_WORKERS", 0), \
+            patch.object(Config, "SENTENCE_CHUNKING", False), \
+            patch.object(Config, "STREAMING_OUTPUT", False), \
+            patch.object(Config, "POST_PROCESS", False):
+        yield manager
+    manager._model, manager._xtts, manager.state, manager.cache, manager.costs = saved
+    manager.__dict__.update(overrides)
+
+
+def _cached(manager, text):
+    speaker = manager.SPEAKERS["1"]
+    return manager.cache.contains(SegmentCache.make_key(text, speaker, "en", Config.TTS_SPEED, manager.model_id))
+
+
+def test_worker_thread_stops_between_sentences(manager):
+    texts = [f"Sentence number {i} of a long line." for i in range(6)]
+    token = CancelToken()
+
+    def synthesize():
+        with cancel_scope(token):
+            manager.synthesize_batch(texts, "1", "en")
+
+    manager.load_model()
+    threading.Timer(0.08, token.cancel).start()
+    with patch.object(manager.scheduler, "max_batch", 2), pytest.raises(RenderCancelled):
+        synthesize()  # Cancelled during the second batch of two; the third is withdrawn
+    assert _cached(manager, texts[0])  # Finished sentences are kept for the next render
+    assert not _cached(manager, texts[-1])
+
+
+@pytest.mark.parametrize("mode,depth", [("file", 0), ("memory", 2)])
+def test_client_cancel_stops_render_and_removes_partial_files(manager, tmp_path, mode, depth):
+    tool = GeneratePodcastTool()
+    before = METRICS.summary().get("podcast_cancelled_work_seconds_total", 0)
+
+    async def scenario():
+        started = time.perf_counter()
+        # MCP cancels a request by cancelling the anyio scope it runs in
+        with anyio.move_on_after(0.2):
+            await tool.run_async(SCRIPT, SyncContext())
+        return time.perf_counter() - started
+
+    with patch.object(Config, "AUDIO_PIPELINE", mode), patch.object(Config, "PIPELINE_DEPTH", depth):
+        elapsed = anyio.run(scenario)
+
+    synthesized = manager.cache.stats()["entries"]
+    time.sleep(0.2)
+    assert manager.cache.stats()["entries"] == synthesized < 8  # No thread carries on in the background
+    assert elapsed < 0.2 + 0.15  # At most the segment in flight is finished
+    assert not os.path.exists(tmp_path / "out" / "episode.wav")
+    leftovers = [name for _, _, files in os.walk(tmp_path / "temp") for name in files]
+    assert leftovers == []
+    assert METRICS.summary()["podcast_cancelled_work_seconds_total"] > before
+
+
+def test_cancelled_job_reports_work_saved(manager):
+    tool = GeneratePodcastTool()
+    job = Job(SCRIPT)
+
+    async def scenario():
+        asyncio.get_running_loop().call_later(0.2, job.cancel_token.cancel, f"Job {job.id} was cancelled")
+        return await tool.run_async(SCRIPT, JobContext(job))
+
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"), patch.object(Config, "PIPELINE_DEPTH", 0):
+        result = asyncio.run(scenario())
+
+    assert result["cancelled"] and not result["success"]
+    assert result["error"] == f"Job {job.id} was cancelled"
+    assert result["saved_seconds"] > 0
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from unittest.mock import patch
+import pytest
+from podcast_mcp.config import Config
+from podcast_mcp.parser.script_parser import parse_script
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool, SyncContext
+from podcast_mcp.tools.job_manager import JobManager, QueueFull
+from podcast_mcp.tools.render_estimate import EtaContext, format_seconds
+from podcast_mcp.tts.cost_model import CostModel
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SYNTHESIS_METHODS = ("generate_segment", "synthesize", "synthesize_batch", "synthesize_stream")
+
+
+def test_rates_are_learned_per_key_and_fall_back(tmp_path):
+    costs = CostModel(str(tmp_path / "costs.json"), default_cps=10)
+    for _ in range(3):
+        costs.observe(100, 2.0, "xtts", "cpu", "en", "Ana")  # 50 chars/s
+        costs.observe(100, 10.0, "xtts", "cpu", "de", "Ana")  # 10 chars/s
+
+    assert costs.chars_per_second("xtts", "cpu", "en", "Ana") == pytest.approx(50)
+    assert costs.predict_seconds(200, "xtts", "cpu", "en", "Bob") == pytest.approx(4)  # Same language
+    assert 200 / 50 < costs.predict_seconds(200, "xtts", "cpu", "fr", "Ana") < 200 / 10  # Device-wide mix
+    assert costs.predict_seconds(200, "xtts", "cuda", "en", "Ana") == pytest.approx(20)  # Default
+
+
+def test_rates_follow_recent_performance_and_survive_restarts(tmp_path):
+    path = str(tmp_path / "costs.json")
+    costs = CostModel(path)
+    for _ in range(50):
+        costs.observe(100, 10.0, "xtts", "cpu", "en", "Ana")
+    for _ in range(20):
+        costs.observe(100, 1.0, "xtts", "cpu", "en", "Ana")  # Machine got faster
+    costs.save()
+
+    restarted = CostModel(path)
+    assert restarted.chars_per_second("xtts", "cpu", "en", "Ana") > 40  # From 10 towards 100
+    assert restarted.rates()["xtts|cpu|en|Ana"]["observations"] == 70
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = TTSManager()
+    saved = (manager._model, manager._xtts, manager.state, manager.cache, manager.costs)
+    manager._model, manager._xtts, manager.state = None, None, "cold"
+    manager.cache = SegmentCache(cache_dir=str(tmp_path / "segments"), enabled=True)
+    manager.costs = CostModel(str(tmp_path / "costs.json"))
+    overrides = {name: manager.__dict__.pop(name) for name in list(manager.__dict__) if name in SYNTHESIS_METHODS}
+    with patch.object(Config, "TTS_BACKEND", "synthetic"), \
+            patch.object(Config, "SYNTHETIC_TTS_LATENCY_MS", 20), \
+            patch.object(Config, "MODEL_IDLE_TIMEOUT_S", 0):
+        yield manager
+    manager._model, manager._xtts, manager.state, manager.cache, manager.costs = saved
+    manager.__dict__.update(overrides)
+
+
+def test_manager_learns_from_inference_but_not_cache_hits(manager):
+    text = "A sentence long enough to measure."
+    manager.synthesize(text, "1", "en")
+    voice = manager.SPEAKERS["1"]
+    cps = manager.costs.chars_per_second(manager.model_id, Config.XTTS_DEVICE, "en", voice)
+    assert cps is not None and cps < len(text) / 0.02
+
+    manager.synthesize(text, "1", "en")  # Cache hit
+    assert manager.costs.rates()[f"{manager.model_id}|{Config.XTTS_DEVICE}|en|{voice}"]["observations"] == 1
+    assert manager.predict_seconds(text, "1", "en") == 0.0
+    assert manager.predict_seconds(text + " More.", "1", "en") == pytest.approx((len(text) + 6) / cps)
+
+
+def test_estimate_and_render_share_one_parse(manager, tmp_path):
+    tool = GeneratePodcastTool()
+    script = "filename: shared.wav\n<voice1>Estimated once.\n<voice2>Parsed once."
+
+    with patch.object(Config, "OUTPUT_DIR", str(tmp_path)), patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch("podcast_mcp.tools.generate_podcast.parse_script", wraps=parse_script) as parse:
+        async def estimate_then_render():
+            prepared = await tool.prepare_async(script)
+            estimated = await tool.estimate_async(script, prepared=prepared)
+            return estimated, await tool.run_async(script, SyncContext(), prepared=prepared)
+
+        estimated, result = asyncio.run(estimate_then_render())
+
+    assert parse.call_count == 1
+    assert estimated > 0
+    assert result["success"], result.get("error")
+
+
+def test_eta_weights_progress_by_predicted_cost():
+    class Recorder:
+        def __init__(self):
+            self.messages, self.etas = [], []
+
+        async def report_progress(self, progress, total=None, message=None):
+            self.messages.append(message)
+
+        def record_eta(self, seconds):
+            self.etas.append(seconds)
+
+    async def scenario():
+        inner = Recorder()
+        ctx = EtaContext(inner, [1.0, 9.0])
+        await ctx.report_progress(0, 2)
+        await ctx.report_progress(1, 2, "1 done")
+        return inner
+
+    inner = asyncio.run(scenario())
+    assert inner.messages[0] == "0% of work, ETA 10s"
+    assert inner.messages[1].startswith("1 done, 10% of work, ETA ")
+    assert inner.etas[0] == 10.0
+    assert format_seconds(185) == "3m05s"
+
+
+class InstantTool:
+    async def run_async(self, script, ctx):
+        await asyncio.sleep(0.05)
+        return {"success": True}
+
+
+def test_job_queue_admits_by_predicted_work():
+    async def scenario():
+        manager = JobManager(InstantTool(), max_concurrent=1)
+        first = await manager.submit("a", estimated_seconds=40)
+        second = await manager.submit("b", estimated_seconds=40)
+        with pytest.raises(QueueFull):
+            await manager.submit("c", estimated_seconds=40)
+        start = manager.expected_start(second.id)
+        await manager.submit("d")  # Unknown cost is not refused
+        return first, start
+
+    with patch.object(Config, "MAX_QUEUED_WORK_S", 100):
+        first, start = asyncio.run(scenario())
+    assert start == pytest.approx(40, abs=1)
+    assert first.to_dict()["estimated_seconds"] == 40
@@ -0,0 +1,52 @@
+from contextlib import nullcontext
+from unittest.mock import patch
+import pytest
+from podcast_mcp.config import Config
+from podcast_mcp.tts import cpu_tuning
+from podcast_mcp.tts.tts_manager import TTSManager
+
+
+def test_quantized_model_gets_its_own_cache_namespace():
+    manager = TTSManager()
+    default_id = manager.model_id
+    with patch.object(Config, "CPU_PERF_MODE", True), patch.object(Config, "CPU_QUANTIZE", "int8"):
+        assert manager.model_id == default_id + ":int8"
+        with patch.object(Config, "XTTS_DEVICE", "cuda"):
+            assert manager.model_id == default_id  # CPU mode does not apply on GPU
+
+
+def test_inference_context_is_noop_when_disabled():
+    with patch.object(Config, "CPU_PERF_MODE", False):
+        assert isinstance(cpu_tuning.inference_context(), nullcontext)
+
+
+def test_int8_quantization_keeps_outputs_close():
+    torch = pytest.importorskip("torch")
+
+    class Conv1D(torch.nn.Module):
+        """Same layout as the Hugging Face GPT-2 layer: weight is (in, out)."""
+
+        def __init__(self, nf, nx):
+            super().__init__()
+            self.weight = torch.nn.Parameter(torch.randn(nx, nf) * 0.1)
+            self.bias = torch.nn.Parameter(torch.zeros(nf))
+
+        def forward(self, x):
+            return x @ self.weight + self.bias
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.gpt = torch.nn.Sequential(Conv1D(64, 32), torch.nn.ReLU(), torch.nn.Linear(64, 16))
+
+    torch.manual_seed(0)
+    model = Model()
+    x = torch.randn(8, 32)
+    expected = model.gpt(x)
+
+    with patch.object(Config, "CPU_PERF_MODE", True), patch.object(Config, "CPU_QUANTIZE", "int8"), \
+            patch.object(Config, "XTTS_DEVICE", "cpu"):
+        cpu_tuning.optimize_model(model)
+
+    assert not any(type(m).__name__ == "Conv1D" for m in model.gpt.modules())
+    assert torch.allclose(model.gpt(x), expected, atol=0.05)
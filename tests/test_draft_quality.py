@@ -0,0 +1,84 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.wav_io import read_wav
+from podcast_mcp.config import Config
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.tts.cost_model import CostModel
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SYNTHESIS_METHODS = ("generate_segment", "synthesize", "synthesize_batch", "synthesize_stream")
+
+SCRIPT = "quality: draft\nfilename: preview.wav\n<voice1>Welcome to the show.\n<voice2>Thanks for having me."
+
+
+class FakeVits:
+    """Single-language model at 22.05 kHz, like the VCTK VITS model."""
+
+    is_multi_speaker = True
+    is_multi_lingual = False
+    calls: list[dict] = []
+    loaded: list[str] = []
+
+    def __init__(self, model_name):
+        FakeVits.loaded.append(model_name)
+        self.synthesizer = type("Synthesizer", (), {"output_sample_rate": 22050})()
+
+    def to(self, device):
+        return self
+
+    def tts(self, text, **kwargs):
+        FakeVits.calls.append(kwargs)
+        return np.full(22050, 0.1, dtype=np.float32)
+
+
+@pytest.fixture
+def tool(tmp_path):
+    tool = GeneratePodcastTool()
+    manager = tool.tts
+    saved = (manager._model, manager._xtts, manager._draft, manager.state, manager.cache, manager.costs)
+    manager._model, manager._xtts, manager._draft, manager.state = None, None, None, "cold"
+    manager.cache = SegmentCache(cache_dir=str(tmp_path / "segments"), enabled=True)
+    manager.costs = CostModel(str(tmp_path / "costs.json"))
+    overrides = {name: manager.__dict__.pop(name) for name in list(manager.__dict__) if name in SYNTHESIS_METHODS}
+    FakeVits.calls, FakeVits.loaded = [], []
+    with patch("podcast_mcp.tts.tts_manager._import_tts", return_value=FakeVits), \
+            patch.object(Config, "TTS_BACKEND", "coqui"), \
+            patch.object(Config, "MODEL_IDLE_TIMEOUT_S", 0), \
+            patch.object(Config, "OUTPUT_DIR", str(tmp_path)), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch.object(Config, "TTS_WORKERS", 0), \
+            patch.object(Config, "STREAMING_OUTPUT", False), \
+            patch.object(Config, "POST_PROCESS", False):
+        yield tool
+    manager._model, manager._xtts, manager._draft, manager.state, manager.cache, manager.costs = saved
+    manager.__dict__.update(overrides)
+
+
+@pytest.mark.parametrize("mode", ["memory", "file"])
+def test_draft_render_uses_only_the_draft_model(tool, mode):
+    with patch.object(Config, "AUDIO_PIPELINE", mode):
+        result = tool.run(SCRIPT)
+
+    assert result["success"], result.get("error")
+    assert result["quality"] == "draft"
+    assert FakeVits.loaded == [Config.DRAFT_MODEL]  # The main model is never loaded
+    assert tool.tts._model is None
+    # Draft voices stand in for the configured ones; the English-only model gets no language
+    assert [call["speaker"] for call in FakeVits.calls] == [Config.DRAFT_VOICE_1, Config.DRAFT_VOICE_2]
+    assert all("language" not in call for call in FakeVits.calls)
+
+    # Resampled to the main model's rate, so drafts run through the same pipeline
+    audio, rate = read_wav(result["output_file"])
+    assert rate == tool.tts.sample_rate
+    pause = int(rate * Config.DEFAULT_PAUSE_MS / 1000)
+    assert len(audio) == 2 * rate + pause
+
+
+def test_draft_audio_is_cached_apart_from_final_audio(tool):
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"):
+        tool.run(SCRIPT)
+
+    assert tool.tts.predict_seconds("Welcome to the show.", "1", "en", "draft") == 0.0
+    assert tool.tts.predict_seconds("Welcome to the show.", "1", "en", "final") > 0
@@ -0,0 +1,241 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import numpy as np
+import pytest
+from podcast_mcp.cancellation import CancelToken, RenderCancelled, cancel_scope
+from podcast_mcp.config import Config
+from podcast_mcp.tts import synthetic_backend
+from podcast_mcp.tts.cost_model import CostModel
+from podcast_mcp.tts.inference_scheduler import InferenceRequest, InferenceScheduler
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SYNTHESIS_METHODS = ("generate_segment", "synthesize", "synthesize_batch", "synthesize_stream")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = TTSManager()
+    saved = (manager._model, manager._xtts, manager.state, manager.cache, manager.costs)
+    manager._model, manager._xtts, manager.state = None, None, "cold"
+    manager.cache = SegmentCache(cache_dir=str(tmp_path / "segments"), enabled=True)
+    manager.costs = CostModel(str(tmp_path / "costs.json"))
+    overrides = {name: manager.__dict__.pop(name) for name in list(manager.__dict__) if name in SYNTHESIS_METHODS}
+    with patch.object(Config, "TTS_BACKEND", "synthetic"), \
+            patch.object(Config, "SYNTHETIC_TTS_LATENCY_MS", 200), \
+            patch.object(Config, "MODEL_IDLE_TIMEOUT_S", 0):
+        yield manager
+    manager._model, manager._xtts, manager.state, manager.cache, manager.costs = saved
+    manager.__dict__.update(overrides)
+
+
+def test_concurrent_renders_share_batched_forward_passes(manager):
+    texts = [f"Line {i} of a render running next to others." for i in range(4)]
+    manager.load_model()
+    batches = manager.scheduler.batches
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(4) as pool:
+        waveforms = list(pool.map(lambda i: manager.synthesize(texts[i], str(1 + i % 2), "en"), range(4)))
+    elapsed = time.perf_counter() - started
+
+    # The first text goes at once, the others share the next pass: two passes instead of four
+    assert elapsed < 3 * 0.2
+    assert manager.scheduler.batches - batches <= 2
+    for i, waveform in enumerate(waveforms):
+        expected = synthetic_backend.render(texts[i], manager.SPEAKERS[str(1 + i % 2)], Config.TTS_SPEED)
+        np.testing.assert_array_equal(waveform, expected)  # Each render gets its own audio back
+
+
+def test_batch_of_one_render_shares_one_forward_pass(manager):
+    texts = [f"Sentence {i} of one speaker's turn." for i in range(4)]
+    manager.load_model()
+    batches = manager.scheduler.batches
+
+    waveforms = manager.synthesize_batch(texts + texts[:1], "1", "en")
+
+    assert manager.scheduler.batches - batches == 1
+    assert waveforms[4] is waveforms[0]
+    for text, waveform in zip(texts, waveforms):
+        np.testing.assert_array_equal(waveform, synthetic_backend.render(text, manager.SPEAKERS["1"], Config.TTS_SPEED))
+
+
+def _echo_scheduler(calls, active, seconds=0.05, **kwargs):
+    lock = threading.Lock()
+
+    def run_batch(requests):
+        with lock:
+            active.append(len(active) + 1)
+        try:
+            if any("bad" in r.text for r in requests):
+                raise ValueError("bad text")
+            time.sleep(seconds)
+            calls.append([r.text for r in requests])
+            return [np.full(len(r.text), len(r.text), dtype=np.float32) for r in requests]
+        finally:
+            with lock:
+                active.pop()
+
+    return InferenceScheduler(run_batch, **kwargs)
+
+
+def _occupy(scheduler, pool, seconds=0.1):
+    """Keep the inference thread busy so the requests submitted next queue up together."""
+    busy = pool.submit(scheduler.call, time.sleep, seconds)
+    time.sleep(0.02)
+    return busy
+
+
+def test_lone_request_does_not_wait_for_the_window():
+    calls, active = [], []
+    scheduler = _echo_scheduler(calls, active, seconds=0, window_ms=500, max_batch=8)
+
+    started = time.perf_counter()
+    for text in ("first", "second"):
+        scheduler.infer(InferenceRequest(text, "a", "en", "final"))
+
+    assert time.perf_counter() - started < 0.25
+    assert calls == [["first"], ["second"]]
+
+
+def test_renders_out_of_step_are_merged_into_one_batch():
+    calls, active = [], []
+    scheduler = _echo_scheduler(calls, active, window_ms=50, max_batch=8)
+
+    def render(name):
+        for i in range(4):
+            scheduler.infer(InferenceRequest(f"{name} line {i}", "a", "en", "final"))
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(render, "one")
+        time.sleep(0.01)  # The second render starts while the first one's text is running
+        pool.submit(render, "two").result()
+        first.result()
+
+    assert calls[0] == ["one line 0"]
+    assert all(len(batch) == 2 for batch in calls[1:-1])  # Then in step until one render ends
+    assert len(calls) <= 5
+
+
+def test_only_compatible_requests_share_a_batch_and_the_model_runs_alone():
+    calls, active, peak = [], [], []
+    scheduler = _echo_scheduler(calls, active, window_ms=50, max_batch=8, length_ratio=2.0)
+    requests = [
+        InferenceRequest("short one", "a", "en", "final"),
+        InferenceRequest("short two", "b", "en", "final"),
+        InferenceRequest("short three", "a", "de", "final"),  # Other language
+        InferenceRequest("a much longer line that would mostly be padding", "a", "en", "final"),
+        InferenceRequest("short four", "a", "en", "draft"),  # Other model
+    ]
+    watcher = threading.Thread(target=lambda: [peak.append(len(active)) or time.sleep(0.005) for _ in range(100)])
+    watcher.start()
+    with ThreadPoolExecutor(len(requests) + 1) as pool:
+        _occupy(scheduler, pool, seconds=0.3)
+        results = list(pool.map(scheduler.infer, requests))
+    watcher.join()
+
+    assert sorted(calls, key=len, reverse=True)[0] == ["short one", "short two"]
+    assert sorted(len(batch) for batch in calls) == [1, 1, 1, 2]
+    assert max(peak) <= 1
+    assert [len(r) for r in results] == [len(r.text) for r in requests]
+
+
+def test_failed_batch_is_retried_so_only_the_bad_request_fails():
+    calls, active = [], []
+    scheduler = _echo_scheduler(calls, active, window_ms=50, max_batch=8)
+    good = InferenceRequest("good text", "a", "en", "final")
+    bad = InferenceRequest("bad text!", "a", "en", "final")
+    with ThreadPoolExecutor(3) as pool:
+        _occupy(scheduler, pool)
+        good_result, bad_result = pool.submit(scheduler.infer, good), pool.submit(scheduler.infer, bad)
+        assert len(good_result.result()) == len("good text")
+        with pytest.raises(ValueError):
+            bad_result.result()
+    assert calls == [["good text"]]
+
+
+def test_cancelled_render_gives_up_its_place_in_the_queue():
+    calls, active = [], []
+    scheduler = _echo_scheduler(calls, active, seconds=0.3, window_ms=0, max_batch=1)
+    token = CancelToken()
+
+    def cancellable(text):
+        with cancel_scope(token):
+            return scheduler.infer(InferenceRequest(text, "a", "en", "final"))
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(scheduler.infer, InferenceRequest("running first", "a", "en", "final"))
+        time.sleep(0.01)
+        queued = pool.submit(cancellable, "never synthesized")
+        time.sleep(0.01)
+        token.cancel()
+        with pytest.raises(RenderCancelled):
+            queued.result()
+        first.result()
+    time.sleep(0.1)
+    assert calls == [["running first"]]  # Nothing ran for the cancelled render
+
+
+class SerialModel:
+    """Model without a batched call (like XTTS): texts can only run one at a time."""
+
+    def __init__(self, model_name):
+        self.calls: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    def to(self, device):
+        return self
+
+    def tts(self, text, language, speed, speaker=None, speaker_wav=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.calls.append(text)
+        time.sleep(0.05)
+        self.active -= 1
+        if "bad" in text:
+            raise ValueError("bad text")
+        return np.full(len(text), 0.1, dtype=np.float32)
+
+
+def test_model_without_batching_is_serialized_and_fails_only_the_bad_text(manager):
+    with patch.object(Config, "TTS_BACKEND", "coqui"), \
+            patch("podcast_mcp.tts.tts_manager._import_tts", return_value=SerialModel):
+        manager.load_model()
+        model = manager._model
+        texts = ["good line one", "good line two", "bad line!", "good line 3"]
+        batches = manager.scheduler.batches
+
+        with ThreadPoolExecutor(len(texts) + 1) as pool:
+            _occupy(manager.scheduler, pool)
+            futures = [pool.submit(manager.synthesize, text, "1", "en") for text in texts]
+            with pytest.raises(ValueError):
+                futures[2].result()
+            waveforms = [futures[i].result() for i in (0, 1, 3)]
+
+    assert model.peak == 1  # Never two texts in the model at once
+    assert manager.scheduler.batches - batches == 1  # Coalesced, then run back to back
+    assert [len(w) for w in waveforms] == [len(texts[i]) for i in (0, 1, 3)]
+    # The bad line fails on its own; nothing in the batch is synthesized twice
+    assert sorted(model.calls) == sorted(texts)
+
+
+def test_back_to_back_batch_finishes_each_text_when_it_is_done(manager):
+    with patch.object(Config, "TTS_BACKEND", "coqui"), \
+            patch("podcast_mcp.tts.tts_manager._import_tts", return_value=SerialModel):
+        manager.load_model()
+        texts = ["first of the batch", "second of the batch", "third of the batch"]
+        done: dict[str, float] = {}
+
+        def synthesize(text):
+            manager.synthesize(text, "1", "en")
+            done[text] = time.perf_counter()
+
+        with ThreadPoolExecutor(len(texts) + 1) as pool:
+            _occupy(manager.scheduler, pool)
+            list(pool.map(synthesize, texts))
+
+    first, last = sorted(done.values())[0], sorted(done.values())[-1]
+    assert last - first >= 0.08  # Callers were released one text (50 ms) apart, not all at the end
@@ -0,0 +1,95 @@
+import asyncio
+from podcast_mcp.tools.job_manager import JobManager, RenderCancelled, CANCELLED, SUCCEEDED
+
+
+class FakeTool:
+    """Renders N 'segments' (N = script length), reporting progress like run_async."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.segments_done = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def run_async(self, script, ctx):
+        self.started.append(script)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            total = len(script)
+            await ctx.report_progress(progress=0, total=total)
+            for i in range(total):
+                await asyncio.sleep(0.01)
+                self.segments_done += 1
+                await ctx.report_progress(progress=i + 1, total=total)
+            return {"success": True, "output_file": f"/tmp/{script}.wav",
+                    "processing_time_seconds": 0.1, "total_segments": total}
+        except RenderCancelled as e:
+            return {"success": False, "cancelled": True, "error": str(e)}
+        finally:
+            self.running -= 1
+
+
+async def _until_running(job):
+    while job.status != "running":
+        await asyncio.sleep(0.001)
+
+
+async def _wait(manager, job_ids, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while any(manager.get(j).finished_at is None for j in job_ids):
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+def test_priority_order_and_concurrency_bound():
+    async def scenario():
+        tool = FakeTool()
+        manager = JobManager(tool, max_concurrent=1)
+        first = await manager.submit("aaa")
+        await _until_running(first)
+        low = await manager.submit("low", priority=0)
+        high = await manager.submit("high", priority=5)
+        await _wait(manager, [first.id, low.id, high.id])
+        return tool, manager, [first, low, high]
+
+    tool, manager, jobs = asyncio.run(scenario())
+    assert tool.started == ["aaa", "high", "low"]
+    assert tool.max_running == 1
+    assert all(job.status == SUCCEEDED for job in jobs)
+    assert jobs[0].result["output_file"] == "/tmp/aaa.wav"
+
+
+def test_cancel_running_job_stops_between_segments():
+    async def scenario():
+        tool = FakeTool()
+        manager = JobManager(tool, max_concurrent=1)
+        job = await manager.submit("x" * 100)
+        while job.progress < 3:
+            await asyncio.sleep(0.005)
+        assert manager.cancel(job.id)
+        await _wait(manager, [job.id])
+        return tool, job
+
+    tool, job = asyncio.run(scenario())
+    assert job.status == CANCELLED
+    assert tool.segments_done < 10
+
+
+def test_cancel_queued_job_never_starts():
+    async def scenario():
+        tool = FakeTool()
+        manager = JobManager(tool, max_concurrent=1)
+        running = await manager.submit("abc")
+        await _until_running(running)
+        queued = await manager.submit("never")
+        assert manager.queue_position(queued.id) == 1
+        assert manager.cancel(queued.id)
+        await _wait(manager, [running.id])
+        await asyncio.sleep(0.02)
+        return tool, manager, queued
+
+    tool, manager, queued = asyncio.run(scenario())
+    assert "never" not in tool.started
+    assert queued.status == CANCELLED
+    assert not manager.cancel(queued.id)
@@ -0,0 +1,88 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+import numpy as np
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.audio.audio_combiner import combine_waveforms
+from podcast_mcp.audio.wav_io import read_wav, write_wav
+from podcast_mcp.config import Config
+
+
+class TestMemoryPipeline(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_wav_roundtrip(self):
+        waveform = np.sin(np.linspace(0, 100, 2400)).astype(np.float32) * 0.5
+        path = write_wav(os.path.join(self.test_dir, "a.wav"), waveform, 24000)
+
+        loaded, sample_rate = read_wav(path)
+
+        self.assertEqual(sample_rate, 24000)
+        self.assertEqual(len(loaded), len(waveform))
+        self.assertLess(np.max(np.abs(loaded - waveform)), 1e-3)
+
+    def test_combine_waveforms_inserts_pauses(self):
+        segments = [np.full(1000, 0.5, dtype=np.float32), np.full(500, -0.5, dtype=np.float32)]
+        output = os.path.join(self.test_dir, "out", "combined.wav")
+
+        combine_waveforms(segments, 10000, 100, output)
+
+        combined, _ = read_wav(output)
+        self.assertEqual(len(combined), 1000 + 1000 + 500)
+        self.assertTrue(np.all(combined[1000:2000] == 0))
+
+    def test_combine_waveforms_empty(self):
+        with self.assertRaises(ValueError):
+            combine_waveforms([], 24000, 100, os.path.join(self.test_dir, "x.wav"))
+
+    def test_run_flow_in_memory(self):
+        tool = GeneratePodcastTool()
+        tool.tts.synthesize = MagicMock(return_value=np.zeros(240, dtype=np.float32))
+        tool.tts.generate_segment = MagicMock()
+
+        script = """
+        filename: memory_test.wav
+        <voice1>Hello
+        <voice2>World
+        """
+        with patch.object(Config, "AUDIO_PIPELINE", "memory"), \
+                patch.object(Config, "OUTPUT_DIR", self.test_dir), \
+                patch.object(Config, "TEMP_DIR", self.test_dir):
+            result = tool.run(script)
+
+        self.assertTrue(result["success"], f"Failed: {result.get('error')}")
+        self.assertEqual(tool.tts.synthesize.call_count, 2)
+        tool.tts.generate_segment.assert_not_called()
+        self.assertEqual(os.listdir(self.test_dir), ["memory_test.wav"])
+
+    def test_run_flow_sentence_chunking(self):
+        tool = GeneratePodcastTool()
+        tool.tts.synthesize_batch = MagicMock(
+            side_effect=lambda texts, speaker, lang, quality="final": [np.ones(100, dtype=np.float32) for _ in texts]
+        )
+
+        script = """
+        filename: chunked.wav
+        <voice1>First sentence here. Second sentence there.
+        <voice2>A reply from the guest.
+        """
+        with patch.object(Config, "SENTENCE_CHUNKING", True), \
+                patch.object(Config, "OUTPUT_DIR", self.test_dir), \
+                patch.object(Config, "TEMP_DIR", self.test_dir):
+            result = tool.run(script)
+
+        self.assertTrue(result["success"], f"Failed: {result.get('error')}")
+        self.assertEqual(tool.tts.synthesize_batch.call_count, 2)  # One batch per speaker
+        combined, _ = read_wav(os.path.join(self.test_dir, "chunked.wav"))
+        pause = int(tool.tts.sample_rate * Config.DEFAULT_PAUSE_MS / 1000)
+        self.assertEqual(len(combined), 300 + pause)
+
+
+if __name__ == '__main__':
+    unittest.main()
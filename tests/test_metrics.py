@@ -0,0 +1,76 @@
+import time
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+from podcast_mcp.config import Config
+from podcast_mcp.metrics import METRICS, MetricsRegistry, stage, track_render
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+
+
+def test_histogram_prometheus_text():
+    registry = MetricsRegistry()
+    for value in (0.002, 0.02, 3.0):
+        registry.observe("stage_seconds", value, {"stage": "parse"})
+    registry.inc("renders_total", labels={"outcome": "success"})
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="parse",le="0.005"} 1' in text
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="parse"} 3' in text
+    assert 'renders_total{outcome="success"} 1' in text
+    assert text.count("# TYPE stage_seconds_recent gauge") == 1
+    assert 'stage_seconds_recent{stage="parse",quantile="0.5"} 0.02' in text
+    assert registry.summary()["stage_seconds_parse_p50"] == 0.02
+
+
+def test_rolling_window_forgets_old_observations():
+    registry = MetricsRegistry()
+    with patch.object(Config, "METRICS_WINDOW", 3):
+        for value in (10.0, 10.0, 10.0, 1.0, 1.0, 1.0):
+            registry.observe("latency", value)
+
+    summary = registry.summary()
+    assert summary["latency_count"] == 6
+    assert summary["latency_p99"] == 1.0
+
+
+def test_nested_stages_are_exclusive():
+    with track_render() as render:
+        with stage("synthesize"):
+            with stage("load_model"):
+                time.sleep(0.02)
+            time.sleep(0.01)
+
+    assert render.stages["load_model"] >= 0.02
+    assert render.stages["synthesize"] < 0.02
+
+
+@pytest.fixture
+def tool(tmp_path):
+    tool = GeneratePodcastTool()
+    tool.tts.synthesize = MagicMock(return_value=np.zeros(tool.tts.sample_rate, dtype=np.float32))
+    # The fake segments are pure silence, which post-processing would trim away
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"), \
+            patch.object(Config, "POST_PROCESS", False), \
+            patch.object(Config, "OUTPUT_DIR", str(tmp_path)), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path)):
+        yield tool
+
+
+def test_run_reports_stage_timings_and_rtf(tool):
+    METRICS.reset()
+    result = tool.run("<voice1>Hello there\n<voice2>General Kenobi")
+
+    assert result["success"], result.get("error")
+    metrics = result["metrics"]
+    assert {"parse_seconds", "synthesize_seconds", "combine_seconds"} <= set(metrics)
+    pause = Config.DEFAULT_PAUSE_MS / 1000
+    assert metrics["audio_seconds"] == pytest.approx(2 + pause, abs=0.01)
+    assert metrics["real_time_factor"] >= 0
+    assert "chars_per_second" in metrics
+
+    text = METRICS.render_prometheus()
+    assert 'podcast_renders_total{outcome="success"} 1' in text
+    assert "podcast_segment_seconds_count 2" in text
@@ -15,6 +15,7 @@ class TestPipeline(unittest.TestCase):
     def setUp(self):
         pass
 
+    @patch.object(Config, 'PIPELINE_DEPTH', 0)  # Combine after synthesis
     @patch('podcast_mcp.tools.generate_podcast.combine_segments')
     def test_run_flow(self, mock_combine):
         tool = GeneratePodcastTool()
@@ -0,0 +1,130 @@
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+from podcast_mcp.config import Config
+from podcast_mcp.tts import model_memory
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SYNTHESIS_METHODS = ("generate_segment", "synthesize", "synthesize_batch", "synthesize_stream")
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, model_name):
+        FakeModel.loads += 1
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def to(self, device):
+        return self
+
+    def tts(self, text, language, speed, speaker=None, speaker_wav=None):
+        self.started.set()
+        self.release.wait(5)
+        return [0.0] * 100
+
+
+@pytest.fixture
+def manager():
+    manager = TTSManager()
+    saved = (manager._model, manager._xtts, manager.state, manager.cache, manager.evictions)
+    manager._model, manager._xtts, manager.state, manager._offloaded = None, None, "cold", None
+    manager.cache = SegmentCache(enabled=False)
+    # Other tests replace synthesis methods on the shared instance; use the real ones here
+    overrides = {name: manager.__dict__.pop(name) for name in list(manager.__dict__) if name in SYNTHESIS_METHODS}
+    FakeModel.loads = 0
+    with patch("podcast_mcp.tts.tts_manager._import_tts", return_value=FakeModel), \
+            patch.object(Config, "MODEL_IDLE_TIMEOUT_S", 0):
+        yield manager
+    manager._model, manager._xtts, manager.state, manager.cache, manager.evictions = saved
+    manager._offloaded = None
+    manager.__dict__.update(overrides)
+
+
+def test_idle_model_is_evicted_and_reloaded_on_demand(manager):
+    manager.synthesize("Hello", "1", "en")
+    assert not manager.evict_if_idle(timeout=3600)
+
+    assert manager.evict_if_idle(timeout=0)
+    assert manager.state == "evicted"
+    assert manager._model is None
+    assert manager.memory_stats()["model_evictions"] == manager.evictions >= 1
+
+    manager.synthesize("Hello again", "1", "en")
+    assert manager.state == "ready"
+    assert FakeModel.loads == 2
+
+
+def test_model_in_use_is_not_evicted(manager):
+    manager.load_model()
+    manager._model.release.clear()
+    worker = threading.Thread(target=manager.synthesize, args=("Busy", "1", "en"))
+    worker.start()
+    assert manager._model.started.wait(5)
+
+    assert not manager.evict_if_idle(timeout=0)
+    assert manager.memory_stats()["model_in_use"] == 1
+
+    manager._model.release.set()
+    worker.join(5)
+    assert manager.evict_if_idle(timeout=0)
+
+
+def test_open_stream_keeps_model_loaded(manager):
+    stream = manager.synthesize_stream("Streaming", "1", "en")
+    next(stream)
+    assert not manager.evict_if_idle(timeout=0)
+    stream.close()
+    assert manager.evict_if_idle(timeout=0)
+
+
+def test_offloaded_weights_are_mapped_back(tmp_path):
+    torch = pytest.importorskip("torch")
+    module = torch.nn.Sequential(torch.nn.Linear(4, 3), torch.nn.BatchNorm1d(3))
+    model = SimpleNamespace(synthesizer=SimpleNamespace(tts_model=module))
+    expected = {name: t.clone() for name, t in module.state_dict().items()}
+    cache_path = str(tmp_path / "weights.pt")
+
+    assert model_memory.offload(model, cache_path)
+    assert model_memory.model_nbytes(model) == 0
+
+    assert model_memory.restore(model, cache_path, "cpu")
+    assert not os.path.exists(cache_path)  # Mapped; the next eviction writes current weights
+    for name, tensor in module.state_dict().items():
+        assert torch.equal(tensor, expected[name])
+    assert model_memory.model_nbytes(model) > 0
+    module(torch.ones(2, 4))  # Usable again
+
+
+def test_restore_without_cache_falls_back(tmp_path):
+    model = SimpleNamespace(synthesizer=SimpleNamespace(tts_model=None))
+    assert not model_memory.restore(model, str(tmp_path / "missing.pt"), "cpu")
+    assert model_memory.describe(None)["model_memory_mb"] == 0.0
+    assert model_memory.process_rss_bytes() > 0
+
+
+def test_weights_file_follows_model_files_and_stale_ones_are_purged(tmp_path):
+    model_dir = tmp_path / "xtts"
+    model_dir.mkdir()
+    (model_dir / "model.pth").write_bytes(b"v1")
+    model = SimpleNamespace(synthesizer=SimpleNamespace(model_dir=str(model_dir)))
+    weights_dir = tmp_path / "weights"
+
+    with patch.object(Config, "MODEL_WEIGHTS_CACHE_DIR", str(weights_dir)):
+        before = model_memory.weights_cache_path("xtts", model)
+        os.utime(model_dir / "model.pth", ns=(1, 1))
+        after = model_memory.weights_cache_path("xtts", model)
+        assert before != after
+        assert f".{os.getpid()}." in os.path.basename(after)
+
+        weights_dir.mkdir()
+        open(after, "w").close()  # Offloaded by this process
+        (weights_dir / "old.999999999.pt").touch()  # Left by a process that exited
+        (weights_dir / "legacy.pt").touch()
+        assert model_memory.purge_weights_cache() == 2
+        assert os.listdir(weights_dir) == [os.path.basename(after)]
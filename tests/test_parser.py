@@ -1,5 +1,6 @@
 import pytest
-from podcast_mcp.parser.script_parser import parse_script
+import io
+from podcast_mcp.parser.script_parser import MAX_SCRIPT_LENGTH, ScriptReader, parse_script
 
 def test_parse_simple_dialogue():
     script = """
@@ -66,3 +67,52 @@ def test_parse_with_closing_tags():
     for segment in result["dialogue"]:
         assert "</voice" not in segment["text"]
 
+
+def test_header_is_only_read_before_first_tag():
+    script = """
+    language: de
+    filename: episode
+    <voice1>Our topic: language: fr is not a header here.
+    <voice2>filename: neither is this.
+    """
+
+    result = parse_script(script)
+
+    assert result["language"] == "de"
+    assert result["output"]["file"] == "episode.wav"
+    assert result["dialogue"][0]["text"] == "Our topic: language: fr is not a header here."
+    assert result["dialogue"][1]["text"] == "filename: neither is this."
+
+def test_reader_handles_tags_split_across_chunks():
+    script = "language: en\n" + "".join(f"<voice{i % 3 + 1}>Line number {i}.</voice{i % 3 + 1}>\n" for i in range(50))
+
+    for chunk_size in (1, 3, 7, 64):
+        segments = list(ScriptReader(io.StringIO(script), chunk_size=chunk_size))
+        assert len(segments) == 50
+        assert segments[49] == {"speaker": "2", "text": "Line number 49."}
+
+def test_reader_streams_from_file_without_length_limit(tmp_path):
+    path = tmp_path / "audiobook.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("language: en\n")
+        for i in range(20000):
+            f.write(f"<voice{i % 2 + 1}>This is sentence {i} of a very long transcript.\n")
+    assert path.stat().st_size > MAX_SCRIPT_LENGTH
+
+    with ScriptReader.from_file(str(path)) as reader:
+        first = next(iter(reader))
+        assert first == {"speaker": "1", "text": "This is sentence 0 of a very long transcript."}
+        assert sum(1 for _ in reader) == 19999
+
+def test_text_after_closing_tag_is_ignored():
+    result = parse_script("<voice1>Hello</voice1> stray words <voice2>Hi")
+
+    assert [d["text"] for d in result["dialogue"]] == ["Hello", "Hi"]
+
+def test_parse_quality_header():
+    script = "quality: Draft\n<voice1>Hello"
+    assert parse_script(script)["quality"] == "draft"
+    assert parse_script("<voice1>Hello")["quality"] == "final"
+
+    with pytest.raises(ValueError, match="Unsupported quality"):
+        parse_script("quality: ultra\n<voice1>Hello")
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.audio_combiner import combine_segments, combine_waveforms
+from podcast_mcp.audio.post_process import PEAK_CEILING, PostProcessor, analyze, resample
+from podcast_mcp.audio.wav_io import read_wav, write_wav
+from podcast_mcp.config import Config
+
+RATE = 10000
+
+
+def _tone(seconds: float, amplitude: float, freq: float = 440.0, rate: int = RATE) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _rms(waveform: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(waveform.astype(np.float64) ** 2)))
+
+
+def test_analyze_trims_edge_silence_with_padding():
+    waveform = np.concatenate([np.zeros(3000), _tone(0.5, 0.5), np.zeros(2000)]).astype(np.float32)
+
+    analysis = analyze(waveform, RATE, -50, pad_ms=10)
+
+    assert analysis.start == pytest.approx(3000 - 100, abs=2)
+    assert analysis.end == pytest.approx(8000 + 100, abs=2)
+    assert analysis.peak == pytest.approx(0.5, abs=1e-3)
+    assert analyze(np.zeros(100, dtype=np.float32), RATE, -50).end == 0
+
+
+def test_speakers_are_matched_and_peaks_stay_below_ceiling():
+    quiet, loud = _tone(1, 0.05), _tone(1, 0.8)
+    post = PostProcessor(["a", "b", "a"], trim_db=-50, loudness_dbfs=-20, crossfade_ms=0)
+    for waveform in (quiet, loud, quiet):
+        post.add(waveform, RATE)
+
+    outputs = [post.process(i, w, RATE) for i, w in enumerate((quiet, loud, quiet))]
+
+    target = 10 ** (-20 / 20)
+    assert all(_rms(w) == pytest.approx(target, rel=0.02) for w in outputs)
+    assert post.speaker_gain("a") == pytest.approx(target / _rms(quiet), rel=0.02)
+
+    spiky = PostProcessor(["a"], loudness_dbfs=-3, crossfade_ms=0)
+    spiky.add(loud, RATE)
+    assert np.max(np.abs(spiky.process(0, loud, RATE))) <= PEAK_CEILING + 1e-6
+
+
+def test_zero_pause_overlaps_segments_into_a_crossfade():
+    segments = [np.full(1000, 0.3, dtype=np.float32), np.full(1000, 0.3, dtype=np.float32)]
+    post = PostProcessor(["a", "a"], trim_db=0, loudness_dbfs=0, crossfade_ms=10)
+    for waveform in segments:
+        post.add(waveform, RATE)
+
+    pieces = list(post.render(segments, RATE, pause_ms=0))
+
+    joined = np.concatenate(pieces)
+    assert len(joined) == 2000 - 100
+    # Equal-gain fades: the level holds steady across the join
+    assert np.allclose(joined[100:-100], 0.3, atol=1e-5)
+    assert joined[0] == 0.0 and joined[-1] == 0.0
+
+
+def test_crossfade_overlap_is_clamped_to_short_segments():
+    segments = [np.full(1000, 0.3, dtype=np.float32), np.full(30, 0.3, dtype=np.float32), np.zeros(0, dtype=np.float32),
+                np.full(1000, 0.3, dtype=np.float32)]
+    post = PostProcessor(["a"] * 4, trim_db=0, loudness_dbfs=0, crossfade_ms=10)
+    for waveform in segments:
+        post.add(waveform, RATE)
+
+    pieces = list(post.render(segments, RATE, pause_ms=0))
+
+    assert [len(p) for p in pieces] == [1000 - 15, 30, 0, 1000]
+
+
+def test_noop_settings_keep_the_byte_copy_path():
+    with patch.object(Config, "POST_PROCESS", True), patch.object(Config, "TRIM_SILENCE_DB", 0), \
+            patch.object(Config, "LOUDNESS_TARGET_DBFS", 0), patch.object(Config, "CROSSFADE_MS", 0), \
+            patch.object(Config, "RESAMPLE_OUTPUT", False):
+        assert PostProcessor.from_config(["a"]) is None
+        with patch.object(Config, "CROSSFADE_MS", 10):
+            assert PostProcessor.from_config(["a"]) is not None
+
+
+def test_resample_keeps_pitch_and_duration():
+    tone = _tone(1, 0.5, freq=1000, rate=24000)
+
+    out = resample(tone, 24000, 16000, gain=0.5)
+
+    assert len(out) == 16000
+    assert np.argmax(np.abs(np.fft.rfft(out))) == 1000
+    assert _rms(out) == pytest.approx(_rms(tone) * 0.5, rel=0.01)
+
+
+def test_file_and_memory_combine_match(tmp_path):
+    waveforms = [np.concatenate([np.zeros(500), _tone(0.3, a)]).astype(np.float32) for a in (0.1, 0.6, 0.2)]
+    speakers = ["a", "b", "a"]
+    paths = [write_wav(str(tmp_path / f"seg{i}.wav"), w, RATE) for i, w in enumerate(waveforms)]
+
+    combine_waveforms(waveforms, RATE, 100, str(tmp_path / "memory.wav"), post=PostProcessor(speakers))
+    combine_segments(paths, 100, str(tmp_path / "file.wav"), post=PostProcessor(speakers))
+
+    from_memory, _ = read_wav(str(tmp_path / "memory.wav"))
+    from_files, _ = read_wav(str(tmp_path / "file.wav"))
+    assert len(from_memory) == len(from_files) < sum(len(w) for w in waveforms) + 2 * 1000
+    assert np.max(np.abs(from_memory - from_files)) < 1e-3
+
+
+def test_resampled_output_rate(tmp_path):
+    output = str(tmp_path / "out.wav")
+    combine_waveforms([_tone(0.5, 0.3, rate=24000)], 24000, 0, output, post=PostProcessor(["a"], output_rate=16000))
+
+    waveform, sample_rate = read_wav(output)
+    assert sample_rate == 16000
+    assert len(waveform) == pytest.approx(8000, abs=2)
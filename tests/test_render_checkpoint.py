@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.wav_io import read_wav, write_wav
+from podcast_mcp.config import Config
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.tools.render_checkpoint import RenderCheckpoint, list_checkpoints, prune_checkpoints
+from podcast_mcp.tts.worker_pool import TTSWorkerPool
+
+SCRIPT = """
+filename: resumable.wav
+<voice1>One
+<voice2>Two
+<voice1>Three
+"""
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    with patch.object(Config, "OUTPUT_DIR", str(tmp_path / "out")), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch.object(Config, "RENDER_CHECKPOINT_DIR", ""), \
+            patch.object(Config, "AUDIO_PIPELINE", "file"), \
+            patch.object(Config, "SEGMENT_RETRIES", 1):
+        yield tmp_path
+
+
+def _fake_tts(failing: set[str], calls: list[str]):
+    def generate_segment(text, speaker, language, path, quality="final"):
+        calls.append(text)
+        if text in failing:
+            raise RuntimeError(f"cannot say {text}")
+        return write_wav(path, np.full(100, 0.1, dtype=np.float32), 1000)
+    return MagicMock(side_effect=generate_segment)
+
+
+def test_failed_segment_is_retried_alone_and_resumed(dirs):
+    tool = GeneratePodcastTool()
+    calls: list[str] = []
+    tool.tts.generate_segment = _fake_tts({"Two"}, calls)
+
+    result = tool.run(SCRIPT)
+
+    assert not result["success"]
+    assert result["failed_segments"] == "2"
+    assert calls == ["One", "Two", "Two", "Three"]  # One retry, the rest carried on
+    checkpoint = RenderCheckpoint.load(result["render_id"])
+    assert checkpoint.pending() == [1]
+
+    calls.clear()
+    tool.tts.generate_segment = _fake_tts(set(), calls)
+    resumed = tool.resume(result["render_id"])
+
+    assert resumed["success"], resumed.get("error")
+    assert calls == ["Two"]
+    waveform, _ = read_wav(resumed["output_file"])
+    pause = int(1000 * Config.DEFAULT_PAUSE_MS / 1000)
+    assert len(waveform) == 300 + 2 * pause
+    assert list_checkpoints() == []
+
+
+def test_worker_pool_failure_keeps_the_other_segments(dirs):
+    tool = GeneratePodcastTool()
+    tool._pool = TTSWorkerPool(workers=2, executor=ThreadPoolExecutor(2))
+    calls: list[str] = []
+    worker = MagicMock(generate_segment=_fake_tts({"Two"}, calls))
+
+    with patch.object(Config, "TTS_WORKERS", 2), \
+            patch("podcast_mcp.tts.worker_pool._manager", return_value=worker):
+        result = tool.run(SCRIPT)
+    tool._pool.shutdown()
+
+    assert not result["success"]
+    assert result["failed_segments"] == "2"
+    assert sorted(calls) == ["One", "Three", "Two", "Two"]  # One retry, the rest carried on
+    assert RenderCheckpoint.load(result["render_id"]).pending() == [1]
+
+
+def test_unresumable_modes_say_so(dirs):
+    tool = GeneratePodcastTool()
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"), \
+            patch.object(tool.tts, "synthesize", side_effect=RuntimeError("model crashed")):
+        result = tool.run(SCRIPT)
+
+    assert not result["success"]
+    assert "render_id" not in result
+    assert "cannot be resumed" in result["error"]
+    assert list_checkpoints() == []
+
+
+def test_done_segment_with_missing_file_is_redone(dirs):
+    segments = [{"text": t, "speaker": "1", "language": "en"} for t in ("a", "b")]
+    checkpoint = RenderCheckpoint.create("abc", segments, {"output_file": "x.wav"})
+    write_wav(checkpoint.segment_path(0), np.zeros(10, dtype=np.float32), 1000)
+    checkpoint.mark_done(0)
+    checkpoint.mark_done(1)  # Marked, but its file never made it to disk
+
+    assert RenderCheckpoint.load("abc").pending() == [1]
+
+
+def test_resume_rejects_changed_voice_settings(dirs):
+    tool = GeneratePodcastTool()
+    tool.tts.generate_segment = _fake_tts({"Three"}, [])
+    with patch.object(Config, "SEGMENT_RETRIES", 0):
+        result = tool.run(SCRIPT)
+
+    with patch.object(Config, "TTS_SPEED", Config.TTS_SPEED + 0.5):
+        with pytest.raises(ValueError, match="speed"):
+            tool._load_checkpoint(result["render_id"])
+
+
+def test_prune_removes_stale_checkpoints(dirs):
+    RenderCheckpoint.create("old", [], {})
+    assert prune_checkpoints(max_age_hours=1) == 0
+    assert prune_checkpoints(max_age_hours=-1) == 1
+    assert not os.path.exists(os.path.join(str(dirs), "temp", "renders", "old"))
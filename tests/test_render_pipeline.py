@@ -0,0 +1,122 @@
+import asyncio
+import time
+from unittest.mock import patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.wav_io import read_wav
+from podcast_mcp.config import Config
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.tools.render_pipeline import SegmentPipeline
+
+SCRIPT = "filename: episode.wav\n" + "\n".join(f"<voice{1 + i % 2}>Line number {i}." for i in range(4))
+
+
+def test_producer_waits_for_a_free_slot():
+    pending, peak = [0], [0]
+
+    def consume(items):
+        seen = []
+        for item in items:
+            time.sleep(0.01)
+            seen.append(item)
+            pending[0] -= 1
+        return seen
+
+    async def scenario():
+        pipeline = SegmentPipeline(consume, depth=2)
+        for i in range(6):
+            await pipeline.put(i)
+            pending[0] += 1
+            peak[0] = max(peak[0], pending[0])
+        return await pipeline.close()
+
+    assert asyncio.run(scenario()) == list(range(6))
+    assert peak[0] <= 3  # depth queued plus the one just handed over
+
+
+def test_synthesis_and_combining_overlap():
+    def consume(items):
+        for _ in items:
+            time.sleep(0.05)
+
+    async def scenario():
+        pipeline = SegmentPipeline(consume, depth=2)
+        started = time.perf_counter()
+        for i in range(6):
+            await asyncio.sleep(0.05)  # "Synthesis"
+            await pipeline.put(i)
+        await pipeline.close()
+        return time.perf_counter() - started
+
+    # Serial would take 0.6s; pipelined the combining hides behind synthesis
+    assert asyncio.run(scenario()) < 0.5
+
+
+def test_consumer_error_reaches_the_producer():
+    def consume(items):
+        for item in items:
+            raise ValueError("encoder died")
+
+    async def scenario():
+        pipeline = SegmentPipeline(consume, depth=1)
+        with pytest.raises(ValueError, match="encoder died"):
+            for i in range(5):
+                await pipeline.put(i)
+            await pipeline.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def tool(tmp_path):
+    tool = GeneratePodcastTool()
+    rng = np.random.default_rng(0)
+    audio = {f"Line number {i}.": (rng.standard_normal(2400) * 0.1).astype(np.float32) for i in range(4)}
+
+    def synthesize(text, speaker, language, quality="final"):
+        return audio[text]
+
+    def generate_segment(text, speaker, language, path, quality="final"):
+        from podcast_mcp.audio.wav_io import write_wav
+        write_wav(path, audio[text], tool.tts.sample_rate)
+        return path
+
+    with patch.object(tool.tts, "synthesize", side_effect=synthesize), \
+            patch.object(tool.tts, "generate_segment", side_effect=generate_segment), \
+            patch.object(Config, "OUTPUT_DIR", str(tmp_path)), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path / "temp")), \
+            patch.object(Config, "TTS_WORKERS", 0), \
+            patch.object(Config, "SENTENCE_CHUNKING", False), \
+            patch.object(Config, "STREAMING_OUTPUT", False), \
+            patch.object(Config, "POST_PROCESS", False):
+        yield tool
+
+
+@pytest.mark.parametrize("mode", ["memory", "file"])
+def test_pipelined_render_matches_combining_at_the_end(tool, tmp_path, mode):
+    outputs = []
+    for depth in (0, 2):
+        with patch.object(Config, "AUDIO_PIPELINE", mode), patch.object(Config, "PIPELINE_DEPTH", depth):
+            result = tool.run(SCRIPT)
+        assert result["success"], result.get("error")
+        outputs.append(read_wav(result["output_file"]))
+
+    (serial, rate), (pipelined, pipelined_rate) = outputs
+    assert pipelined_rate == rate
+    assert np.array_equal(serial, pipelined)
+    assert len(pipelined) == 4 * 2400 + 3 * int(rate * Config.DEFAULT_PAUSE_MS / 1000)
+
+
+def test_failed_render_leaves_no_partial_output(tool, tmp_path):
+    def synthesize(text, speaker, language, quality="final"):
+        if text == "Line number 2.":
+            raise RuntimeError("model error")
+        return np.full(2400, 0.1, dtype=np.float32)
+
+    tool.tts.synthesize.side_effect = synthesize
+    with patch.object(Config, "AUDIO_PIPELINE", "memory"), patch.object(Config, "PIPELINE_DEPTH", 2):
+        result = tool.run(SCRIPT)
+
+    assert not result["success"]
+    assert "model error" in result["error"]
+    assert not (tmp_path / "episode.wav").exists()
@@ -0,0 +1,187 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from podcast_mcp.tools.job_manager import CANCELLED, SUCCEEDED, JobManager
+from podcast_mcp.tools.render_scheduler import RenderScheduler, ServerDraining
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+async def _render(scheduler, client, name, order, release, priority=0):
+    async with scheduler.slot(client, priority):
+        order.append(name)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_clients_take_turns():
+    async def scenario():
+        scheduler = RenderScheduler(capacity=1, per_client=0)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_render(scheduler, "a", f"a{i}", order, release)) for i in range(3)]
+        await _settle()
+        tasks.append(asyncio.create_task(_render(scheduler, "b", "b0", order, release)))
+        await _settle()
+        assert scheduler.stats() == {"renders_active": 1, "renders_waiting": 3, "clients_active": 2}
+        release.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["a0", "b0", "a1", "a2"]
+
+
+def test_per_client_limit_and_priority():
+    async def scenario():
+        scheduler = RenderScheduler(capacity=2, per_client=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_render(scheduler, "a", "a-low", order, release)),
+            asyncio.create_task(_render(scheduler, "a", "a-mid", order, release, priority=1)),
+            asyncio.create_task(_render(scheduler, "a", "a-high", order, release, priority=5)),
+        ]
+        await _settle()
+        running_a = list(order)
+        tasks.append(asyncio.create_task(_render(scheduler, "b", "b0", order, release)))
+        await _settle()
+        running_both = list(order)
+        release.set()
+        await asyncio.gather(*tasks)
+        return running_a, running_both, order
+
+    running_a, running_both, order = asyncio.run(scenario())
+    assert running_a == ["a-low"]  # The second slot stays free for other clients
+    assert running_both == ["a-low", "b0"]
+    assert order[2:] == ["a-high", "a-mid"]
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def scenario():
+        scheduler = RenderScheduler(capacity=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        first = asyncio.create_task(_render(scheduler, "a", "first", order, release))
+        waiter = asyncio.create_task(_render(scheduler, "b", "never", order, release))
+        await _settle()
+        waiter.cancel()
+        await _settle()
+        assert scheduler.waiting == 0
+        release.set()
+        await first
+        return scheduler, order
+
+    scheduler, order = asyncio.run(scenario())
+    assert order == ["first"]
+    assert scheduler.active == 0
+
+
+def test_drain_refuses_new_renders_and_waits_for_running():
+    async def scenario():
+        scheduler = RenderScheduler(capacity=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        running = asyncio.create_task(_render(scheduler, "a", "running", order, release))
+        queued = asyncio.create_task(_render(scheduler, "b", "queued", order, release))
+        await _settle()
+
+        assert not await scheduler.drain(timeout=0.05)
+        with pytest.raises(ServerDraining):
+            scheduler.admit()
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        assert await scheduler.drain(timeout=5)
+        await asyncio.gather(running, queued)
+        return order
+
+    assert asyncio.run(scenario()) == ["running", "queued"]
+
+
+class SlowTool:
+    def __init__(self):
+        self.started: list[str] = []
+
+    async def run_async(self, script, ctx):
+        self.started.append(script)
+        await ctx.report_progress(progress=0, total=1)
+        await asyncio.sleep(0.02)
+        return {"success": True, "output_file": f"/tmp/{script}.wav"}
+
+
+def test_job_manager_uses_scheduler():
+    async def scenario():
+        tool = SlowTool()
+        manager = JobManager(tool, scheduler=RenderScheduler(capacity=1))
+        jobs = [await manager.submit(f"a{i}", client_id="a") for i in range(2)]
+        jobs.append(await manager.submit("b0", client_id="b"))
+        cancelled = await manager.submit("a-cancelled", client_id="a")
+        manager.cancel(cancelled.id)
+        assert await manager.join(timeout=5)
+        return tool, jobs, cancelled
+
+    tool, jobs, cancelled = asyncio.run(scenario())
+    assert tool.started == ["a0", "b0", "a1"]
+    assert all(job.status == SUCCEEDED for job in jobs)
+    assert cancelled.status == CANCELLED
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_http_transport_serves_clients_and_drains(tmp_path):
+    pytest.importorskip("uvicorn")
+    from mcp import ClientSession
+    try:
+        from mcp.client.streamable_http import streamable_http_client as connect
+    except ImportError:  # mcp < 1.24
+        from mcp.client.streamable_http import streamablehttp_client as connect
+
+    port = _free_port()
+    env = dict(
+        os.environ, PYTHONPATH=SRC_DIR, MCP_TRANSPORT="streamable-http", MCP_PORT=str(port),
+        TTS_BACKEND="synthetic", OUTPUT_DIR=str(tmp_path), TEMP_DIR=str(tmp_path / "temp"),
+        CACHE_DIR=str(tmp_path / "cache"), MCP_LOG_LEVEL="WARNING",
+    )
+    server = subprocess.Popen([sys.executable, "-m", "podcast_mcp.server"], env=env)
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                assert server.poll() is None and time.monotonic() < deadline, "server did not start"
+                time.sleep(0.1)
+
+        async def client(name: str) -> str:
+            async with connect(f"http://127.0.0.1:{port}/mcp") as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    result = await session.call_tool(
+                        "generate_podcast", {"script": f"filename: {name}.wav\n<voice1>Hello from {name}."}
+                    )
+                    return result.content[0].text
+
+        async def clients():
+            return await asyncio.gather(client("one"), client("two"))
+
+        outputs = asyncio.run(clients())
+        assert all("success: true" in text for text in outputs), outputs
+        assert {"one.wav", "two.wav"} <= set(os.listdir(tmp_path))
+
+        server.send_signal(signal.SIGINT)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
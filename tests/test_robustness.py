@@ -1,10 +1,11 @@
 import unittest
+import asyncio
 import os
 import shutil
 import tempfile
 import threading
 from unittest.mock import MagicMock, patch
-from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool, SyncContext, resolve_script_file
 from podcast_mcp.parser.script_parser import parse_script, MAX_SCRIPT_LENGTH
 from podcast_mcp.tts.tts_manager import TTSManager
 from podcast_mcp.config import Config
@@ -30,6 +31,29 @@ class TestRobustness(unittest.TestCase):
         result = parse_script(script)
         self.assertEqual(result["output"]["file"], "passwd.wav")
 
+    def test_script_file_confined_to_scripts_dir(self):
+        scripts_dir = os.path.join(self.test_dir, "scripts")
+        os.makedirs(scripts_dir)
+        inside = os.path.join(scripts_dir, "episode.txt")
+        with open(inside, "w") as f:
+            f.write("<voice1>Hello")
+        outside = os.path.join(self.test_dir, "secret.txt")
+        with open(outside, "w") as f:
+            f.write("<voice1>Secret")
+        os.symlink(outside, os.path.join(scripts_dir, "link.txt"))
+
+        with patch.object(Config, "SCRIPTS_DIR", scripts_dir):
+            self.assertEqual(resolve_script_file("episode.txt"), os.path.realpath(inside))
+            for path in (outside, "../secret.txt", "link.txt"):
+                with self.assertRaises(ValueError):
+                    resolve_script_file(path)
+        with patch.object(Config, "SCRIPTS_DIR", ""), patch.object(Config, "MCP_TRANSPORT", "streamable-http"):
+            with self.assertRaises(ValueError):
+                resolve_script_file(inside)
+            result = asyncio.run(GeneratePodcastTool().run_async("", SyncContext(), script_file=inside))
+            self.assertFalse(result["success"])
+            self.assertIn("SCRIPTS_DIR", result["error"])
+
     @patch('podcast_mcp.tools.generate_podcast.combine_segments')
     def test_resource_cleanup_on_failure(self, mock_combine):
         tool = GeneratePodcastTool()
@@ -0,0 +1,114 @@
+import os
+from unittest.mock import MagicMock
+import numpy as np
+from podcast_mcp.tts.segment_cache import SegmentCache
+from podcast_mcp.tts.tts_manager import TTSManager
+
+
+def _write(path, data=b"RIFF" + b"\0" * 96):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_key_depends_on_all_inputs():
+    base = SegmentCache.make_key("Hello", "Annmarie Nele", "en", 1.2, "xtts")
+    assert base == SegmentCache.make_key("Hello", "Annmarie Nele", "en", 1.2, "xtts")
+    assert base != SegmentCache.make_key("Hello!", "Annmarie Nele", "en", 1.2, "xtts")
+    assert base != SegmentCache.make_key("Hello", "Damien Black", "en", 1.2, "xtts")
+    assert base != SegmentCache.make_key("Hello", "Annmarie Nele", "de", 1.2, "xtts")
+    assert base != SegmentCache.make_key("Hello", "Annmarie Nele", "en", 1.3, "xtts")
+    assert base != SegmentCache.make_key("Hello", "Annmarie Nele", "en", 1.2, "other")
+
+
+def test_key_follows_reference_audio_changes(tmp_path):
+    voice = _write(str(tmp_path / "voice.wav"))
+    before = SegmentCache.make_key("Hello", voice, "en", 1.2, "xtts")
+    assert before == SegmentCache.make_key("Hello", voice, "en", 1.2, "xtts")
+
+    _write(voice, b"RIFF" + b"\1" * 200)  # Voice replaced under the same path
+    assert before != SegmentCache.make_key("Hello", voice, "en", 1.2, "xtts")
+
+
+def test_waveform_at_another_rate_is_a_miss(tmp_path):
+    cache = SegmentCache(str(tmp_path / "cache"), max_bytes=10_000_000, enabled=True)
+    cache.put_waveform("abc", np.zeros(100, dtype=np.float32), 22050)
+
+    assert cache.get_waveform("abc", 24000) is None
+    assert cache.get_waveform("abc", 22050)[1] == 22050
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_hit_miss_and_persistence(tmp_path):
+    cache = SegmentCache(str(tmp_path / "cache"), max_bytes=10_000, enabled=True)
+    out = str(tmp_path / "out.wav")
+
+    assert not cache.get("abc", out)
+    cache.put("abc", _write(str(tmp_path / "src.wav")))
+    assert cache.get("abc", out)
+    assert os.path.getsize(out) == 100
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A new instance (process restart) sees the same entries
+    reopened = SegmentCache(str(tmp_path / "cache"), max_bytes=10_000, enabled=True)
+    assert reopened.get("abc", out)
+
+
+def test_lru_eviction(tmp_path):
+    cache = SegmentCache(str(tmp_path / "cache"), max_bytes=250, enabled=True)
+    src = _write(str(tmp_path / "src.wav"))
+    out = str(tmp_path / "out.wav")
+
+    cache.put("a", src)
+    cache.put("b", src)
+    assert cache.get("a", out)  # "a" is now most recently used
+    cache.put("c", src)  # Over budget: evicts "b"
+
+    assert cache.get("a", out)
+    assert not cache.get("b", out)
+    assert cache.get("c", out)
+    assert cache.stats()["size_bytes"] <= 250
+
+
+def test_disabled_cache(tmp_path):
+    cache = SegmentCache(str(tmp_path / "cache"), enabled=False)
+    cache.put("a", _write(str(tmp_path / "src.wav")))
+    assert not cache.get("a", str(tmp_path / "out.wav"))
+
+
+def test_repeated_lines_synthesized_once(tmp_path):
+    # Other tests replace generate_segment on the singleton, so call the class method directly
+    manager = TTSManager()
+    old_model, old_cache = manager._model, manager.cache
+    model = MagicMock()
+    model.tts_to_file.side_effect = lambda file_path, **kwargs: _write(file_path)
+    manager._model = model
+    manager.cache = SegmentCache(str(tmp_path / "cache"), enabled=True)
+    try:
+        for i in range(3):
+            TTSManager.generate_segment(manager, "Welcome back!", "1", "en", str(tmp_path / f"seg_{i}.wav"))
+        TTSManager.generate_segment(manager, "Welcome back!", "2", "en", str(tmp_path / "seg_other.wav"))
+    finally:
+        manager._model, manager.cache = old_model, old_cache
+
+    assert model.tts_to_file.call_count == 2
+    assert all(os.path.exists(tmp_path / f"seg_{i}.wav") for i in range(3))
+
+
+def test_repeated_text_in_a_batch_synthesized_once(tmp_path):
+    manager = TTSManager()
+    old_model, old_xtts, old_cache = manager._model, manager._xtts, manager.cache
+    model = MagicMock()
+    model.tts.side_effect = lambda text, **kwargs: np.full(240, 0.1, dtype=np.float32)
+    manager._model, manager._xtts = model, None
+    manager.cache = SegmentCache(str(tmp_path / "cache"), enabled=True)
+    try:
+        waveforms = TTSManager.synthesize_batch(manager, ["Hello there.", "Welcome back!", "Hello there."], "1", "en")
+        stats = manager.cache.stats()
+    finally:
+        manager._model, manager._xtts, manager.cache = old_model, old_xtts, old_cache
+
+    assert model.tts.call_count == 2
+    assert waveforms[0] is waveforms[2]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 2, 2)
@@ -0,0 +1,78 @@
+import pickle
+import sys
+import types
+from unittest.mock import MagicMock, patch
+import pytest
+from podcast_mcp.tts.speaker_latents import SpeakerLatentStore
+
+
+@pytest.fixture
+def fake_torch():
+    # Tensors are plain tuples here; persistence only needs save/load
+    torch = types.ModuleType("torch")
+
+    def save(obj, path):
+        with open(path, "wb") as f:
+            pickle.dump(obj, f)
+
+    def load(path, map_location=None):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    torch.save, torch.load = save, load
+    with patch.dict(sys.modules, {"torch": torch}):
+        yield torch
+
+
+def _xtts_model():
+    model = MagicMock()
+    model.speaker_manager.speakers = {
+        "Annmarie Nele": {"gpt_cond_latent": ("gpt", 1), "speaker_embedding": ("emb", 1)},
+    }
+    model.get_conditioning_latents.return_value = (("gpt", "ref"), ("emb", "ref"))
+    return model
+
+
+def test_builtin_speaker_resolved_once_and_persisted(tmp_path, fake_torch):
+    store = SpeakerLatentStore(str(tmp_path), model_id="xtts")
+    model = _xtts_model()
+
+    assert store.get(model, "Annmarie Nele") == (("gpt", 1), ("emb", 1))
+    model.speaker_manager.speakers = {}  # Later lookups must not touch the model
+    assert store.get(model, "Annmarie Nele") == (("gpt", 1), ("emb", 1))
+
+    # A fresh store (restart) loads from disk
+    restarted = SpeakerLatentStore(str(tmp_path), model_id="xtts")
+    assert restarted.get(model, "Annmarie Nele") == (("gpt", 1), ("emb", 1))
+
+
+def test_reference_audio_voice(tmp_path, fake_torch):
+    reference = tmp_path / "my_voice.wav"
+    reference.write_bytes(b"RIFF")
+    store = SpeakerLatentStore(str(tmp_path / "latents"), model_id="xtts")
+    model = _xtts_model()
+
+    store.get(model, str(reference))
+    SpeakerLatentStore(str(tmp_path / "latents"), model_id="xtts").get(model, str(reference))
+
+    model.get_conditioning_latents.assert_called_once_with(audio_path=[str(reference)])
+
+
+def test_replaced_reference_audio_is_encoded_again(tmp_path, fake_torch):
+    reference = tmp_path / "my_voice.wav"
+    reference.write_bytes(b"RIFF")
+    store = SpeakerLatentStore(str(tmp_path / "latents"), model_id="xtts")
+    model = _xtts_model()
+
+    store.get(model, str(reference))
+    reference.write_bytes(b"RIFF, recorded again")
+    store.get(model, str(reference))
+
+    assert model.get_conditioning_latents.call_count == 2
+
+
+def test_preload_skips_unknown_voices(tmp_path, fake_torch):
+    store = SpeakerLatentStore(str(tmp_path), model_id="xtts")
+    store.preload(_xtts_model(), ["Annmarie Nele", "Nobody"])
+    assert "Annmarie Nele" in store._latents
+    assert "Nobody" not in store._latents
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from podcast_mcp.tts.tts_manager import TTSManager
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+class FakeModel:
+    def __init__(self, model_name):
+        self.calls = []
+
+    def to(self, device):
+        return self
+
+    def tts(self, text, language, speed, speaker=None, speaker_wav=None):
+        self.calls.append(text)
+        return [0.0] * 100
+
+
+@pytest.fixture
+def cold_manager():
+    manager = TTSManager()
+    saved = (manager._model, manager._xtts, manager.state, manager.load_error, dict(manager.load_timings))
+    manager._model, manager._xtts, manager.state, manager.load_error = None, None, "cold", None
+    manager.load_timings.clear()
+    yield manager
+    manager._model, manager._xtts, manager.state, manager.load_error = saved[:4]
+    manager.load_timings.clear()
+    manager.load_timings.update(saved[4])
+
+
+def test_server_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, podcast_mcp.server; "
+        "print(','.join(m for m in ('TTS.api', 'torch', 'pydub') if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_preload_warms_up_and_records_timings(cold_manager):
+    with patch("podcast_mcp.tts.tts_manager._import_tts", return_value=FakeModel):
+        cold_manager.preload(warmup=True)
+
+    assert cold_manager.state == "ready"
+    assert cold_manager._model.calls  # Warm-up inference ran
+    assert {"import_seconds", "load_seconds", "warmup_seconds"} <= set(cold_manager.load_timings)
+
+
+def test_preload_failure_is_reported(cold_manager):
+    with patch("podcast_mcp.tts.tts_manager._import_tts", side_effect=ImportError("coqui-tts missing")):
+        cold_manager.preload()
+
+    assert cold_manager.state == "failed"
+    assert "coqui-tts missing" in cold_manager.load_error
@@ -0,0 +1,78 @@
+import os
+import sys
+import shutil
+from unittest.mock import patch
+import numpy as np
+import pytest
+from podcast_mcp.audio.audio_combiner import combine_waveforms
+from podcast_mcp.audio.streaming_encoder import StreamingEncoder, build_command
+from podcast_mcp.audio.wav_io import to_pcm16
+from podcast_mcp.config import Config
+from podcast_mcp.parser.script_parser import parse_script
+
+# Stands in for ffmpeg: copies the raw PCM from stdin to the output path (last argument)
+FAKE_FFMPEG = """#!{python}
+import sys, shutil
+with open(sys.argv[-1], "wb") as out:
+    shutil.copyfileobj(sys.stdin.buffer, out)
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    path.chmod(0o755)
+    with patch.object(Config, "FFMPEG_BINARY", str(path)):
+        yield str(path)
+
+
+def test_command_applies_output_options():
+    with patch.object(Config, "OUTPUT_BITRATE", "96k"), patch.object(Config, "DEFAULT_SAMPLE_RATE", 22050):
+        mp3 = build_command("out.mp3", "mp3", 24000)
+        opus = build_command("out.opus", "opus", 24000)
+        flac = build_command("out.flac", "flac", 24000, output_channels=2)
+
+    assert mp3[mp3.index("-c:a") + 1] == "libmp3lame"
+    assert mp3[mp3.index("-b:a") + 1] == "96k"
+    assert mp3[-3:] == ["-f", "mp3", "out.mp3"]
+    # 22050 Hz is not an Opus rate; the next supported one is used
+    assert opus[opus.index("-ar", opus.index("pipe:0")) + 1] == "24000"
+    assert "-b:a" not in flac
+    assert flac[flac.index("-ac", flac.index("pipe:0")) + 1] == "2"
+
+
+def test_format_from_header_and_extension():
+    assert parse_script("format: mp3\n<voice1>Hi")["output"] == {"file": "podcast.mp3", "format": "mp3"}
+    assert parse_script("filename: show.flac\n<voice1>Hi")["output"] == {"file": "show.flac", "format": "flac"}
+    assert parse_script("filename: show.wav\nformat: opus\n<voice1>Hi")["output"]["file"] == "show.opus"
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        parse_script("format: aiff\n<voice1>Hi")
+
+
+def test_waveforms_are_piped_to_encoder(tmp_path, fake_ffmpeg):
+    waveforms = [np.full(100, 0.25, dtype=np.float32), np.full(50, -0.25, dtype=np.float32)]
+    output = str(tmp_path / "episode.mp3")
+
+    combine_waveforms(waveforms, 1000, 10, output, "mp3")
+
+    with open(output, "rb") as f:
+        data = f.read()
+    assert data == to_pcm16(waveforms[0]) + b"\0" * 20 + to_pcm16(waveforms[1])
+
+
+def test_encoder_failure_is_reported(tmp_path):
+    with patch.object(Config, "FFMPEG_BINARY", "false"):
+        encoder = StreamingEncoder(str(tmp_path / "x.mp3"), 1000, "mp3")
+        with pytest.raises(RuntimeError, match="ffmpeg"):
+            for _ in range(100):
+                encoder.write_frames(b"\0" * 65536)
+            encoder.close()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+@pytest.mark.parametrize("format", ["mp3", "opus", "flac"])
+def test_real_ffmpeg_encodes(tmp_path, format):
+    output = str(tmp_path / f"episode.{format}")
+    combine_waveforms([np.zeros(24000, dtype=np.float32)], 24000, 0, output, format)
+    assert os.path.getsize(output) > 0
@@ -0,0 +1,109 @@
+import os
+import struct
+import wave
+import asyncio
+from unittest.mock import MagicMock, patch
+import numpy as np
+from podcast_mcp.audio.audio_combiner import combine_segments
+from podcast_mcp.config import Config
+from podcast_mcp.tools.generate_podcast import GeneratePodcastTool
+from podcast_mcp.audio.streaming_writer import StreamingWavWriter
+from podcast_mcp.audio.wav_io import probe_pcm_wav, read_wav, write_wav
+
+
+def _tone(n, value):
+    return np.full(n, value, dtype=np.float32)
+
+
+def test_writer_patches_header_on_close(tmp_path):
+    path = str(tmp_path / "out.wav")
+    with StreamingWavWriter(path, 8000) as writer:
+        writer.write_waveform(_tone(800, 0.25))
+        writer.write_silence(50)
+        assert writer.duration_seconds == 0.15
+
+    with wave.open(path, "rb") as wav:
+        assert wav.getframerate() == 8000
+        assert wav.getnframes() == 1200
+
+
+def test_odd_data_size_is_padded_and_counted_in_riff_size(tmp_path):
+    path = str(tmp_path / "odd.wav")
+    with StreamingWavWriter(path, 8000, sample_width=1) as writer:
+        writer.write_frames(b"\x80" * 3)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    riff_size, = struct.unpack_from("<I", data, 4)
+    data_size, = struct.unpack_from("<I", data, 40)
+    assert data_size == 3
+    assert riff_size == len(data) - 8 == 36 + 4
+
+
+def test_flush_header_makes_growing_file_readable(tmp_path):
+    path = str(tmp_path / "growing.wav")
+    writer = StreamingWavWriter(path, 8000)
+    writer.write_waveform(_tone(400, 0.1))
+    writer.flush_header()
+
+    waveform, _ = read_wav(path)
+    assert len(waveform) == 400
+
+    writer.write_waveform(_tone(400, 0.1))
+    writer.close()
+    assert probe_pcm_wav(path)["data_size"] == 1600
+
+
+def test_combine_segments_copies_pcm_byte_ranges(tmp_path):
+    paths = [
+        write_wav(str(tmp_path / f"seg_{i}.wav"), _tone(1000 + i * 100, 0.1 * (i + 1)), 16000)
+        for i in range(3)
+    ]
+    output = str(tmp_path / "nested" / "episode.wav")
+
+    combine_segments(paths, 100, output)
+
+    combined, sample_rate = read_wav(output)
+    assert sample_rate == 16000
+    assert len(combined) == 1000 + 1100 + 1200 + 2 * 1600
+    assert np.allclose(combined[:1000], 0.1, atol=1e-3)
+    assert np.all(combined[1000:2600] == 0)
+    assert np.allclose(combined[2600:3700], 0.2, atol=1e-3)
+
+
+def test_combine_segments_without_copy_file_range(tmp_path):
+    paths = [write_wav(str(tmp_path / f"seg_{i}.wav"), _tone(5000, 0.5), 16000) for i in range(2)]
+    output = str(tmp_path / "episode.wav")
+
+    with patch("podcast_mcp.audio.streaming_writer.os.copy_file_range", side_effect=OSError, create=True):
+        combine_segments(paths, 0, output)
+
+    combined, _ = read_wav(output)
+    assert len(combined) == 10000
+    assert np.allclose(combined, 0.5, atol=1e-3)
+
+
+def test_streaming_render_reports_playable_duration(tmp_path):
+    class RecordingContext:
+        def __init__(self):
+            self.messages = []
+
+        async def report_progress(self, progress, total=None, message=None):
+            self.messages.append(message)
+
+    tool = GeneratePodcastTool()
+    rate = tool.tts.sample_rate
+    tool.tts.synthesize_stream = MagicMock(side_effect=lambda *args: iter([_tone(rate // 2, 0.2)] * 2))
+    ctx = RecordingContext()
+
+    script = "filename: streamed.wav\n<voice1>One\n<voice2>Two"
+    with patch.object(Config, "STREAMING_OUTPUT", True), \
+            patch.object(Config, "DEFAULT_PAUSE_MS", 500), \
+            patch.object(Config, "OUTPUT_DIR", str(tmp_path)), \
+            patch.object(Config, "TEMP_DIR", str(tmp_path)):
+        result = asyncio.run(tool.run_async(script, ctx))
+
+    assert result["success"], result.get("error")
+    waveform, _ = read_wav(str(tmp_path / "streamed.wav"))
+    assert len(waveform) == rate * 2 + rate // 2
+    assert ctx.messages[-1].startswith("2.5s playable, 100% of work")
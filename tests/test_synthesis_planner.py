@@ -0,0 +1,49 @@
+from unittest.mock import patch
+import numpy as np
+from podcast_mcp.config import Config
+from podcast_mcp.tts.synthesis_planner import char_limit, group_batches, plan_units, split_text, stitch
+
+
+def test_split_text_on_sentences():
+    units = split_text("This is the first sentence. And here is the second one! Is this the third one?", "en")
+    assert units == ["This is the first sentence.", "And here is the second one!", "Is this the third one?"]
+
+
+def test_split_text_respects_language_limit():
+    long_sentence = ", ".join(["a clause with several words in it"] * 30) + "."
+    units = split_text(long_sentence, "ja")
+
+    assert all(len(u) <= char_limit("ja") for u in units)
+    assert " ".join(units).split() == long_sentence.split()
+
+
+def test_split_text_merges_tiny_fragments():
+    assert split_text("Yes. No. Maybe so.", "en") == ["Yes. No. Maybe so."]
+
+
+def test_chunk_max_chars_override():
+    with patch.object(Config, "CHUNK_MAX_CHARS", 40):
+        units = split_text("word " * 50, "en")
+    assert all(len(u) <= 40 for u in units)
+
+
+def test_plan_group_and_stitch():
+    segments = [
+        {"text": "Welcome to the show everyone. Today is a very big day.", "speaker": "1", "language": "en"},
+        {"text": "Thanks for having me here today.", "speaker": "2", "language": "en"},
+        {"text": "Let us begin with the news of the week.", "speaker": "1", "language": "en"},
+    ]
+    units = plan_units(segments)
+    assert [u["segment"] for u in units] == [0, 0, 1, 2]
+
+    batches = group_batches(units, batch_size=2)
+    for batch in batches:
+        assert len({units[i]["speaker"] for i in batch}) == 1
+    assert sorted(i for b in batches for i in b) == list(range(len(units)))
+
+    waveforms = [np.full(10 * (i + 1), i, dtype=np.float32) for i in range(len(units))]
+    stitched = stitch(units, waveforms, len(segments), 1000, gap_ms=5)
+
+    assert len(stitched) == 3
+    assert len(stitched[0]) == 10 + 5 + 20
+    assert np.all(stitched[2] == 3)
@@ -0,0 +1,35 @@
+import time
+import numpy as np
+from unittest.mock import patch
+from podcast_mcp.config import Config
+from podcast_mcp.tts import synthetic_backend
+from podcast_mcp.tts.synthetic_backend import SyntheticTTS, render
+from podcast_mcp.tts.tts_manager import _import_tts
+
+
+def test_render_is_deterministic_and_scales_with_text():
+    short = render("Hello there.", "Annmarie Nele")
+    long = render("Hello there. " * 10, "Annmarie Nele")
+
+    assert np.array_equal(short, render("Hello there.", "Annmarie Nele"))
+    assert not np.array_equal(short, render("Hello there.", "Damien Black"))
+    assert 8 * len(short) < len(long) < 12 * len(short)
+    assert np.max(np.abs(long)) <= 1.0
+
+
+def test_speed_shortens_audio():
+    assert len(render("a b c d e f", "x", speed=2.0)) < len(render("a b c d e f", "x", speed=1.0))
+
+
+def test_emulated_latency():
+    model = SyntheticTTS()
+    with patch.object(Config, "SYNTHETIC_TTS_LATENCY_MS", 30):
+        started = time.perf_counter()
+        model.tts("Hi", speaker="x")
+        assert time.perf_counter() - started >= 0.03
+
+
+def test_backend_selected_from_config():
+    with patch.object(Config, "TTS_BACKEND", "synthetic"):
+        assert _import_tts() is SyntheticTTS
+    assert SyntheticTTS().synthesizer.output_sample_rate == synthetic_backend.SAMPLE_RATE
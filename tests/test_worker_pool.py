@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import numpy as np
+from podcast_mcp.tts.cost_model import CostModel
+from podcast_mcp.tts.tts_manager import TTSManager
+from podcast_mcp.tts.worker_pool import TTSWorkerPool
+
+
+class FakeManager:
+    sample_rate = 16000
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+        self.costs = CostModel(path="", record=True)  # As set up by _init_worker
+
+    def synthesize(self, text, speaker_id, language, quality="final"):
+        with self.lock:
+            self.calls.append(text)
+        time.sleep(0.001 * len(text))
+        self.costs.observe(len(text), 0.01 * len(text), "xtts", "cpu", language, speaker_id)
+        return np.full(len(text), float(speaker_id), dtype=np.float32)
+
+    def generate_segment(self, text, speaker_id, language, output_path, quality="final"):
+        with open(output_path, "w") as f:
+            f.write(text)
+        return output_path
+
+
+def _segments(texts):
+    return [{"text": t, "speaker": str(i % 2 + 1), "language": "en"} for i, t in enumerate(texts)]
+
+
+def test_results_in_script_order_with_progress():
+    fake = FakeManager()
+    pool = TTSWorkerPool(workers=3, executor=ThreadPoolExecutor(3))
+    progress = []
+
+    async def on_complete(done, total):
+        progress.append((done, total))
+
+    texts = ["short", "a much longer line of dialogue", "mid length line", "x"]
+    with patch("podcast_mcp.tts.worker_pool._manager", return_value=fake):
+        results = asyncio.run(pool.run(_segments(texts), on_complete=on_complete))
+    pool.shutdown()
+
+    assert [len(r) for r in results] == [len(t) for t in texts]
+    assert progress[-1] == (4, 4)
+    assert [p[0] for p in progress] == sorted(p[0] for p in progress)
+    assert pool.sample_rate == 16000
+
+
+def test_longest_first_and_dedupe(tmp_path):
+    fake = FakeManager()
+    # One worker makes dispatch order observable
+    pool = TTSWorkerPool(workers=1, executor=ThreadPoolExecutor(1))
+    texts = ["intro", "the longest line in the script", "mid line", "intro"]
+    paths = [str(tmp_path / f"seg_{i}.wav") for i in range(len(texts))]
+
+    with patch("podcast_mcp.tts.worker_pool._manager", return_value=fake):
+        # Same speaker for both "intro" lines so they are deduplicated
+        segments = [{"text": t, "speaker": "1", "language": "en"} for t in texts]
+        results = asyncio.run(pool.run(segments, output_paths=paths))
+    pool.shutdown()
+
+    assert results == paths
+    assert all(os.path.exists(p) for p in paths)
+    assert open(paths[3]).read() == "intro"
+
+
+def test_dispatch_order_is_longest_first():
+    fake = FakeManager()
+    pool = TTSWorkerPool(workers=1, executor=ThreadPoolExecutor(1))
+    texts = ["bb", "dddd", "a", "ccc", "bb"]
+
+    with patch("podcast_mcp.tts.worker_pool._manager", return_value=fake):
+        asyncio.run(pool.run([{"text": t, "speaker": "1", "language": "en"} for t in texts]))
+    pool.shutdown()
+
+    assert fake.calls == ["dddd", "ccc", "bb", "a"]
+
+
+def test_worker_timings_are_learned_by_the_parent(tmp_path):
+    fake = FakeManager()
+    pool = TTSWorkerPool(workers=2, executor=ThreadPoolExecutor(2))
+    parent = CostModel(str(tmp_path / "costs.json"))
+
+    with patch("podcast_mcp.tts.worker_pool._manager", return_value=fake), \
+            patch.object(TTSManager(), "costs", parent):
+        asyncio.run(pool.run(_segments(["first line", "second line", "third"])))
+    pool.shutdown()
+
+    assert parent.rates()["xtts|cpu|en|*"] == {"chars_per_second": 100.0, "observations": 3}
+    assert fake.costs.take_observations() == []  # Handed over with the results
+    parent.save()
+    assert CostModel(str(tmp_path / "costs.json")).rates() == parent.rates()